@@ -0,0 +1,73 @@
+# Run benchmark with: python -m src.benchmarks.bench_cost_matrix
+
+import argparse
+import time
+
+import numpy as np
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.role_assignment import RoleAssignment
+
+
+def loop_cost_matrix(assignment: RoleAssignment) -> np.ndarray:
+    """
+    Builds the cost matrix with the original Python double loop (reference implementation).
+    """
+    cost_matrix = np.zeros((len(assignment.students), len(assignment.roles)))
+
+    for i, role in enumerate(assignment.roles):
+        if role.hierarchy == 'Essential':
+            cost_matrix[:, i] += assignment.cost_for_essential
+        elif role.hierarchy == 'Next':
+            cost_matrix[:, i] += assignment.cost_for_next
+        elif role.hierarchy == 'Rest':
+            cost_matrix[:, i] += assignment.cost_for_rest
+        elif role.hierarchy == 'Last':
+            cost_matrix[:, i] += assignment.cost_for_last
+
+    for i, student in enumerate(assignment.students):
+        for j, role in enumerate(assignment.roles):
+            if student.is_excluded_from(role.gender):
+                cost_matrix[i, j] += assignment.penalty_cost_for_exclusion
+            if student.preferred_gender == role.gender:
+                cost_matrix[i, j] += assignment.cost_for_matched_gender
+            if role.gender == "Unisex":
+                cost_matrix[i, j] += assignment.cost_for_unisex
+
+    return cost_matrix
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the fastest wall time of `repeat` calls to func in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare loop and vectorized cost-matrix construction.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000],
+                        help="Cohort sizes (students = roles) to benchmark.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported).")
+    args = parser.parse_args()
+
+    print(f"{'Studierende':>12}{'Rollen':>8}{'Schleife [s]':>15}{'Vektorisiert [s]':>19}{'Speedup':>10}")
+    for size in args.sizes:
+        db = SyntheticDatabase(synthetic_roles(size, seed=size))
+        assignment = RoleAssignment(db, synthetic_students(size, seed=size))
+
+        reference = loop_cost_matrix(assignment)
+        assert np.array_equal(reference, assignment.construct_cost_matrix()), "Cost matrices differ"
+
+        # The reference loop is slow, so it is timed once for large cohorts
+        loop_time = best_time(lambda: loop_cost_matrix(assignment), 1 if size > 1000 else args.repeat)
+        vectorized_time = best_time(assignment.construct_cost_matrix, args.repeat)
+        print(f"{size:>12}{len(assignment.roles):>8}{loop_time:>15.4f}{vectorized_time:>19.4f}"
+              f"{loop_time / vectorized_time:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
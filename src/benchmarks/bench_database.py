@@ -0,0 +1,116 @@
+# Run benchmark with: python -m src.benchmarks.bench_database --operations 200
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Dict
+
+from src.data.database import Database
+from src.data.pragmas import PROFILES, PragmaProfile
+from src.data.role_catalog import RoleCatalog
+
+ROLE_VALUES = ("Vorname", "Nachname", "Klasse 8b", "Unisex", "Rest", "yes", None, None)
+INSERT_QUERY = ("INSERT INTO Roles (ID, Vorname_Position, Nachname, Rollengruppe, Gender, Essential_Next_Rest_Last, "
+                "just_8b, Thema, Soziale_Beziehungen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+def per_operation(func, count: int) -> float:
+    """Returns the mean wall time of `count` calls to func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def run_profile(profile: PragmaProfile, operations: int, data_dir: str) -> Dict[str, float]:
+    """
+    Times role edits (one committed transaction each, as in the GUI windows, with the ID of new roles
+    from get_next_unused_id), catalog loads and snapshots on a freshly seeded database, and counts the
+    catalog loads a second thread completes while the edits are committed.
+
+    Args:
+        profile (PragmaProfile): Connection settings to benchmark.
+        operations (int): Edits and catalog loads per measurement.
+        data_dir (str): Directory for the database file.
+
+    Returns:
+        Dict[str, float]: Milliseconds per operation, and catalog loads per second during the edits.
+    """
+    db = Database(os.path.join(data_dir, f"roles_{profile.journal_mode.lower()}.db"), profile)
+    try:
+        role_ids = []
+
+        def edit(query, params):
+            with db.transaction() as connection:
+                connection.execute(query, params)
+            db.invalidate_catalog()
+
+        def insert():
+            with db.transaction() as connection:
+                role_ids.append(db.get_next_unused_id())
+                connection.execute(INSERT_QUERY, (role_ids[-1], *ROLE_VALUES))
+            db.invalidate_catalog()
+
+        def load_catalog():
+            db.invalidate_catalog()
+            db.role_catalog()
+
+        def take_snapshot():
+            with db.snapshot():
+                pass
+
+        results = {"insert": per_operation(insert, operations)}
+        updates, deletes = iter(role_ids), iter(role_ids)
+        results.update({
+            "update": per_operation(lambda: edit("UPDATE Roles SET Thema = 'Benchmark' WHERE ID = ?",
+                                                 (next(updates),)), operations),
+            "delete": per_operation(lambda: edit("DELETE FROM Roles WHERE ID = ?", (next(deletes),)), operations),
+            "catalog": per_operation(load_catalog, operations),
+            "snapshot": per_operation(take_snapshot, max(operations // 10, 1)),
+        })
+
+        # A second thread loads the catalog while the edits are committed
+        stop = threading.Event()
+        loads = []
+
+        def read():
+            while not stop.is_set():
+                with db.connections.read() as connection:
+                    RoleCatalog.load(connection)
+                loads.append(time.perf_counter())
+
+        reader = threading.Thread(target=read)
+        start = time.perf_counter()
+        reader.start()
+        for role_id in role_ids:
+            edit(INSERT_QUERY, (role_id, *ROLE_VALUES))
+        for role_id in role_ids:
+            edit("DELETE FROM Roles WHERE ID = ?", (role_id,))
+        stop.set()
+        reader.join()
+        results["reads_during_edits"] = len(loads) / (time.perf_counter() - start)
+        return results
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite pragma profiles on role edits and catalog loads.")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES),
+                        help="Pragma profiles to benchmark.")
+    parser.add_argument("--operations", type=int, default=200, help="Edits and catalog loads per measurement.")
+    args = parser.parse_args()
+
+    print(f"{'Profil':>12}{'Einfügen [ms]':>15}{'Ändern [ms]':>13}{'Löschen [ms]':>14}{'Katalog [ms]':>14}"
+          f"{'Snapshot [ms]':>15}{'Lesen während Änderungen [1/s]':>32}")
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name in args.profiles:
+            results = run_profile(PROFILES[name], args.operations, data_dir)
+            print(f"{name:>12}{results['insert']:>15.3f}{results['update']:>13.3f}{results['delete']:>14.3f}"
+                  f"{results['catalog']:>14.3f}{results['snapshot']:>15.3f}{results['reads_during_edits']:>32.0f}")
+
+
+if __name__ == "__main__":
+    main()
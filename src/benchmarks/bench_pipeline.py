@@ -0,0 +1,162 @@
+# Run benchmark with: python -m src.benchmarks.bench_pipeline --save-baseline baseline.json
+# Check a change with: python -m src.benchmarks.bench_pipeline --baseline baseline.json --threshold 0.2
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles
+from src.data.survey_loader import load_students
+from src.data.test_data_creator import generate_test_data
+from src.services.profiling import StageTracer
+from src.services.role_assignment import RoleAssignment
+
+# Cohorts above this size are solved with the compressed backend (the dense matrix would not fit)
+DENSE_LIMIT = 5000
+
+
+class Scenario(NamedTuple):
+    size: int
+    veto_percentage: int
+    groups: str  # "none", "small" (two groups) or "many" (six groups)
+
+    @property
+    def name(self) -> str:
+        return f"{self.size}_veto{self.veto_percentage}_{self.groups}"
+
+
+def special_groups(groups: str, num_roles: int) -> Dict[int, List[int]]:
+    """Returns the special groups (group ID mapped to role IDs) of a scenario configuration."""
+    count = {"none": 0, "small": 2, "many": 6}[groups]
+    size = 3 if num_roles >= 6 * count else 2
+    role_ids = range(1, num_roles + 1, max(num_roles // (count * size), 1) if count else 1)
+    return {group_id + 1: list(role_ids[group_id * size:(group_id + 1) * size]) for group_id in range(count)
+            if len(role_ids[group_id * size:(group_id + 1) * size]) == size}
+
+
+def run_scenario(scenario: Scenario, data_dir: str, seed: int = 0) -> Dict:
+    """
+    Times the full pipeline for one scenario: loading the survey CSV, solving and writing the results.
+
+    The cohort is written with generate_test_data (seeded), the catalog has as many roles as students.
+
+    Returns:
+        Dict: Total seconds, seconds per stage, and the result (cost and assigned students).
+    """
+    survey_path = os.path.join(data_dir, f"{scenario.name}.csv")
+    if not os.path.exists(survey_path):
+        generate_test_data(survey_path, scenario.size, 100 - scenario.veto_percentage, seed)
+    roles = synthetic_roles(scenario.size, seed=seed)
+    db = SyntheticDatabase(roles, special_groups(scenario.groups, len(roles)))
+    backend = "dense" if scenario.size <= DENSE_LIMIT else "compressed"
+
+    tracer = StageTracer()
+    start = time.perf_counter()
+    with tracer.stage("load_students"):
+        students = load_students(survey_path)
+    assignment = RoleAssignment(db, students, special_group_strategy="exact", backend=backend, tracer=tracer)
+    result = assignment.solve()
+    assignment.write_results_to_csv(os.path.join(data_dir, f"{scenario.name}_ergebnis.csv"))
+    seconds = time.perf_counter() - start
+
+    return {
+        "seconds": seconds,
+        "stages": {name: total["seconds"] for name, total in tracer.totals().items()},
+        "backend": backend,
+        "min_cost": float(result.min_cost),
+        "assigned": int((~result.high_cost_mask).sum()),
+    }
+
+
+def run_suite(scenarios: List[Scenario], repeat: int = 3, seed: int = 0) -> Dict[str, Dict]:
+    """Runs every scenario `repeat` times and keeps the fastest run per scenario."""
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        for scenario in scenarios:
+            runs = [run_scenario(scenario, data_dir, seed) for _ in range(repeat)]
+            results[scenario.name] = min(runs, key=lambda run: run["seconds"])
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            min_delta: float = 0.005) -> List[str]:
+    """
+    Compares benchmark results against a baseline.
+
+    Args:
+        results (Dict[str, Dict]): Results of run_suite.
+        baseline (Dict[str, Dict]): Stored results of an earlier run.
+        threshold (float): Allowed relative slowdown (0.2 = 20%) of the pipeline and of every stage.
+        min_delta (float): Slowdowns of fewer seconds are timer noise and never reported.
+
+    Returns:
+        List[str]: One message per regression; empty if there is none.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["min_cost"] != reference["min_cost"] or result["assigned"] != reference["assigned"]:
+            regressions.append(f"{name}: Ergebnis geändert (Kosten {reference['min_cost']} → {result['min_cost']}, "
+                               f"zugewiesen {reference['assigned']} → {result['assigned']})")
+
+        timings = [("Gesamt", result["seconds"], reference["seconds"])]
+        timings += [(stage, seconds, reference["stages"][stage])
+                    for stage, seconds in result["stages"].items() if stage in reference["stages"]]
+        for stage, seconds, reference_seconds in timings:
+            if seconds - reference_seconds > max(reference_seconds * threshold, min_delta):
+                regressions.append(f"{name} [{stage}]: {reference_seconds:.4f}s → {seconds:.4f}s "
+                                   f"(+{seconds / max(reference_seconds, 1e-9) - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the assignment pipeline across cohort sizes, "
+                                                 "veto rates and special group configurations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 50000],
+                        help="Cohort sizes (students = roles).")
+    parser.add_argument("--vetoes", type=int, nargs="+", default=[0, 30, 70],
+                        help="Share of students (in percent) with a veto.")
+    parser.add_argument("--groups", nargs="+", choices=["none", "small", "many"], default=["none", "small", "many"],
+                        help="Special group configurations.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per scenario (best is reported).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated cohorts and catalogs.")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown against the baseline.")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="Slowdowns below this many seconds are ignored as noise.")
+    parser.add_argument("--save-baseline", help="Write the results as a new baseline JSON.")
+    args = parser.parse_args()
+
+    scenarios = [Scenario(*values) for values in itertools.product(args.sizes, args.vetoes, args.groups)]
+    results = run_suite(scenarios, args.repeat, args.seed)
+
+    print(f"{'Szenario':>24}{'Backend':>12}{'Gesamt [s]':>13}{'Kostenmatrix [s]':>19}{'Lösen [s]':>12}"
+          f"{'Kosten':>12}")
+    for name, result in results.items():
+        stages = result["stages"]
+        print(f"{name:>24}{result['backend']:>12}{result['seconds']:>13.4f}{stages.get('cost_matrix', 0):>19.4f}"
+              f"{stages['solve']:>12.4f}{result['min_cost']:>12.0f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, mode="w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold, args.min_delta)
+        for message in regressions:
+            print(f"🚨 {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"Keine Regressionen (Schwelle {args.threshold:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
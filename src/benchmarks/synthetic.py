@@ -0,0 +1,84 @@
+import random
+from typing import Dict, List
+
+from src.data.role_catalog import RoleCatalog
+from src.models.role import Role
+from src.models.student import Student
+
+GENDERS = ["Männlich", "Weiblich", "Divers"]
+ROLE_GENDERS = GENDERS + ["Unisex"]
+HIERARCHIES = ["Essential", "Next", "Rest", "Last"]
+
+
+def synthetic_roles(num_roles: int, seed: int = 0) -> List[Role]:
+    """
+    Creates a seeded role catalog with random gender and hierarchy per role.
+
+    Args:
+        num_roles (int): Number of roles to create.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        List[Role]: The generated roles.
+    """
+    rng = random.Random(seed)
+    return [
+        Role(i + 1, f"Vorname_{i + 1}", f"Nachname_{i + 1}", "Klasse 8b", rng.choice(ROLE_GENDERS),
+             rng.choice(HIERARCHIES), "yes", None, 0)
+        for i in range(num_roles)
+    ]
+
+
+def synthetic_students(num_students: int, veto_percentage: int = 50, seed: int = 0) -> List[Student]:
+    """
+    Creates a seeded cohort of students.
+
+    Args:
+        num_students (int): Number of students to create.
+        veto_percentage (int): Share of students (in percent) that exclude one gender.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        List[Student]: The generated students.
+    """
+    rng = random.Random(seed)
+    return [
+        Student(f"Vorname_{i + 1}", f"Nachname_{i + 1}", rng.choice(GENDERS),
+                rng.choice(GENDERS) if rng.random() * 100 < veto_percentage else None)
+        for i in range(num_students)
+    ]
+
+
+class SyntheticDatabase:
+    """
+    In-memory stand-in for Database that serves a fixed role catalog to RoleAssignment.
+    """
+
+    def __init__(self, roles: List[Role], special_groups=None):
+        """
+        Args:
+            roles (List[Role]): The role catalog.
+            special_groups (Optional[Dict[int, List[int]]]): Special group IDs mapped to role IDs.
+        """
+        self.roles = roles
+        self.special_groups = special_groups or {}
+        self.catalog = RoleCatalog(roles, range(len(roles)))  # Every role counts as a 'just8b' role
+
+    def role_catalog(self) -> RoleCatalog:
+        return self.catalog
+
+    def load_roles_for_just8b(self) -> List[Role]:
+        return self.roles
+
+    def fetch_all_roles(self) -> List[Role]:
+        return self.roles
+
+    def fetch_special_groups_ID(self) -> List[int]:
+        return list(self.special_groups)
+
+    def fetch_special_group_roles(self) -> Dict[int, List[int]]:
+        return {group_id: list(role_ids) for group_id, role_ids in self.special_groups.items()}
+
+    def get_roles_from_group(self, group_id: int) -> List[Role]:
+        role_ids = set(self.special_groups.get(group_id, []))
+        return [role for role in self.roles if role.id in role_ids]
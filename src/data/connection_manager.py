@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+from urllib.request import pathname2url
+
+
+class ConnectionManager:
+    """
+    Hands out SQLite connections to the threads and processes that share one database file.
+
+    Reads use read-only connections from a bounded pool: a thread keeps its connection for the
+    duration of a read() block (nested blocks reuse it) and returns it for the next reader, so
+    connections are reused instead of reopened. Writes go through the single read-write connection,
+    one transaction at a time (write() serializes the threads of a process, SQLite's file lock the
+    processes). A forked process never reuses the connections of its parent: it opens its own.
+
+    An immutable manager serves a file that nothing writes to anymore (e.g. a snapshot copy): its
+    readers skip SQLite's locking and change detection, and it has no read-write connection.
+    """
+
+    def __init__(self, db_path: str, max_readers: int = 8, timeout: float = 30.0,
+                 on_connect: Optional[Callable[[sqlite3.Connection, bool], None]] = None, immutable: bool = False):
+        """
+        Args:
+            db_path (str): Path of the SQLite database file.
+            max_readers (int): Most read-only connections open at the same time; further readers wait.
+            timeout (float): Seconds to wait for a free reader, and for SQLite locks held by other connections.
+            on_connect (Optional[Callable[[sqlite3.Connection, bool], None]]): Called with every new
+                connection and whether it is read-only (e.g. to set pragmas).
+            immutable (bool): Whether the file never changes while it is open (read-only access only).
+        """
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.timeout = timeout
+        self.on_connect = on_connect
+        self.immutable = immutable
+        self._reset()
+
+    def _reset(self):
+        """Starts with no connections (on creation and in a forked process)."""
+        self._pid = os.getpid()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._idle: List[sqlite3.Connection] = []
+        self._readers: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_readers)
+        self._local = threading.local()
+
+    def _check_process(self):
+        # Connections must not be shared across fork; the parent keeps (and closes) its own
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        """
+        Opens a connection that may be handed between threads (its users are serialized by this manager).
+
+        Raises:
+            sqlite3.Error: If the connection cannot be established.
+        """
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+            if self.immutable:
+                uri += "&immutable=1"
+            connection = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        if self.on_connect is not None:
+            self.on_connect(connection, read_only)
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The read-write connection. Code that manages its own transactions on it must run on one
+        thread; other threads write through write().
+
+        Raises:
+            sqlite3.OperationalError: If the manager is immutable.
+        """
+        self._check_process()
+        if self.immutable:
+            raise sqlite3.OperationalError(f"{self.db_path} is opened immutable and cannot be written")
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open(read_only=False)
+            return self._writer
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yields a read-only connection of the pool. It only sees committed data.
+
+        Raises:
+            sqlite3.OperationalError: If no reader becomes free within the timeout.
+        """
+        self._check_process()
+        held = getattr(self._local, "reader", None)
+        if held is not None:
+            yield held
+            return
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError(f"No free database reader within {self.timeout}s")
+        try:
+            with self._pool_lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._open(read_only=True)
+                with self._pool_lock:
+                    self._readers.append(connection)
+
+            self._local.reader = connection
+            try:
+                yield connection
+            finally:
+                self._local.reader = None
+                if connection.in_transaction:
+                    connection.rollback()
+                with self._pool_lock:
+                    self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Runs the block as one transaction on the read-write connection: committed if the block
+        succeeds, rolled back if it raises. Writers wait for each other; nested blocks join the
+        outer transaction.
+        """
+        with self._write_lock:
+            connection = self.connection
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield connection
+                finally:
+                    self._write_depth -= 1
+                return
+
+            if not connection.in_transaction:
+                connection.execute("BEGIN IMMEDIATE")
+            self._write_depth = 1
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            else:
+                connection.commit()
+            finally:
+                self._write_depth = 0
+
+    def close(self):
+        """Closes the read-write connection and every reader connection."""
+        if os.getpid() != self._pid:
+            self._reset()
+            return
+        with self._pool_lock:
+            for connection in self._readers:
+                connection.close()
+            self._readers.clear()
+            self._idle.clear()
+        # Closed last, so it can checkpoint the WAL and remove it (readers cannot)
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
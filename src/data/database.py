@@ -1,8 +1,15 @@
+import itertools
 import sqlite3
 import os
 import sys
-from typing import List
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
 from src.models.role import Role
+from src.data.connection_manager import ConnectionManager
+from src.data.migrations import migrate
+from src.data.pragmas import PERFORMANCE_PROFILE, PragmaProfile
+from src.data.role_catalog import RoleCatalog
 
 # Adjust the path dynamically for PyInstaller compatibility
 if getattr(sys, 'frozen', False):  # Running as a PyInstaller bundle
@@ -23,22 +30,66 @@ if not getattr(sys, 'frozen', False):
 
 sys.path.append(os.path.join(BASE_DIR, "src"))
 
+# Catalog versions are unique within a process, also across Database instances
+_catalog_versions = itertools.count(1)
+
+
+def restore_database(db_path: str = DB_PATH) -> None:
+    """
+    Overwrites the database with the contents of seed.sql. The seed resets the schema version, so
+    the next Database opened on the file applies the migrations again. Connections to the file
+    must be closed first.
+
+    Args:
+        db_path (str): Path of the database file.
+
+    Raises:
+        FileNotFoundError: If the seed.sql file is missing.
+        sqlite3.Error: If the seed script fails.
+    """
+    if not os.path.exists(SEED_PATH):
+        raise FileNotFoundError(f"Seed file not found at {SEED_PATH}")
+    with open(SEED_PATH, "r", encoding="utf-8") as seed_file:
+        seed_script = seed_file.read()
+
+    connection = sqlite3.connect(db_path)
+    try:
+        connection.executescript(seed_script)
+        connection.commit()
+    finally:
+        connection.close()
+
 
 class Database:
     """
     Handles the connection to the SQLite database and provides methods for fetching roles dynamically.
+
+    The connections come from a ConnectionManager, so one Database can be used from several threads:
+    the fetch methods read through pooled read-only connections, and writes from any thread go
+    through transaction(). The read-write connection is available as self.connection.
+    Every connection is set up with a PragmaProfile (WAL journaling and larger caches by default).
     """
 
-    def __init__(self):
+    def __init__(self, db_path: str = DB_PATH, profile: PragmaProfile = PERFORMANCE_PROFILE, immutable: bool = False):
         """
         Initialize the database connection with the path set to 'db/roles.db'.
         Ensures the required directory exists and initializes the database schema if necessary.
+
+        Args:
+            db_path (str): Path of the database file.
+            profile (PragmaProfile): SQLite settings of the connections (see src.data.pragmas).
+            immutable (bool): Open a file that no longer changes read-only, without locking (see snapshot).
         """
-        self.db_path = DB_PATH
-        self.connection = None
+        self.db_path = db_path
+        self.profile = profile
+        self.immutable = immutable
+        self.connections = None
+        self.catalog_version = next(_catalog_versions)
+        self._role_catalog = None
 
         self._connect()
-        self._initialize_database()
+        if not immutable:
+            self._initialize_database()
 
     def _connect(self) -> None:
         """
@@ -48,17 +99,68 @@ class Database:
             sqlite3.Error: If a connection to the database cannot be established.
         """
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row
+            self.connections = ConnectionManager(self.db_path, on_connect=self.profile.apply, immutable=self.immutable)
+            if not self.immutable:
+                self.connections.connection  # Open the read-write connection (and create the file) right away
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error connecting to database: {e}")
 
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The read-write connection (see ConnectionManager.connection)."""
+        return self.connections.connection
+
+    def transaction(self):
+        """
+        Returns a context manager that runs its block as one serialized write transaction
+        (see ConnectionManager.write).
+        """
+        return self.connections.write()
+
+    @contextmanager
+    def snapshot(self) -> Iterator["Database"]:
+        """
+        Copies the database (with SQLite's backup API, so the copy is consistent) and yields the copy
+        opened immutable: reads from it take no locks and never wait for or see later edits. The copy
+        keeps the catalog version (and the cached role catalog) of this database and is deleted when
+        the block ends.
+
+        Yields:
+            Database: The read-only snapshot.
+
+        Raises:
+            sqlite3.Error: If the copy cannot be made.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "roles_snapshot.db")
+            try:
+                target = sqlite3.connect(path)
+                try:
+                    with self.connections.read() as connection:
+                        connection.backup(target)
+                    # Immutable files are read without a WAL, so the copy uses a rollback journal
+                    target.execute("PRAGMA journal_mode = DELETE")
+                finally:
+                    target.close()
+            except sqlite3.Error as e:
+                raise sqlite3.Error(f"Error creating database snapshot: {e}")
+
+            snapshot = Database(path, self.profile, immutable=True)
+            snapshot.catalog_version = self.catalog_version
+            snapshot._role_catalog = self._role_catalog  # Same catalog version, so the cached snapshot still applies
+            try:
+                yield snapshot
+            finally:
+                snapshot.close()
+
     def _initialize_database(self) -> None:
         """
-        Initializes the database by creating tables and seeding data if they do not exist.
+        Initializes the database by creating tables and seeding data if they do not exist,
+        then upgrades the schema to the current version (see src.data.migrations).
 
         Raises:
             FileNotFoundError: If the seed.sql file is missing.
+            sqlite3.Error: If a migration fails.
         """
         if not self._table_exists("Roles"):
             print("Database not established yet. Creating and seeding the database...")
@@ -66,6 +168,7 @@ class Database:
                 raise FileNotFoundError(f"Seed file not found at {SEED_PATH}")
             with open(SEED_PATH, "r") as seed_file:
                 self.connection.executescript(seed_file.read())
+        migrate(self.connection)
 
     def _table_exists(self, table_name: str) -> bool:
         """
@@ -93,7 +196,8 @@ class Database:
         """
         query = "SELECT * FROM Roles ORDER BY Essential_Next_Rest_Last, Nachname, Vorname_Position"
         try:
-            rows = self.connection.execute(query).fetchall()
+            with self.connections.read() as connection:
+                rows = connection.execute(query).fetchall()
             return self._map_roles(rows)
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error fetching roles: {e}")
@@ -112,13 +216,34 @@ class Database:
         SELECT * FROM Roles
         WHERE Rollengruppe IN ('Klasse 8b', 'Lehrkraft/Schulpersonal')
         AND (Just_8b = 'yes' OR Just_8b IS NULL OR Just_8b = '')
+        ORDER BY ID
         """
         try:
-            rows = self.connection.execute(query).fetchall()
+            with self.connections.read() as connection:
+                rows = connection.execute(query).fetchall()
             return self._map_roles(rows)
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error loading 'just8b' roles: {e}")
 
+    def role_catalog(self) -> RoleCatalog:
+        """
+        Returns the snapshot of the role catalog (see RoleCatalog), loaded with a single query.
+        The snapshot is reused until the catalog changes (see invalidate_catalog).
+
+        Returns:
+            RoleCatalog: The current catalog.
+
+        Raises:
+            sqlite3.Error: If the query execution fails.
+        """
+        if self._role_catalog is None or self._role_catalog.version != self.catalog_version:
+            try:
+                with self.connections.read() as connection:
+                    self._role_catalog = RoleCatalog.load(connection, self.catalog_version)
+            except sqlite3.Error as e:
+                raise sqlite3.Error(f"Error loading the role catalog: {e}")
+        return self._role_catalog
+
     def _map_roles(self, rows) -> List[Role]:
         """
         Maps database rows to Role objects.
@@ -156,7 +281,8 @@ class Database:
             """
         query = "SELECT GroupID FROM SpecialGroups"
         try:
-            rows = self.connection.execute(query).fetchall()
+            with self.connections.read() as connection:
+                rows = connection.execute(query).fetchall()
             return [row[0] for row in rows]  # Extract GroupID values from the fetched rows
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error fetching GroupIDs: {e}")
@@ -180,38 +306,52 @@ class Database:
         ORDER BY Essential_Next_Rest_Last, Nachname, Vorname_Position
         """
         try:
-            rows = self.connection.execute(query, (group_id,)).fetchall()
+            with self.connections.read() as connection:
+                rows = connection.execute(query, (group_id,)).fetchall()
             return self._map_roles(rows)  # Reuse _map_roles to convert rows to Role objects
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error fetching roles for GroupID {group_id}: {e}")
 
-    def get_next_unused_id(self) -> int:
+    def fetch_special_group_roles(self) -> Dict[int, List[int]]:
         """
-        Finds the next available ID in the Roles table.
-
-        Retrieves all existing IDs, sorts them, and finds the first missing integer.
-        The search starts from 1.
+        Fetches the role IDs of every special group with one JOIN of SpecialGroups and Roles.
 
         Returns:
-            int: The next unused ID.
+            Dict[int, List[int]]: GroupIDs mapped to the IDs of their roles (groups without roles are omitted).
+
+        Raises:
+            sqlite3.Error: If the query execution fails.
+        """
+        query = """
+        SELECT SpecialGroups.GroupID, Roles.ID FROM SpecialGroups
+        JOIN Roles ON Roles.Soziale_Beziehungen = SpecialGroups.GroupID
+        ORDER BY SpecialGroups.GroupID, Roles.ID
         """
         try:
-            cursor = self.connection.cursor()
-
-            # Get all existing IDs from the Roles table in ascending order
-            cursor.execute("SELECT ID FROM Roles ORDER BY ID ASC")
-            existing_ids = [row[0] for row in cursor.fetchall()]
+            group_roles = {}
+            with self.connections.read() as connection:
+                for group_id, role_id in connection.execute(query):
+                    group_roles.setdefault(group_id, []).append(role_id)
+            return group_roles
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error fetching special group roles: {e}")
 
-            # Find the first missing integer starting from 1
-            next_id = 1
-            for id_value in existing_ids:
-                if id_value == next_id:
-                    next_id += 1
-                else:
-                    break  # Found a gap
+    def get_next_unused_id(self) -> int:
+        """
+        Finds the next available ID in the Roles table: the first missing integer, starting from 1.
 
-            return next_id
+        The unused IDs below the highest ID are kept as ranges in FreeRoleIDs, updated by triggers
+        on every insert, delete and ID change (see src.data.migrations), so the lookup reads the
+        lowest range start or the highest ID from the primary keys instead of scanning all IDs.
 
+        Returns:
+            int: The next unused ID.
+        """
+        query = """
+        SELECT COALESCE((SELECT MIN(FirstID) FROM FreeRoleIDs), (SELECT MAX(ID) FROM Roles) + 1, 1)
+        """
+        try:
+            return self.connection.execute(query).fetchone()[0]
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error fetching next available ID: {e}")
 
@@ -227,15 +367,24 @@ class Database:
         """
         query = "SELECT DISTINCT Soziale_Beziehungen FROM Roles WHERE Soziale_Beziehungen IS NOT NULL ORDER BY Soziale_Beziehungen ASC"
         try:
-            rows = self.connection.execute(query).fetchall()
+            with self.connections.read() as connection:
+                rows = connection.execute(query).fetchall()
             return [row[0] for row in rows if row[0] is not None]  # Ensure no None values are returned
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error fetching all group IDs: {e}")
 
 
+    def invalidate_catalog(self) -> None:
+        """
+        Moves the role catalog to a new version after roles were added, edited or deleted,
+        so cost rows and the role catalog snapshot of the old catalog are no longer used.
+        """
+        self.catalog_version = next(_catalog_versions)
+        self._role_catalog = None
+
     def close(self) -> None:
         """
-        Closes the database connection.
+        Closes the database connections.
         """
-        if self.connection:
-            self.connection.close()
+        if self.connections:
+            self.connections.close()
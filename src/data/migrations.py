@@ -0,0 +1,114 @@
+import sqlite3
+from typing import List, NamedTuple, Sequence
+
+
+class Migration(NamedTuple):
+    description: str
+    statements: Sequence[str]
+    objects: Sequence[str] = ()  # Names of the tables, indexes and triggers it creates (see migrate)
+
+
+# Statements of the ID triggers that take NEW.ID out of FreeRoleIDs. An ID above the previous maximum
+# frees the IDs in between (ranges above the previous maximum lie inside that gap and are replaced);
+# otherwise the range that contains NEW.ID (the one with the largest FirstID <= NEW.ID) is split around it.
+_PREVIOUS_MAX = "COALESCE((SELECT MAX(ID) FROM Roles WHERE ID < NEW.ID), 0)"
+_CONTAINING_RANGE = "FirstID = (SELECT MAX(FirstID) FROM FreeRoleIDs WHERE FirstID <= NEW.ID) AND LastID >= NEW.ID"
+_TAKE_NEW_ID = f"""
+    DELETE FROM FreeRoleIDs WHERE NEW.ID = (SELECT MAX(ID) FROM Roles) AND FirstID > {_PREVIOUS_MAX};
+    INSERT INTO FreeRoleIDs (FirstID, LastID) SELECT {_PREVIOUS_MAX} + 1, NEW.ID - 1
+        WHERE NEW.ID = (SELECT MAX(ID) FROM Roles) AND {_PREVIOUS_MAX} + 1 < NEW.ID;
+    INSERT INTO FreeRoleIDs (FirstID, LastID) SELECT NEW.ID + 1, LastID FROM FreeRoleIDs WHERE {_CONTAINING_RANGE} AND LastID > NEW.ID;
+    UPDATE FreeRoleIDs SET LastID = NEW.ID - 1 WHERE {_CONTAINING_RANGE};
+    DELETE FROM FreeRoleIDs WHERE FirstID = NEW.ID AND LastID < FirstID;
+"""
+
+# Schema changes in order; the database is at version n (PRAGMA user_version) once the first n are applied.
+# Existing migrations must never change, later schema changes are appended. Their statements must be safe
+# to run again, because a migration whose objects have gone missing is reapplied (see migrate).
+MIGRATIONS: List[Migration] = [
+    Migration("Indexes for the role catalog access paths", [
+        # Catalog order of fetch_all_roles and RoleCatalog.load; covers every column, so the catalog is
+        # read from the index in order without a sort or table lookups
+        "CREATE INDEX IF NOT EXISTS idx_roles_catalog ON Roles (Essential_Next_Rest_Last, Nachname, Vorname_Position, "
+        "Rollengruppe, Gender, just_8b, Thema, Soziale_Beziehungen)",
+        # Special group JOIN, get_roles_from_group and the distinct group IDs
+        "CREATE INDEX IF NOT EXISTS idx_roles_group ON Roles (Soziale_Beziehungen)",
+        # 'just8b' filter and the distinct role groups
+        "CREATE INDEX IF NOT EXISTS idx_roles_just8b ON Roles (Rollengruppe, just_8b)",
+        # Duplicate check of the add role window
+        "CREATE INDEX IF NOT EXISTS idx_roles_position ON Roles (Vorname_Position)",
+    ], ["idx_roles_catalog", "idx_roles_group", "idx_roles_just8b", "idx_roles_position"]),
+    Migration("Free role ID ranges maintained by triggers (see Database.get_next_unused_id)", [
+        # Disjoint ranges of unused IDs below the highest ID; freed IDs are added as single-ID ranges
+        "CREATE TABLE IF NOT EXISTS FreeRoleIDs (FirstID INTEGER PRIMARY KEY, LastID INTEGER NOT NULL)",
+        "DELETE FROM FreeRoleIDs",
+        "INSERT INTO FreeRoleIDs (FirstID, LastID) SELECT 1, MIN(ID) - 1 FROM Roles HAVING MIN(ID) > 1",
+        "INSERT INTO FreeRoleIDs (FirstID, LastID) "
+        "SELECT Roles.ID + 1, (SELECT MIN(Next.ID) - 1 FROM Roles AS Next WHERE Next.ID > Roles.ID) FROM Roles "
+        "WHERE Roles.ID + 1 NOT IN (SELECT ID FROM Roles) AND Roles.ID < (SELECT MAX(ID) FROM Roles)",
+        f"CREATE TRIGGER IF NOT EXISTS trg_roles_insert_free_ids AFTER INSERT ON Roles BEGIN {_TAKE_NEW_ID} END",
+        "CREATE TRIGGER IF NOT EXISTS trg_roles_delete_free_ids AFTER DELETE ON Roles BEGIN "
+        "INSERT INTO FreeRoleIDs (FirstID, LastID) VALUES (OLD.ID, OLD.ID); END",
+        "CREATE TRIGGER IF NOT EXISTS trg_roles_update_free_ids AFTER UPDATE OF ID ON Roles WHEN OLD.ID <> NEW.ID BEGIN "
+        f"INSERT INTO FreeRoleIDs (FirstID, LastID) VALUES (OLD.ID, OLD.ID); {_TAKE_NEW_ID} END",
+    ], ["FreeRoleIDs", "trg_roles_insert_free_ids", "trg_roles_delete_free_ids", "trg_roles_update_free_ids"]),
+]
+
+
+def schema_version(connection: sqlite3.Connection) -> int:
+    """Returns the schema version stored in the database file."""
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def applied_version(connection: sqlite3.Connection, migrations: Sequence[Migration] = MIGRATIONS) -> int:
+    """
+    Returns the stored schema version, lowered to the first migration whose objects are missing
+    (e.g. because a table was dropped and recreated without its indexes and triggers).
+    """
+    version = schema_version(connection)
+    existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master")}
+    for index, migration in enumerate(migrations[:version]):
+        if not set(migration.objects) <= existing:
+            return index
+    return version
+
+
+def migrate(connection: sqlite3.Connection, migrations: Sequence[Migration] = MIGRATIONS) -> int:
+    """
+    Upgrades the database in place by applying the migrations it has not seen yet.
+
+    Every migration runs in its own transaction together with the version bump, so an upgrade that
+    fails leaves the database at the last completed version. The version is read inside the
+    transaction, so processes that open the database at the same time apply each migration once.
+    The version is not trusted alone: migrations whose objects are missing are applied again (see
+    applied_version).
+
+    Args:
+        connection (sqlite3.Connection): Read-write connection without an open transaction.
+        migrations (Sequence[Migration]): The migrations in order.
+
+    Returns:
+        int: The schema version after the upgrade.
+
+    Raises:
+        sqlite3.DatabaseError: If the database was written by a newer version of the program.
+        sqlite3.Error: If a migration fails.
+    """
+    while True:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            stored = schema_version(connection)
+            if stored > len(migrations):
+                raise sqlite3.DatabaseError(
+                    f"Database schema version {stored} is newer than the supported version {len(migrations)}")
+            version = applied_version(connection, migrations)
+            if version < len(migrations):
+                for statement in migrations[version].statements:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {version + 1}")
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+        if version == len(migrations):
+            return version
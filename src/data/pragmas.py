@@ -0,0 +1,40 @@
+import sqlite3
+from typing import NamedTuple
+
+
+class PragmaProfile(NamedTuple):
+    """
+    SQLite settings applied to every connection of a Database (see ConnectionManager.on_connect).
+
+    The journal mode and synchronous level only concern the read-write connection; the journal
+    mode is stored in the database file, so switching profiles converts the file on the next open.
+    """
+    journal_mode: str  # "DELETE" (rollback journal) or "WAL"
+    synchronous: str  # "FULL" or "NORMAL" (in WAL mode, NORMAL only syncs on checkpoints)
+    mmap_size: int  # Bytes of the file mapped into memory (0 = reads go through read())
+    cache_size: int  # Page cache per connection, negative values are KiB
+
+    def apply(self, connection: sqlite3.Connection, read_only: bool) -> None:
+        """
+        Applies the profile to a new connection.
+
+        Args:
+            connection (sqlite3.Connection): The connection.
+            read_only (bool): Whether the connection is read-only (the journal mode is left alone).
+        """
+        if not read_only:
+            # Falls back to the current mode where WAL is not supported (e.g. some network file systems)
+            connection.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        connection.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        connection.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+
+
+# SQLite's own defaults
+DEFAULT_PROFILE = PragmaProfile(journal_mode="DELETE", synchronous="FULL", mmap_size=0, cache_size=-2000)
+
+# Readers and the writer do not block each other, and a commit appends to the WAL without an fsync
+PERFORMANCE_PROFILE = PragmaProfile(journal_mode="WAL", synchronous="NORMAL", mmap_size=64 * 1024 * 1024,
+                                    cache_size=-16000)
+
+PROFILES = {"default": DEFAULT_PROFILE, "performance": PERFORMANCE_PROFILE}
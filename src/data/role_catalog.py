@@ -0,0 +1,63 @@
+from typing import List, Optional, Sequence
+
+from src.models.role import Role
+
+# Columns of Roles in the order of the Role constructor arguments
+ROLE_COLUMNS = ("ID", "Vorname_Position", "Nachname", "Rollengruppe", "Gender", "Essential_Next_Rest_Last",
+                "just_8b", "Thema", "Soziale_Beziehungen")
+
+# Role groups and just_8b values of the 'just8b' case (see Database.load_roles_for_just8b)
+JUST8B_GROUPS = ("Klasse 8b", "Lehrkraft/Schulpersonal")
+JUST8B_VALUES = ("yes", None, "")
+
+
+class RoleCatalog:
+    """
+    Read-only snapshot of the role catalog with the 'just8b' subset and the full set precomputed.
+
+    Both role sets are lists over the same Role objects, so choosing the roles for a cohort is a
+    comparison instead of a query. The lists are shared by every caller and must not be modified.
+    """
+
+    def __init__(self, roles: List[Role], just8b_indices: Sequence[int], version: Optional[int] = None):
+        """
+        Args:
+            roles (List[Role]): All roles, in catalog order (hierarchy, last name, first name/position).
+            just8b_indices (Sequence[int]): Indices into roles of the 'just8b' roles, in ID order.
+            version (Optional[int]): Catalog version of the source database.
+        """
+        self.all_roles = roles
+        self.just8b_roles = [roles[i] for i in just8b_indices]
+        self.version = version
+
+    @classmethod
+    def load(cls, connection, version: Optional[int] = None) -> "RoleCatalog":
+        """
+        Loads the catalog with a single query. Rows are read as plain tuples and passed to Role
+        positionally (see ROLE_COLUMNS) instead of being looked up by column name.
+
+        Args:
+            connection (sqlite3.Connection): Connection to the roles database.
+            version (Optional[int]): Catalog version of the database.
+
+        Returns:
+            RoleCatalog: The snapshot.
+        """
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        query = (f"SELECT {', '.join(ROLE_COLUMNS)} FROM Roles "
+                 f"ORDER BY Essential_Next_Rest_Last, Nachname, Vorname_Position")
+        roles = [Role(*row) for row in cursor.execute(query)]
+
+        just8b_indices = sorted(
+            (i for i, role in enumerate(roles) if role.rollengruppe in JUST8B_GROUPS and role.just_8b in JUST8B_VALUES),
+            key=lambda i: roles[i].id,
+        )
+        return cls(roles, just8b_indices, version)
+
+    def roles_for(self, num_participants: int) -> List[Role]:
+        """
+        Returns the roles for a cohort: the 'just8b' roles if there are fewer participants than
+        'just8b' roles, otherwise all roles.
+        """
+        return self.just8b_roles if num_participants < len(self.just8b_roles) else self.all_roles
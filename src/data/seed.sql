@@ -1,9 +1,13 @@
 PRAGMA foreign_keys=OFF;
+-- The recreated tables have none of the migrated indexes, triggers and tables (see src/data/migrations.py),
+-- so the next Database applies every migration again
+PRAGMA user_version=0;
 BEGIN TRANSACTION;
 
 -- Drop tables if they already exist to avoid errors
 DROP TABLE IF EXISTS Roles;
 DROP TABLE IF EXISTS SpecialGroups;
+DROP TABLE IF EXISTS FreeRoleIDs;
 
 -- Create Roles table with auto-increment primary key
 CREATE TABLE Roles (
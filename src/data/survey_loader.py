@@ -0,0 +1,42 @@
+from typing import List
+
+import pandas as pd
+
+from src.models.student import Student
+
+# Column mapping for LimeSurvey exports
+COLUMN_MAPPING = {
+    "Geben Sie ihren Vor- und Nachnamen an. [Nachname]": "last_name",
+    "Geben Sie ihren Vor- und Nachnamen an. [Vorname]": "first_name",
+    "Welches Geschlecht schreiben Sie sich selbst zu?": "gender",
+    "Gibt es ein Geschlecht, das Sie auf keine Fall spielen wollen?": "excluded_gender",
+}
+
+
+def load_students(file_path: str) -> List[Student]:
+    """
+    Loads the students from a LimeSurvey CSV export.
+
+    Args:
+        file_path (str): Path of the CSV file.
+
+    Returns:
+        List[Student]: One student per row.
+
+    Raises:
+        ValueError: If required columns are missing.
+    """
+    df = pd.read_csv(file_path, index_col=False)
+    df = df.rename(columns=COLUMN_MAPPING)
+
+    missing_columns = [col for col in COLUMN_MAPPING.values() if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Fehlende Spalten in der CSV-Datei: {', '.join(missing_columns)}")
+
+    # Students without a veto are stored with "Kein"
+    df["excluded_gender"] = df["excluded_gender"].fillna("Kein")
+
+    return [
+        Student(row["first_name"], row["last_name"], row["gender"], row["excluded_gender"])
+        for _, row in df.iterrows()
+    ]
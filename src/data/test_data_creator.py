@@ -1,56 +1,205 @@
+# Generate test data with: python -m src.data.test_data_creator --files 50 --output-dir .
+# Large load-test file with: python -m src.data.test_data_creator --rows 1000000 --seed 1 --output big.csv
+
+import argparse
 import csv
-import random
-
-def generate_test_data(output_file, num_rows, empty_percentage):
-    # Column headers
-    headers = [
-        "Antwort ID",
-        "Datum Abgeschickt",
-        "Letzte Seite",
-        "Start-Sprache",
-        "Zufallsstartwert",
-        "Geben Sie ihren Vor- und Nachnamen an. [Vorname]",
-        "Geben Sie ihren Vor- und Nachnamen an. [Nachname]",
-        "Welches Geschlecht schreiben Sie sich selbst zu?",
-        "Gibt es ein Geschlecht, das Sie auf keine Fall spielen wollen?"
-    ]
-
-    # Gender options
-    gender_options = ["Männlich", "Weiblich", "Divers"]
-    avoid_gender_options = ["Männlich", "Weiblich", "Divers", ""]
-
-    # Calculate the number of empty values for the ninth column
-    num_empty = int(num_rows * empty_percentage / 100)
-    avoid_gender_values = ["" for _ in range(num_empty)] + [
-        random.choice([g for g in avoid_gender_options if g != ""]) for _ in range(num_rows - num_empty)
-    ]
-    random.shuffle(avoid_gender_values)
-
-    # Generate rows
-    data = []
-    for i in range(1, num_rows + 1):
-        row = [
-            str(i),  # ID
-            "1980-01-01 00:00:00",  # Submit date
-            "1",  # Last page
-            "de",  # Start language
-            str(random.randint(100000000, 999999999)),  # Seed
-            f"Vorname_{i}",  # First name
-            f"Nachname_{i}",  # Last name
-            random.choice(gender_options),  # Gender
-            avoid_gender_values[i - 1]  # Avoid gender
+import glob
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Column headers of a LimeSurvey export
+HEADERS = [
+    "Antwort ID",
+    "Datum Abgeschickt",
+    "Letzte Seite",
+    "Start-Sprache",
+    "Zufallsstartwert",
+    "Geben Sie ihren Vor- und Nachnamen an. [Vorname]",
+    "Geben Sie ihren Vor- und Nachnamen an. [Nachname]",
+    "Welches Geschlecht schreiben Sie sich selbst zu?",
+    "Gibt es ein Geschlecht, das Sie auf keine Fall spielen wollen?"
+]
+
+# Gender options ("" is no veto)
+GENDER_OPTIONS = ["Männlich", "Weiblich", "Divers"]
+AVOID_GENDER_OPTIONS = GENDER_OPTIONS + [""]
+
+CHUNK_SIZE = 100_000
+
+
+class SurveyDistribution:
+    """
+    Gender distribution and veto distribution per gender of a cohort.
+    """
+
+    def __init__(self, genders: Dict[str, float], vetoes: Dict[str, Dict[str, float]]):
+        """
+        Args:
+            genders (Dict[str, float]): Probability of each gender (see GENDER_OPTIONS).
+            vetoes (Dict[str, Dict[str, float]]): Per gender, the probability of each veto
+                (see AVOID_GENDER_OPTIONS, "" is no veto).
+        """
+        self.genders = np.array([genders.get(g, 0) for g in GENDER_OPTIONS], dtype=float)
+        self.genders /= self.genders.sum()
+        self.vetoes = np.array([[vetoes.get(g, {}).get(v, 0) for v in AVOID_GENDER_OPTIONS] for g in GENDER_OPTIONS],
+                               dtype=float)
+        # Genders without observations fall back to "no veto"
+        self.vetoes[self.vetoes.sum(axis=1) == 0, -1] = 1
+        self.vetoes /= self.vetoes.sum(axis=1, keepdims=True)
+
+    @classmethod
+    def fit(cls, file_paths: Iterable[str], smoothing: float = 1.0) -> "SurveyDistribution":
+        """
+        Fits the distributions to survey CSVs in LimeSurvey format (other files are skipped).
+
+        Args:
+            file_paths (Iterable[str]): Survey CSVs.
+            smoothing (float): Added to every count (Laplace smoothing), so rare combinations stay possible.
+
+        Returns:
+            SurveyDistribution: The fitted distribution.
+
+        Raises:
+            ValueError: If none of the files is a LimeSurvey export.
+        """
+        gender_counts = np.full(len(GENDER_OPTIONS), smoothing)
+        veto_counts = np.full((len(GENDER_OPTIONS), len(AVOID_GENDER_OPTIONS)), smoothing)
+        fitted = 0
+        for file_path in file_paths:
+            with open(file_path, newline="", encoding="utf-8") as file:
+                reader = csv.reader(file)
+                if next(reader, None) != HEADERS:
+                    continue
+                fitted += 1
+                for row in reader:
+                    gender = row[7].strip().capitalize()
+                    veto = row[8].strip().capitalize()
+                    if gender in GENDER_OPTIONS and veto in AVOID_GENDER_OPTIONS:
+                        gender_counts[GENDER_OPTIONS.index(gender)] += 1
+                        veto_counts[GENDER_OPTIONS.index(gender), AVOID_GENDER_OPTIONS.index(veto)] += 1
+        if not fitted:
+            raise ValueError("Keine Umfragedateien im LimeSurvey-Format gefunden.")
+
+        return cls(dict(zip(GENDER_OPTIONS, gender_counts)),
+                   {g: dict(zip(AVOID_GENDER_OPTIONS, counts)) for g, counts in zip(GENDER_OPTIONS, veto_counts)})
+
+
+def generate_columns(rng: np.random.Generator, num_rows: int, num_empty: int,
+                     distribution: Optional[SurveyDistribution] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws the gender and veto columns of one chunk in bulk.
+
+    Without a distribution, genders are uniform and exactly num_empty rows have no veto; the others
+    veto a uniformly chosen gender. With a distribution, both columns are drawn from it.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Gender and veto indices into GENDER_OPTIONS and AVOID_GENDER_OPTIONS.
+    """
+    if distribution is None:
+        genders = rng.integers(0, len(GENDER_OPTIONS), num_rows)
+        vetoes = rng.integers(0, len(GENDER_OPTIONS), num_rows)
+        vetoes[rng.permutation(num_rows)[:num_empty]] = len(GENDER_OPTIONS)
+        return genders, vetoes
+
+    genders = rng.choice(len(GENDER_OPTIONS), num_rows, p=distribution.genders)
+    # Inverse transform sampling of the veto, conditioned on each row's gender
+    cumulative = np.cumsum(distribution.vetoes, axis=1)[genders]
+    vetoes = (rng.random(num_rows)[:, np.newaxis] > cumulative[:, :-1]).sum(axis=1)
+    return genders, vetoes
+
+
+def generate_rows(num_rows: int, empty_percentage: float = 50, seed: Optional[int] = None,
+                  distribution: Optional[SurveyDistribution] = None,
+                  chunk_size: int = CHUNK_SIZE) -> Iterator[List[List]]:
+    """
+    Yields the survey rows in chunks of at most chunk_size rows.
+
+    Without a distribution, exactly int(num_rows * empty_percentage / 100) rows have no veto: the
+    empty rows of each chunk are drawn from the remaining ones (hypergeometric), so the count is exact
+    without holding all rows in memory.
+
+    Args:
+        num_rows (int): Number of rows.
+        empty_percentage (float): Share of rows (in percent) without a veto (ignored with a distribution).
+        seed (Optional[int]): Seed of the generator; the same seed and chunk size give the same rows.
+        distribution (Optional[SurveyDistribution]): Gender and veto distribution (e.g. fitted to survey_data).
+        chunk_size (int): Rows per chunk.
+    """
+    rng = np.random.default_rng(seed)
+    remaining_empty = int(num_rows * empty_percentage / 100)
+    for start in range(0, num_rows, chunk_size):
+        size = min(chunk_size, num_rows - start)
+        remaining = num_rows - start
+        num_empty = rng.hypergeometric(remaining_empty, remaining - remaining_empty, size) if remaining_empty else 0
+        remaining_empty -= num_empty
+
+        genders, vetoes = generate_columns(rng, size, num_empty, distribution)
+        seeds = rng.integers(100000000, 1000000000, size)
+        ids = range(start + 1, start + size + 1)
+        yield [
+            [i, "1980-01-01 00:00:00", 1, "de", s, f"Vorname_{i}", f"Nachname_{i}", GENDER_OPTIONS[g],
+             AVOID_GENDER_OPTIONS[v]]
+            for i, s, g, v in zip(ids, seeds.tolist(), genders.tolist(), vetoes.tolist())
         ]
-        data.append(row)
 
-    # Write to CSV file
+
+def generate_test_data(output_file, num_rows, empty_percentage, seed: Optional[int] = None,
+                       distribution: Optional[SurveyDistribution] = None, chunk_size: int = CHUNK_SIZE):
+    """
+    Writes a synthetic LimeSurvey export, streaming the rows to disk chunk by chunk, so the memory
+    use does not depend on the number of rows.
+
+    Args:
+        output_file (str): Path of the CSV file.
+        num_rows (int): Number of rows.
+        empty_percentage (float): Share of rows (in percent) without a veto (see generate_rows).
+        seed (Optional[int]): Seed of the generator.
+        distribution (Optional[SurveyDistribution]): Gender and veto distribution.
+        chunk_size (int): Rows generated and written at once.
+    """
     with open(output_file, "w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
-        writer.writerow(headers)
-        writer.writerows(data)
-
-# Automatic generation loop
-for i in range(50):
-    num_rows = random.randint(10, 50)
-    empty_percentage = random.randint(30, 100)
-    file_name = f"test_data_{num_rows}_rows_{empty_percentage}%_no_exclusion.csv"
-    generate_test_data(file_name, num_rows, empty_percentage)
+        writer.writerow(HEADERS)
+        for rows in generate_rows(num_rows, empty_percentage, seed, distribution, chunk_size):
+            writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic survey CSVs.")
+    parser.add_argument("--rows", type=int, help="Write a single file with this many rows to --output.")
+    parser.add_argument("--output", default="test_data.csv", help="Path of the single file.")
+    parser.add_argument("--empty-percentage", type=float, default=50, help="Share of rows without a veto.")
+    parser.add_argument("--files", type=int, default=50,
+                        help="Without --rows: number of files with 10-50 rows and 30-100%% empty vetoes.")
+    parser.add_argument("--output-dir", default=".", help="Directory of the generated files.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the generator.")
+    parser.add_argument("--fit", nargs="+", metavar="PATH",
+                        help="Survey CSVs or directories (e.g. src/data/survey_data) to fit the gender and veto "
+                             "distribution to.")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows generated and written at once.")
+    args = parser.parse_args()
+
+    distribution = None
+    if args.fit:
+        # Directories contribute their real surveys, not the files generated by this script
+        paths = [p for path in args.fit for p in (glob.glob(os.path.join(path, "*.csv")) if os.path.isdir(path) else [path])
+                 if not (os.path.isdir(path) and os.path.basename(p).startswith("test_data_"))]
+        distribution = SurveyDistribution.fit(paths)
+
+    if args.rows is not None:
+        generate_test_data(args.output, args.rows, args.empty_percentage, args.seed, distribution, args.chunk_size)
+        return
+
+    # Automatic generation loop
+    os.makedirs(args.output_dir, exist_ok=True)
+    seeds = np.random.SeedSequence(args.seed).generate_state(args.files)
+    for seed in seeds.tolist():
+        num_rows, empty_percentage = np.random.default_rng(seed).integers([10, 30], [51, 101]).tolist()
+        file_name = f"test_data_{num_rows}_rows_{empty_percentage}%_no_exclusion.csv"
+        generate_test_data(os.path.join(args.output_dir, file_name), num_rows, empty_percentage, seed, distribution)
+
+
+if __name__ == "__main__":
+    main()
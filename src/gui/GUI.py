@@ -1,24 +1,28 @@
 import sys
 sys.path.append('src')
 
-import pandas as pd
-import sqlite3
 import os
+import queue
+import threading
 import tkinter as tk
 import traceback
-from tkinter import filedialog, scrolledtext, messagebox
+from tkinter import filedialog, scrolledtext, messagebox, ttk
 
-from src.services.role_assignment import RoleAssignment
+from src.services.role_assignment import RoleAssignment, SolveCancelled
+from src.services.cost_cache import invalidate_catalog
 from src.data.database import Database
-from src.models.student import Student
+from src.data.survey_loader import load_students
 from src.gui.deleteRoleWindowGUI import DeleteWindow
 from src.gui.editRoleWindowGUI import EditWindow
 from src.gui.addRoleWindowGUI import AddRoleWindow
-from src.data.database import SEED_PATH, DB_PATH
+from src.data.database import SEED_PATH, DB_PATH, restore_database
 
 # Global list for students
 students_list = []
 
+# Interval (ms) in which the main loop collects messages of the solver thread
+POLL_INTERVAL = 100
+
 class MainApplication:
     def __init__(self, root):
         self.root = root
@@ -57,8 +61,18 @@ class MainApplication:
         self.output_text.pack(pady=1)
 
         # Button to assign charactersa
-        assign_button = tk.Button(root, text="Rollenverteilung starten", command=self.assign_roles)
-        assign_button.pack(pady=10)
+        self.assign_button = tk.Button(root, text="Rollenverteilung starten", command=self.assign_roles)
+        self.assign_button.pack(pady=10)
+
+        # Progress of a running role distribution and a button to cancel it
+        self.progress_bar = ttk.Progressbar(root, length=300, mode="determinate")
+        self.progress_bar.pack(pady=1)
+        self.cancel_button = tk.Button(root, text="Abbrechen", command=self.cancel_assignment, state=tk.DISABLED)
+        self.cancel_button.pack(pady=1)
+
+        # The solver runs in a worker thread and reports through this queue (Tk is not thread-safe)
+        self.solver = None
+        self.solver_messages = queue.Queue()
 
         # Button to restore database
         restore_db_button = tk.Button(root, text="Datenbank wiederherstellen", command=self.restore_database)
@@ -112,17 +126,16 @@ class MainApplication:
         selected_indices = self.group_listbox.curselection()
         selected_groups = [self.group_listbox.get(i) for i in selected_indices]
         try:
-            conn = self.db.connection
-            cursor = conn.cursor()
-
-            # Clear existing special groups
-            cursor.execute("DELETE FROM SpecialGroups")
+            # One serialized transaction, so readers never see the table half rewritten
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
 
-            # Insert the newly selected group IDs
-            for group in selected_groups:
-                cursor.execute("INSERT INTO SpecialGroups (GroupID) VALUES (?)", (group,))
+                # Clear existing special groups
+                cursor.execute("DELETE FROM SpecialGroups")
 
-            conn.commit()
+                # Insert the newly selected group IDs
+                for group in selected_groups:
+                    cursor.execute("INSERT INTO SpecialGroups (GroupID) VALUES (?)", (group,))
 
             messagebox.showinfo("Erfolg", "Spezialgruppen wurden erfolgreich gespeichert.")
             # Reload the group list to reflect any changes
@@ -147,20 +160,14 @@ class MainApplication:
                 messagebox.showerror("Fehler", f"Seed file not found at {SEED_PATH}")
                 return
 
-            # 1) Close the existing DB connection (if open)
+            # 1) Drop cached cost rows of the old catalog and close the existing DB connection (if open)
+            invalidate_catalog(self.db)
             self.db.close()
 
-            # Read the seed file
-            with open(SEED_PATH, "r", encoding="utf-8") as f:
-                seed_script = f.read()
+            # 2) Run the seed script, which also resets the schema version
+            restore_database(DB_PATH)
 
-            # 2) Create a new temporary connection to execute the script
-            temp_conn = sqlite3.connect(DB_PATH)
-            temp_conn.executescript(seed_script)
-            temp_conn.commit()
-            temp_conn.close()
-
-            # 3) Re-initialize the main Database connection
+            # 3) Re-initialize the main Database connection (applies the migrations again)
             self.db = Database()
 
             messagebox.showinfo("Erfolg", "Datenbank wurde erfolgreich wiederhergestellt.")
@@ -182,34 +189,9 @@ class MainApplication:
 
         self.output_text.delete(1.0, tk.END)  # Clear existing text
 
-        # Define the column mapping for LimeSurvey data
-        column_mapping = {
-            "Geben Sie ihren Vor- und Nachnamen an. [Nachname]": "last_name",
-            "Geben Sie ihren Vor- und Nachnamen an. [Vorname]": "first_name",
-            "Welches Geschlecht schreiben Sie sich selbst zu?": "gender",
-            "Gibt es ein Geschlecht, das Sie auf keine Fall spielen wollen?": "excluded_gender",
-        }
-
         try:
-            # Load the CSV file
-            df = pd.read_csv(file_path, index_col=False)
-
-            # Rename columns to match internal naming
-            df = df.rename(columns=column_mapping)
-
-            # Replace NaN in 'excluded_gender' with "Kein"
-            df["excluded_gender"] = df["excluded_gender"].fillna("Kein")
-
-            # Check for missing columns
-            missing_columns = [col for col in column_mapping.values() if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Fehlende Spalten in der CSV-Datei: {', '.join(missing_columns)}")
-
-            # Populate the global students list
-            students_list = [
-                Student(row["first_name"], row["last_name"], row["gender"], row["excluded_gender"])
-                for _, row in df.iterrows()
-            ]
+            # Load the students from the LimeSurvey export
+            students_list = load_students(file_path)
 
             # Display loaded data in the GUI
             self.output_text.insert(tk.END, "CSV-Datei erfolgreich geladen und Studierende verarbeitet.\n")
@@ -230,25 +212,108 @@ class MainApplication:
 
     # Assign roles and generate output CSV
     def assign_roles(self):
-        """Starts the role distribution process."""
+        """
+        Starts the role distribution process in a worker thread, so the window stays responsive.
+        Progress and the result are passed back through self.solver_messages and handled by
+        poll_solver on the Tk main loop.
+        """
         if not students_list:
             self.output_text.insert(tk.END, "Keine Studierende geladen. Bitte laden Sie zuerst eine CSV-Datei.\n")
             self.output_text.see(tk.END)
             return
+        if self.solver is not None:
+            return
 
         self.output_text.delete(1.0, tk.END)  # Clear existing text
         self.output_text.insert(tk.END, "Rollenverteilung wird gestartet...\n")
 
         try:
-            # Run the role assignment algorithm
-            solver = RoleAssignment(self.db, students_list)
-            solver.solve()
+            # Roles and special groups are loaded from one immutable snapshot before the run starts,
+            # so edits made meanwhile neither wait for nor leak into the run
+            with self.db.snapshot() as snapshot:
+                solver = RoleAssignment(snapshot, students_list)
+        except Exception as e:
+            self.output_text.insert(tk.END, f"Fehler während der Rollenverteilung: {e}\n")
+            print(traceback.format_exc())
+            self.output_text.see(tk.END)
+            return
+
+        messages = self.solver_messages
+        solver.progress_callback = lambda runs, total: messages.put(("progress", runs, total))
+        self.solver = solver
+        self.assign_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_bar.config(mode="determinate", maximum=solver.max_iterations, value=0)
+
+        threading.Thread(target=self.run_solver, args=(solver, messages), daemon=True).start()
+        self.root.after(POLL_INTERVAL, self.poll_solver)
 
+    @staticmethod
+    def run_solver(solver, messages):
+        """Solves in the worker thread and puts the outcome into the message queue."""
+        try:
+            messages.put(("done", solver.solve()))
+        except SolveCancelled:
+            messages.put(("cancelled",))
+        except Exception as e:
+            messages.put(("error", e, traceback.format_exc()))
+
+    def poll_solver(self):
+        """Handles the messages of the solver thread; reschedules itself until the run has finished."""
+        try:
+            while True:
+                message = self.solver_messages.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, runs, total = message
+                    if total is None:
+                        # Unknown number of runs (exact search): show activity instead of a fraction
+                        self.progress_bar.config(mode="indeterminate")
+                        self.progress_bar.step()
+                    else:
+                        self.progress_bar.config(mode="determinate", maximum=total, value=runs)
+                    continue
+
+                solver = self.solver
+                self.finish_assignment()
+                if kind == "done":
+                    self.show_results(solver, message[1])
+                elif kind == "cancelled":
+                    self.output_text.insert(tk.END, "Rollenverteilung wurde abgebrochen.\n")
+                else:
+                    self.output_text.insert(tk.END, f"Fehler während der Rollenverteilung: {message[1]}\n")
+
+                    # Bugfix: print the error, this line could be omitted later
+                    print(message[2])
+                self.output_text.see(tk.END)
+                return
+        except queue.Empty:
+            pass
+        self.root.after(POLL_INTERVAL, self.poll_solver)
+
+    def cancel_assignment(self):
+        """Asks the running solver to stop after its current solver run."""
+        if self.solver is not None:
+            self.solver.cancel()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.output_text.insert(tk.END, "Abbruch angefordert...\n")
+            self.output_text.see(tk.END)
+
+    def finish_assignment(self):
+        """Resets the controls after the solver thread has finished."""
+        self.solver = None
+        self.assign_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_bar.config(mode="determinate", maximum=1, value=1)
+
+    def show_results(self, solver, result):
+        """Displays the result of a finished run and asks where to save it."""
+        try:
             # Display results in the GUI
             self.output_text.insert(tk.END, "Rollenverteilung ist abgeschlossen!\n")
             self.output_text.insert(tk.END, "Ergebnis:\n")
 
-            for student, role, cost in solver.solution:
+            for student, role, cost in result.solution:
                 self.output_text.insert(tk.END,
                                         f"✅ {student.first_name} {student.last_name} -> {role.vorname_position} {role.nachname}\n")
 
@@ -258,12 +323,22 @@ class MainApplication:
                     f"!!! Achtung: Es gibt mehr Studierende ({len(solver.students)}) als verfügbare Rollen ({len(solver.roles)})\n"
                 )
 
-            if solver.high_cost_assignments:
+            high_cost_assignments = result.high_cost_assignments
+            if high_cost_assignments:
                 self.output_text.insert(tk.END, "\n⚠️ **Problematische Zuweisungen:**\n")
-                for student, role, cost in solver.high_cost_assignments:
+                for student, role, cost in high_cost_assignments:
                     self.output_text.insert(tk.END,
                                             f"🚨 {student.first_name} {student.last_name} -> {role.vorname_position} {role.nachname}\n")
 
+            # Explain which vetoes make a veto-free assignment impossible
+            veto_violations = [v for v in solver.feasibility.violations if v.veto is not None]
+            if veto_violations:
+                self.output_text.insert(tk.END, "\n⚠️ **Keine vetofreie Zuweisung möglich:**\n")
+                for violation in veto_violations:
+                    self.output_text.insert(tk.END,
+                                            f"🚨 {len(violation.students)} Teilnehmende mit Veto '{violation.veto}', "
+                                            f"aber nur {len(violation.roles)} Rollen mit einem anderen Gender\n")
+
             # Ask user where to save the result CSV
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
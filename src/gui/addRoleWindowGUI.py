@@ -5,6 +5,7 @@ from tkinter import messagebox
 import sqlite3
 
 from src.data.database import Database
+from src.services.cost_cache import invalidate_catalog
 
 
 class AddRoleWindow:
@@ -638,29 +639,31 @@ class AddRoleWindow:
                            is displayed in a messagebox.
         """
         try:
-            c = self.conn.cursor()
+            # The ID lookup and the insert run in one serialized transaction
+            with self.db.transaction() as conn:
+                c = conn.cursor()
 
-            # Fetch all column names
-            c.execute(f"PRAGMA table_info({self.table_name})")
-            columns = [info[1] for info in c.fetchall()]
+                # Fetch all column names
+                c.execute(f"PRAGMA table_info({self.table_name})")
+                columns = [info[1] for info in c.fetchall()]
 
-            # Get the next available ID
-            next_id = self.db.get_next_unused_id()
+                # Get the next available ID
+                next_id = self.db.get_next_unused_id()
 
-            # Remove 'ID' column from column list for insertion
-            columns_without_id = [col for col in columns if col.lower() != "id"]
+                # Remove 'ID' column from column list for insertion
+                columns_without_id = [col for col in columns if col.lower() != "id"]
 
-            if len(values) != len(columns_without_id):
-                raise ValueError(f"Expected {len(columns_without_id)} values, but got {len(values)}")
+                if len(values) != len(columns_without_id):
+                    raise ValueError(f"Expected {len(columns_without_id)} values, but got {len(values)}")
 
-            # Construct the INSERT statement, explicitly specifying the ID
-            column_names = ", ".join(["ID"] + columns_without_id)
-            placeholders = ", ".join(["?"] * (len(values) + 1))  # +1 for ID
-            insert_query = f"INSERT INTO {self.table_name} ({column_names}) VALUES ({placeholders})"
+                # Construct the INSERT statement, explicitly specifying the ID
+                column_names = ", ".join(["ID"] + columns_without_id)
+                placeholders = ", ".join(["?"] * (len(values) + 1))  # +1 for ID
+                insert_query = f"INSERT INTO {self.table_name} ({column_names}) VALUES ({placeholders})"
 
-            # Insert new row with the manually assigned ID
-            c.execute(insert_query, (next_id, *values))
-            self.conn.commit()
+                # Insert new row with the manually assigned ID
+                c.execute(insert_query, (next_id, *values))
+            invalidate_catalog(self.db)
 
             messagebox.showinfo("Erfolg", "Rolle wurde hinzugefügt")
             self.clear_inputs()
@@ -3,6 +3,7 @@ from tkinter import ttk
 from tkinter import messagebox
 
 from src.data.database import Database
+from src.services.cost_cache import invalidate_catalog
 
 
 class DeleteWindow:
@@ -109,27 +110,27 @@ class DeleteWindow:
             return
 
         try:
-            cursor = self.conn.cursor()
-
-            for item in selected_items:
-                # Get row values and extract the ID
-                row_values = self.tree.item(item)['values']
-                row_id = row_values[0]  # Assuming ID is the first column
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
 
-                if row_id is None:
-                    continue  # Skip if ID is missing
+                for item in selected_items:
+                    # Get row values and extract the ID
+                    row_values = self.tree.item(item)['values']
+                    row_id = row_values[0]  # Assuming ID is the first column
 
-                # Store deleted row for undo (including ID)
-                self.deleted_rows.append(row_values)
+                    if row_id is None:
+                        continue  # Skip if ID is missing
 
-                # Remove from Treeview
-                self.tree.delete(item)
+                    # Store deleted row for undo (including ID)
+                    self.deleted_rows.append(row_values)
 
-                # Delete from database using ID
-                query = f"DELETE FROM {self.table_name} WHERE ID = ?"
-                cursor.execute(query, (row_id,))
+                    # Remove from Treeview
+                    self.tree.delete(item)
 
-            self.conn.commit()
+                    # Delete from database using ID
+                    query = f"DELETE FROM {self.table_name} WHERE ID = ?"
+                    cursor.execute(query, (row_id,))
+            invalidate_catalog(self.db)
 
             # Enable Undo button if there are deleted rows
             if self.deleted_rows:
@@ -149,24 +150,23 @@ class DeleteWindow:
         try:
             last_deleted_row = self.deleted_rows.pop()  # Get last deleted row
 
-            cursor = self.conn.cursor()
-
-            # Get all column names including ID
-            column_names = self.tree["columns"]
-            placeholders = ', '.join(['?'] * len(last_deleted_row))
-            query = f"INSERT INTO {self.table_name} ({', '.join(column_names)}) VALUES ({placeholders})"
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
 
-            # Check if the original ID already exists
-            cursor.execute(f"SELECT COUNT(*) FROM {self.table_name} WHERE ID = ?", (last_deleted_row[0],))
-            if cursor.fetchone()[0] > 0:
-                messagebox.showerror("Error", f"Cannot restore: ID {last_deleted_row[0]} already exists!")
-                return
+                # Get all column names including ID
+                column_names = self.tree["columns"]
+                placeholders = ', '.join(['?'] * len(last_deleted_row))
+                query = f"INSERT INTO {self.table_name} ({', '.join(column_names)}) VALUES ({placeholders})"
 
-            # Insert row with original ID
-            cursor.execute(query, last_deleted_row)
+                # Check if the original ID already exists
+                cursor.execute(f"SELECT COUNT(*) FROM {self.table_name} WHERE ID = ?", (last_deleted_row[0],))
+                if cursor.fetchone()[0] > 0:
+                    messagebox.showerror("Error", f"Cannot restore: ID {last_deleted_row[0]} already exists!")
+                    return
 
-            # Commit changes
-            self.conn.commit()
+                # Insert row with original ID
+                cursor.execute(query, last_deleted_row)
+            invalidate_catalog(self.db)
 
             # Reinsert restored row into Treeview
             self.tree.insert('', 'end', values=last_deleted_row)
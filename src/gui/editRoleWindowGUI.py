@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from src.data.database import Database
+from src.services.cost_cache import invalidate_catalog
 
 
 class EditWindow:
@@ -213,15 +214,14 @@ class EditWindow:
                 return
 
 
-        cursor = self.conn.cursor()
-
         column_names = self.tree["columns"]
         set_clause = ", ".join([f"{col} = ?" for col in column_names[1:]])
         query = f"UPDATE {self.table_name} SET {set_clause} WHERE {column_names[0]} = ?"
 
         try:
-            cursor.execute(query, updated_values[1:] + [row_id])
-            self.conn.commit()
+            with self.db.transaction() as conn:
+                conn.execute(query, updated_values[1:] + [row_id])
+            invalidate_catalog(self.db)
 
             self.tree.item(selected_item[0], values=updated_values)
 
@@ -242,15 +242,14 @@ class EditWindow:
 
         item, old_values = self.undo_stack.pop()
 
-        cursor = self.conn.cursor()
-
         column_names = self.tree["columns"]
         set_clause = ", ".join([f"{col} = ?" for col in column_names[1:]])
         query = f"UPDATE {self.table_name} SET {set_clause} WHERE {column_names[0]} = ?"
 
         try:
-            cursor.execute(query, old_values[1:] + [old_values[0]])
-            self.conn.commit()
+            with self.db.transaction() as conn:
+                conn.execute(query, old_values[1:] + [old_values[0]])
+            invalidate_catalog(self.db)
 
             self.tree.item(item, values=old_values)
 
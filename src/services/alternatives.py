@@ -0,0 +1,138 @@
+import heapq
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.services import shared_matrix
+from src.services.incremental import IncrementalAssignment
+
+
+def solve_child(costs: np.ndarray, big: float, forced, excluded, state, row: int):
+    """
+        Solves one Murty subproblem, warm-started from the solution of its parent node.
+
+        The child forces some pairs of the parent solution and excludes one more (row, column)
+        pair. Forcing only raises the costs of unassigned cells, so the parent's assignment and
+        potentials stay optimal for them; only the excluded row is re-augmented. The constraints
+        are applied by the solver when it reads rows (see IncrementalAssignment.constrain), so
+        the matrix is never copied.
+
+        Parameters:
+            - costs (np.ndarray): The unconstrained cost matrix (rows <= columns).
+            - big (float): Cost of a blocked cell, larger than any feasible assignment.
+            - forced (List[Tuple[int, int]]): Pairs the assignment must contain.
+            - excluded (List[Tuple[int, int]]): Pairs the assignment must not contain; the last
+              one is the pair newly excluded in this child.
+            - state (tuple): Potentials and assignment of the parent (IncrementalAssignment.state()).
+            - row (int): Row of the newly excluded pair.
+
+        Returns:
+            Optional[Tuple[float, np.ndarray, np.ndarray, tuple]]: Cost, row and column indices and
+            solver state, or None if the constraints leave no feasible assignment.
+    """
+    engine = IncrementalAssignment.from_state(costs, *state)
+    engine.constrain(forced, excluded, big)
+    engine.update_rows([row])
+    row_ind, col_ind = engine.solution()
+    if len(row_ind) < costs.shape[0] or engine.blocked(row_ind, col_ind).any():
+        return None
+    return float(costs[row_ind, col_ind].sum()), row_ind, col_ind, engine.state()
+
+
+def _solve_shared_child(arguments):
+    return solve_child(shared_matrix.worker_matrix(), *arguments)
+
+
+class MurtyEnumerator:
+    """
+        Enumerates the k best distinct assignments of a cost matrix in increasing cost (Murty).
+
+        Every node of the search is a subset of assignments given by forced and excluded pairs,
+        together with its optimal assignment. The best open node is reported and partitioned
+        into children: child t keeps the first t - 1 free pairs of the node's assignment and
+        excludes pair t. Children are solved warm-started from the node's potentials, which costs
+        one augmenting path each, and can be solved in parallel worker processes.
+
+        Matrices with more rows than columns are enumerated on their transpose, so every row of
+        the enumerated matrix is assigned.
+    """
+
+    def __init__(self, cost_matrix: np.ndarray):
+        """
+            Parameters:
+                - cost_matrix (np.ndarray): Students x roles cost matrix.
+        """
+        self.transposed = cost_matrix.shape[0] > cost_matrix.shape[1]
+        self.costs = np.ascontiguousarray(cost_matrix.T if self.transposed else cost_matrix)
+        size = max(self.costs.shape)
+        bound = max(abs(float(self.costs.min(initial=0))), abs(float(self.costs.max(initial=0))))
+        self.big = 2 * (bound + 1) * (size + 1)
+        self.nodes_solved = 0
+
+    def enumerate(self, k: int, time_budget: Optional[float] = None,
+                  max_workers: int = 1) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+        """
+            Returns up to k best distinct assignments in increasing cost.
+
+            Parameters:
+                - k (int): Number of assignments.
+                - time_budget (Optional[float]): Seconds after which the assignments found so far are
+                  returned. The optimal assignment is always included.
+                - max_workers (int): Worker processes for the child subproblems (1 solves them in the
+                  calling process).
+
+            Returns:
+                List[Tuple[float, np.ndarray, np.ndarray]]: Cost, row and column indices per assignment.
+        """
+        start = time.perf_counter()
+        num_rows = self.costs.shape[0]
+        results = []
+        if k <= 0 or num_rows == 0:
+            return results
+
+        root = IncrementalAssignment(self.costs)
+        row_ind, col_ind = root.solution()
+        counter = itertools.count()
+        heap = [(float(self.costs[row_ind, col_ind].sum()), next(counter), row_ind, col_ind, root.state(), (), ())]
+        self.nodes_solved = 1
+
+        with ExitStack() as stack:
+            executor = None
+            if max_workers > 1:
+                initargs = stack.enter_context(shared_matrix.shared_matrix(self.costs))
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(max_workers, initializer=shared_matrix.attach, initargs=initargs))
+
+            while heap and len(results) < k:
+                cost, _, row_ind, col_ind, state, forced, excluded = heapq.heappop(heap)
+                rows, columns = row_ind, col_ind
+                if self.transposed:
+                    order = np.argsort(col_ind)
+                    rows, columns = col_ind[order], row_ind[order]
+                results.append((cost, rows, columns))
+                if len(results) >= k or (time_budget is not None and time.perf_counter() - start > time_budget):
+                    break
+
+                # Partition the node on its free pairs
+                forced_rows = {i for i, _ in forced}
+                free_pairs = [(i, j) for i, j in zip(row_ind.tolist(), col_ind.tolist()) if i not in forced_rows]
+                children = [(self.big, forced + tuple(free_pairs[:t]), excluded + (pair,), state, pair[0])
+                            for t, pair in enumerate(free_pairs)]
+
+                if executor is not None:
+                    solved = list(executor.map(_solve_shared_child, children))
+                else:
+                    solved = [solve_child(self.costs, *child) for child in children]
+                self.nodes_solved += len(children)
+
+                for child, result in zip(children, solved):
+                    if result is not None:
+                        child_cost, child_rows, child_columns, child_state = result
+                        heapq.heappush(heap, (child_cost, next(counter), child_rows, child_columns, child_state,
+                                              child[1], child[2]))
+
+        return results
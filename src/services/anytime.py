@@ -0,0 +1,238 @@
+import time
+import numpy as np
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class BudgetExhausted(Exception):
+    """Raised when the time budget of an anytime solve has run out (or would run out during the next solver run)."""
+
+
+class AnytimeSearch:
+    """
+        Keeps the best valid assignment found so far and a lower bound on the optimum, so a solve with a
+        time budget can stop between solver runs and still report how far from optimal its result is.
+
+        An assignment is valid if every special group is assigned completely or not at all. Its objective
+        is the cost without special group adjustments, plus the group bonus for every assigned role of a
+        (completely assigned) group, plus a penalty per student left unassigned that outweighs any cost
+        difference (as in SpecialGroupSearch). Every assignment offered by the solver is repaired into a
+        valid one first: partially assigned groups are either completed or dropped, and students without
+        a role take the cheapest free role outside the special groups.
+    """
+
+    def __init__(self, type_rows: np.ndarray, student_types: np.ndarray, special_groups: Dict[int, Set[int]],
+                 group_bonus: float, time_budget: float):
+        """
+            Parameters:
+                - type_rows (np.ndarray): Cost rows per student type, without special group adjustments.
+                - student_types (np.ndarray): Type index of every student.
+                - special_groups (Dict[int, Set[int]]): GroupIDs mapped to the role indices of the group.
+                - group_bonus (float): Cost added to every role of an assigned group.
+                - time_budget (float): Seconds from now until the deadline.
+        """
+        self.type_rows = type_rows
+        self.student_types = student_types
+        self.special_groups = special_groups
+        self.group_bonus = group_bonus
+        self.start = time.perf_counter()
+        self.deadline = self.start + time_budget
+        self.last_check = self.start
+
+        num_students, num_roles = len(student_types), type_rows.shape[1]
+        self.group_of_role = np.full(num_roles, -1)
+        for index, role_indices in enumerate(special_groups.values()):
+            self.group_of_role[sorted(role_indices)] = index
+        self.group_sizes = np.array([len(role_indices) for role_indices in special_groups.values()], dtype=np.intp)
+        bonus = abs(group_bonus) if special_groups else 0
+        bound = max(abs(type_rows.min(initial=0)), abs(type_rows.max(initial=0))) + bonus
+        self.unassigned_penalty = 2 * (bound + 1) * max(num_students, 1)
+        self.max_assigned = min(num_students, num_roles)
+
+        self.row_ind = None
+        self.col_ind = None
+        self.best_cost = np.inf  # Objective of the best valid assignment
+        self.lower_bound = -np.inf
+        self.history: List[Tuple[float, float, float]] = []  # (seconds, best cost, lower bound) per improvement
+
+    @property
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.deadline
+
+    def check_deadline(self, next_run: bool = False):
+        """
+            Raises BudgetExhausted if the deadline has passed.
+
+            With next_run, called between solver runs that cannot be interrupted, it is also raised if the
+            next run would end after the deadline, estimating its duration by the time since the previous check.
+        """
+        now = time.perf_counter()
+        estimate = now - self.last_check if next_run else 0.0
+        self.last_check = now
+        if now + estimate >= self.deadline:
+            raise BudgetExhausted()
+
+    @property
+    def gap(self) -> float:
+        """Relative distance of the best cost to the lower bound (0 = proven optimal)."""
+        if not np.isfinite(self.best_cost) or not np.isfinite(self.lower_bound):
+            return np.inf
+        return max(self.best_cost - self.lower_bound, 0) / max(abs(self.best_cost), 1e-9)
+
+    def cell_costs(self, row_ind: np.ndarray, col_ind: np.ndarray) -> np.ndarray:
+        """Costs of the given cells, with the group bonus on the roles of special groups."""
+        return self.type_rows[self.student_types[row_ind], col_ind] + self.group_bonus * (self.group_of_role[col_ind] >= 0)
+
+    def objective(self, row_ind: np.ndarray, col_ind: np.ndarray) -> float:
+        """Objective of a valid assignment."""
+        return float(self.cell_costs(row_ind, col_ind).sum() + self.unassigned_penalty * (self.max_assigned - len(row_ind)))
+
+    def relaxation_offsets(self) -> np.ndarray:
+        """Role offsets of the relaxation: every group is optional and gets the bonus only if it is negative."""
+        return min(self.group_bonus, 0) * (self.group_of_role >= 0)
+
+    def minimum_bound(self) -> float:
+        """
+            Lower bound without solving, under relaxation_offsets(): every assigned student costs at least its
+            cheapest role and every assigned role at least its cheapest student (the larger sum is taken).
+        """
+        if not self.max_assigned:
+            return 0.0
+        costs = self.type_rows + self.relaxation_offsets()  # Every type has at least one student
+        row_minima = np.sort(costs.min(axis=1)[self.student_types])[:self.max_assigned]
+        column_minima = np.sort(costs.min(axis=0))[:self.max_assigned]
+        return float(max(row_minima.sum(), column_minima.sum()))
+
+    def take_relaxation(self, row_ind, col_ind):
+        """
+            Uses an optimal assignment under relaxation_offsets(): its cost is a lower bound on every valid
+            assignment and its repair is a candidate.
+        """
+        row_ind, col_ind = np.asarray(row_ind, dtype=np.intp), np.asarray(col_ind, dtype=np.intp)
+        bound = (self.type_rows[self.student_types[row_ind], col_ind].sum() + self.relaxation_offsets()[col_ind].sum()
+                 + self.unassigned_penalty * (self.max_assigned - len(row_ind)))
+        self.offer(row_ind, col_ind)
+        self.raise_bound(float(bound))
+
+    def partial_groups(self, assignment: np.ndarray) -> np.ndarray:
+        """Indices of the groups that are assigned partially in a role index per student (-1 = none)."""
+        groups = self.group_of_role[assignment[assignment >= 0]]
+        assigned_per_group = np.bincount(groups[groups >= 0], minlength=len(self.special_groups))
+        return np.flatnonzero((assigned_per_group > 0) & (assigned_per_group < self.group_sizes))
+
+    def complete_groups(self, assignment: np.ndarray, groups: Iterable[int]):
+        """
+            Fills the free roles of the given groups (in place): each free role takes the student whose cost
+            rises least, preferring students without a role. Groups without enough movable students are
+            skipped.
+        """
+        role_holder = np.full(len(self.group_of_role), -1)
+        role_holder[assignment[assignment >= 0]] = np.flatnonzero(assignment >= 0)
+        for group in groups:
+            free_roles = np.flatnonzero((self.group_of_role == group) & (role_holder < 0))
+            # Students without a role or on a role outside the special groups can move
+            movable = assignment < 0
+            movable[assignment >= 0] = self.group_of_role[assignment[assignment >= 0]] < 0
+            if movable.sum() < len(free_roles):
+                continue
+            for role in free_roles.tolist():
+                candidates = np.flatnonzero(movable)
+                current = assignment[candidates]
+                current_cost = np.where(current >= 0, self.type_rows[self.student_types[candidates], current],
+                                        self.unassigned_penalty)
+                student = candidates[np.argmin(self.type_rows[self.student_types[candidates], role] - current_cost)]
+                if assignment[student] >= 0:
+                    role_holder[assignment[student]] = -1
+                assignment[student] = role
+                role_holder[role] = student
+                movable[student] = False
+
+    def fill(self, assignment: np.ndarray):
+        """Gives every student without a role (in student order) the cheapest free role outside the special groups."""
+        taken = self.group_of_role >= 0
+        taken[assignment[assignment >= 0]] = True
+        free_roles = np.flatnonzero(~taken)
+        if not len(free_roles):
+            return
+
+        # Each student type walks through the free roles in increasing cost, skipping the taken ones
+        orders = {}
+        positions = {}
+        for student in np.flatnonzero(assignment < 0).tolist():
+            student_type = int(self.student_types[student])
+            if student_type not in orders:
+                orders[student_type] = free_roles[np.argsort(self.type_rows[student_type, free_roles], kind="stable")]
+                positions[student_type] = 0
+            order, position = orders[student_type], positions[student_type]
+            while position < len(order) and taken[order[position]]:
+                position += 1
+            positions[student_type] = position
+            if position == len(order):
+                break  # No free role is left
+            taken[order[position]] = True
+            assignment[student] = order[position]
+
+    def repair(self, row_ind: np.ndarray, col_ind: np.ndarray, complete: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+            Makes an assignment valid and completes it greedily.
+
+            The assignments to partially assigned groups are dropped and every student without a role takes
+            the cheapest free role outside the special groups (see fill). With complete, the partial groups
+            are completed first, and if students are still left without a role, unassigned groups are
+            filled with them (see complete_groups).
+        """
+        assignment = np.full(len(self.student_types), -1)
+        assignment[row_ind] = col_ind
+        if complete:
+            self.complete_groups(assignment, self.partial_groups(assignment).tolist())
+        partial = np.zeros(len(self.special_groups) + 1, dtype=bool)  # The last entry stands for "no group"
+        partial[self.partial_groups(assignment)] = True
+        assignment[(assignment >= 0) & partial[self.group_of_role[np.maximum(assignment, 0)]]] = -1
+        self.fill(assignment)
+
+        if complete and (assignment < 0).any():
+            assigned_groups = set(self.group_of_role[assignment[assignment >= 0]].tolist())
+            self.complete_groups(assignment, [g for g in range(len(self.special_groups)) if g not in assigned_groups])
+            self.fill(assignment)
+
+        row_ind = np.flatnonzero(assignment >= 0)
+        return row_ind, assignment[row_ind]
+
+    def offer(self, row_ind, col_ind) -> bool:
+        """
+            Repairs an assignment (once dropping and once completing its partial groups, see repair) and
+            keeps the better repair if it improves the best assignment.
+
+            Returns:
+                bool: Whether the best assignment changed.
+        """
+        row_ind, col_ind = np.asarray(row_ind, dtype=np.intp), np.asarray(col_ind, dtype=np.intp)
+        repairs = [self.repair(row_ind, col_ind)]
+        if self.special_groups:
+            repairs.append(self.repair(row_ind, col_ind, complete=True))
+
+        improved = False
+        for row_ind, col_ind in repairs:
+            cost = self.objective(row_ind, col_ind)
+            if cost < self.best_cost:
+                self.row_ind, self.col_ind, self.best_cost = row_ind, col_ind, cost
+                improved = True
+        if improved:
+            self.record()
+        return improved
+
+    def raise_bound(self, lower_bound: float):
+        """Raises the lower bound (a bound above the best cost proves it optimal)."""
+        self.lower_bound = max(self.lower_bound, min(lower_bound, self.best_cost))
+        self.record()
+
+    def record(self):
+        self.history.append((time.perf_counter() - self.start, self.best_cost, self.lower_bound))
+
+    def summary(self) -> Dict:
+        """Returns the best cost, lower bound, gap and elapsed seconds."""
+        return {
+            "best_cost": self.best_cost,
+            "lower_bound": self.lower_bound,
+            "gap": self.gap,
+            "seconds": time.perf_counter() - self.start,
+        }
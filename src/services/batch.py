@@ -0,0 +1,229 @@
+# Run batch with: python -m src.services.batch "src/data/survey_data/*.csv" --output-dir results
+
+import argparse
+import csv
+import glob
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from src.data.survey_loader import load_students
+from src.models.role import Role
+from src.services.profiling import StageTracer
+from src.services.role_assignment import RoleAssignment
+
+SUMMARY_FIELDS = ["Datei", "Ergebnisdatei", "Teilnehmende", "Rollen", "Zugewiesen", "Veto verletzt",
+                  "Nicht zugewiesen", "Gesamtkosten", "Abdeckung", "Dauer [s]", "Fehler"]
+
+
+class CatalogSnapshot:
+    """
+        Read-only copy of the role catalog and special groups of a Database.
+
+        It serves the Database methods used by RoleAssignment, so it can replace the database
+        in worker processes: the catalog is queried once and shipped to the workers instead of
+        every worker opening its own SQLite connection.
+    """
+
+    def __init__(self, just8b_roles: List[Role], all_roles: List[Role], special_groups: Dict[int, List[int]],
+                 catalog_version: Optional[int] = None):
+        """
+            Parameters:
+                - just8b_roles (List[Role]): Roles of the just8b case.
+                - all_roles (List[Role]): All roles.
+                - special_groups (Dict[int, List[int]]): Special group IDs mapped to their role IDs.
+                - catalog_version (Optional[int]): Catalog version of the source database.
+        """
+        self.just8b_roles = just8b_roles
+        self.all_roles = all_roles
+        self.special_groups = special_groups
+        self.catalog_version = catalog_version
+
+    @classmethod
+    def from_database(cls, db) -> "CatalogSnapshot":
+        """
+            Loads the snapshot from a Database.
+        """
+        special_groups = db.fetch_special_group_roles()
+        catalog = db.role_catalog()
+        return cls(catalog.just8b_roles, catalog.all_roles, special_groups, getattr(db, "catalog_version", None))
+
+    def load_roles_for_just8b(self) -> List[Role]:
+        return self.just8b_roles
+
+    def fetch_all_roles(self) -> List[Role]:
+        return self.all_roles
+
+    def fetch_special_groups_ID(self) -> List[int]:
+        return list(self.special_groups)
+
+    def fetch_special_group_roles(self) -> Dict[int, List[int]]:
+        return self.special_groups
+
+    def get_roles_from_group(self, group_id: int) -> List[Role]:
+        role_ids = set(self.special_groups.get(group_id, []))
+        return [role for role in self.all_roles if role.id in role_ids]
+
+
+def result_paths(file_paths: List[str], output_dir: str) -> List[str]:
+    """
+        Returns the paths of the results CSVs for the input files (<name>_ergebnis.csv).
+
+        Inputs with the same file name in different directories are named after their path relative
+        to the common parent directory (a/kurs.csv -> a_kurs_ergebnis.csv), and names that still
+        collide get their position in the batch appended, so no results file is overwritten.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in file_paths]
+    duplicates = {stem for stem, count in Counter(stems).items() if count > 1}
+    if duplicates:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in file_paths])
+        stems = [os.path.relpath(os.path.splitext(os.path.abspath(path))[0], root).replace(os.sep, "_")
+                 if stem in duplicates else stem for path, stem in zip(file_paths, stems)]
+
+    counts = Counter(stems)
+    return [os.path.join(output_dir, f"{stem}_{index + 1}_ergebnis.csv" if counts[stem] > 1 else f"{stem}_ergebnis.csv")
+            for index, stem in enumerate(stems)]
+
+
+def solve_file(file_path: str, catalog: CatalogSnapshot, output_path: str, options: Dict,
+               profile: bool = False, walk_workers: Optional[int] = None) -> Dict:
+    """
+        Solves the assignment for one survey file and writes its results CSV and stage timings
+        (<name>_ergebnis_stages.json, see StageTracer).
+
+        Errors are recorded in the returned summary row, so one broken file does not stop a batch.
+
+        Parameters:
+            - file_path (str): Path of the survey CSV.
+            - catalog (CatalogSnapshot): The role catalog.
+            - output_path (str): Path of the results CSV (see result_paths).
+            - options (Dict): Keyword arguments for RoleAssignment (e.g. backend).
+            - profile (bool): Also dump a cProfile statistics file (<name>_ergebnis.pstats).
+            - walk_workers (Optional[int]): Worker processes of the "multistart" strategy
+              (see RoleAssignment.max_workers).
+
+        Returns:
+            Dict: One summary row (see SUMMARY_FIELDS).
+    """
+    start = time.perf_counter()
+    row = dict.fromkeys(SUMMARY_FIELDS, "")
+    row["Datei"] = file_path
+    try:
+        row["Ergebnisdatei"] = output_path
+        tracer = StageTracer(profile_path=os.path.splitext(output_path)[0] + ".pstats" if profile else None)
+        with tracer.stage("load_students"):
+            students = load_students(file_path)
+        solver = RoleAssignment(catalog, students, tracer=tracer, **options)
+        solver.max_workers = walk_workers
+        result = solver.solve()
+
+        solver.write_results_to_csv(row["Ergebnisdatei"], write_stage_summary=True)
+        row.update({
+            "Teilnehmende": len(students),
+            "Rollen": len(solver.roles),
+            "Zugewiesen": int((~result.high_cost_mask).sum()),
+            "Veto verletzt": int(result.high_cost_mask.sum()),
+            "Nicht zugewiesen": len(result.not_assigned),
+            "Gesamtkosten": result.min_cost,
+            "Abdeckung": result.coverage,
+        })
+    except Exception as e:
+        row["Fehler"] = str(e)
+    row["Dauer [s]"] = round(time.perf_counter() - start, 4)
+    return row
+
+
+def solve_files(file_paths: Iterable[str], catalog: CatalogSnapshot, output_dir: str,
+                max_workers: Optional[int] = None, profile: bool = False, **options) -> List[Dict]:
+    """
+        Solves many survey files in parallel worker processes and writes a summary CSV.
+
+        Every file is an independent assignment, so the files are fanned out over a
+        ProcessPoolExecutor; the catalog is loaded once by the caller and pickled to the workers.
+        The walks of the "multistart" strategy run serially inside the workers instead of starting
+        a pool per file (the result does not depend on the number of walk workers).
+
+        Parameters:
+            - file_paths (Iterable[str]): Paths of the survey CSVs.
+            - catalog (CatalogSnapshot): The role catalog.
+            - output_dir (str): Directory for the results CSVs and summary.csv.
+            - max_workers (Optional[int]): Number of worker processes (default: number of CPUs).
+              With 1 the files are solved in the calling process.
+            - profile (bool): Dump a cProfile statistics file per input file (see solve_file).
+            - options: Keyword arguments for RoleAssignment.
+
+        Returns:
+            List[Dict]: One summary row per file, in input order.
+    """
+    file_paths = list(file_paths)
+    output_paths = result_paths(file_paths, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    if max_workers == 1:
+        rows = [solve_file(path, catalog, output_path, options, profile)
+                for path, output_path in zip(file_paths, output_paths)]
+    else:
+        count = len(file_paths)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(solve_file, file_paths, [catalog] * count, output_paths,
+                                     [options] * count, [profile] * count, [1] * count))
+
+    with open(os.path.join(output_dir, "summary.csv"), mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return rows
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Expands files, directories (all CSVs inside) and glob patterns into a sorted list of CSV paths."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.csv")
+        paths.update(glob.glob(pattern))
+    return sorted(paths)
+
+
+def main():
+    from src.data.database import Database
+
+    parser = argparse.ArgumentParser(description="Solve the role assignment for many survey files.")
+    parser.add_argument("inputs", nargs="+", help="Survey CSV files, directories or glob patterns.")
+    parser.add_argument("--output-dir", default="results", help="Directory for the results and summary.csv.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--strategy", choices=["random", "exact", "multistart"], default="random",
+                        help="Special group strategy.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the randomized strategies.")
+    parser.add_argument("--backend", choices=["dense", "sparse", "compressed", "streaming"], default="dense",
+                        help="Solver backend.")
+    parser.add_argument("--profile", action="store_true", help="Dump a cProfile statistics file per input file.")
+    args = parser.parse_args()
+
+    file_paths = expand_paths(args.inputs)
+    if not file_paths:
+        parser.error("Keine CSV-Dateien gefunden.")
+
+    db = Database()
+    try:
+        catalog = CatalogSnapshot.from_database(db)
+    finally:
+        db.close()
+
+    start = time.perf_counter()
+    rows = solve_files(file_paths, catalog, args.output_dir, args.workers, args.profile,
+                       special_group_strategy=args.strategy, backend=args.backend, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    failed = [row for row in rows if row["Fehler"]]
+    print(f"{len(rows) - len(failed)} von {len(rows)} Dateien gelöst in {elapsed:.2f}s "
+          f"(Zusammenfassung: {os.path.join(args.output_dir, 'summary.csv')})")
+    for row in failed:
+        print(f"❌ {row['Datei']}: {row['Fehler']}")
+
+
+if __name__ == "__main__":
+    main()
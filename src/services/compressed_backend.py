@@ -0,0 +1,165 @@
+import numpy as np
+from typing import Optional, Tuple
+
+from src.services.cost_model import CostModel
+
+
+def transportation_flow(supply: np.ndarray, demand: np.ndarray, costs: np.ndarray) -> np.ndarray:
+    """
+        Solves a min-cost transportation problem with successive shortest paths.
+
+        Ships min(sum(supply), sum(demand)) units from the supply buckets to the demand buckets
+        at minimum total cost. Every supply bucket can ship to every demand bucket, so the
+        residual graph is dense and the Bellman-Ford relaxations are done on whole arrays.
+
+        Parameters:
+            - supply (np.ndarray): Units available per supply bucket.
+            - demand (np.ndarray): Units accepted per demand bucket.
+            - costs (np.ndarray): Cost per unit from each supply to each demand bucket.
+
+        Returns:
+            np.ndarray: Integer flow per (supply, demand) pair.
+    """
+    num_supply, num_demand = costs.shape
+    flow = np.zeros((num_supply, num_demand), dtype=np.int64)
+    supply_left = np.asarray(supply, dtype=np.int64).copy()
+    demand_left = np.asarray(demand, dtype=np.int64).copy()
+    target = min(supply_left.sum(), demand_left.sum())
+    shipped = 0
+
+    while shipped < target:
+        # Shortest distances from the source: supply buckets with units left start at 0.
+        # Predecessors only change on a strict improvement, so ties on zero-cost residual
+        # cycles cannot turn the predecessor graph into a loop.
+        dist_supply = np.where(supply_left > 0, 0.0, np.inf)
+        pred_supply = np.full(num_supply, -1)
+        dist_demand = np.full(num_demand, np.inf)
+        pred_demand = np.full(num_demand, -1)
+        while True:
+            through = dist_supply[:, np.newaxis] + costs
+            forward_pred = through.argmin(axis=0)
+            forward_dist = through[forward_pred, np.arange(num_demand)]
+            improved_demand = forward_dist < dist_demand - 1e-9
+            dist_demand[improved_demand] = forward_dist[improved_demand]
+            pred_demand[improved_demand] = forward_pred[improved_demand]
+
+            # Backward arcs demand -> supply exist where flow can be sent back
+            back = np.where(flow > 0, dist_demand[np.newaxis, :] - costs, np.inf)
+            back_pred = back.argmin(axis=1)
+            back_dist = back[np.arange(num_supply), back_pred]
+            improved_supply = back_dist < dist_supply - 1e-9
+            if not improved_demand.any() and not improved_supply.any():
+                break
+            dist_supply[improved_supply] = back_dist[improved_supply]
+            pred_supply[improved_supply] = back_pred[improved_supply]
+
+        # Augment to the closest demand bucket that still accepts units
+        sink_dist = np.where(demand_left > 0, dist_demand, np.inf)
+        demand_bucket = int(sink_dist.argmin())
+
+        path = []
+        b = demand_bucket
+        while True:
+            a = int(pred_demand[b])
+            path.append((a, b))
+            if pred_supply[a] == -1:
+                break
+            b = int(pred_supply[a])
+
+        amount = min(supply_left[a], demand_left[demand_bucket], target - shipped)
+        for a_back, b_back in zip([a for a, _ in path[:-1]], [b for _, b in path[1:]]):
+            amount = min(amount, flow[a_back, b_back])
+
+        for a_forward, b_forward in path:
+            flow[a_forward, b_forward] += amount
+        for a_back, b_back in zip([a for a, _ in path[:-1]], [b for _, b in path[1:]]):
+            flow[a_back, b_back] -= amount
+        supply_left[a] -= amount
+        demand_left[demand_bucket] -= amount
+        shipped += amount
+
+    return flow
+
+
+class CompressedProblem:
+    """
+        Assignment problem compressed to student types and role buckets.
+
+        A student's cost row only depends on its (preferred, excluded) gender type, and a role's
+        cost column only on its gender, hierarchy and cost offset. Students and roles are
+        therefore aggregated into buckets, a transportation problem is solved between the
+        buckets, and the flow is expanded back to individual students and roles in index order
+        (stable tie-breaking). Memory and time depend on the number of buckets, not on n x m.
+        Implements the problem interface of DenseProblem.
+    """
+
+    def __init__(self, cost_model: CostModel, type_rows: np.ndarray, role_offsets: Optional[np.ndarray] = None):
+        """
+            Parameters:
+                - cost_model (CostModel): Encoded students and roles.
+                - type_rows (np.ndarray): Per-type cost rows (including the veto penalty).
+                - role_offsets (Optional[np.ndarray]): Cost already added to each role (e.g. special groups).
+        """
+        self.cost_model = cost_model
+        self.type_rows = type_rows
+        self.shape = (len(cost_model.students), len(cost_model.roles))
+        self.role_offsets = np.zeros(self.shape[1]) if role_offsets is None else role_offsets
+
+        # Students of each type in index order
+        order = np.argsort(cost_model.student_types, kind="stable")
+        counts = np.bincount(cost_model.student_types, minlength=len(type_rows))
+        self.type_counts = counts
+        self.students_by_type = np.split(order, np.cumsum(counts)[:-1]) if len(counts) else []
+
+    def cost_bounds(self) -> Tuple[float, float]:
+        """Returns the smallest and largest cell cost."""
+        costs = self.type_rows + self.role_offsets
+        return costs.min(initial=0), costs.max(initial=0)
+
+    def cell_costs(self, row_ind: np.ndarray, col_ind: np.ndarray) -> np.ndarray:
+        """Returns the costs of the given (student, role) cells."""
+        return self.type_rows[self.cost_model.student_types[row_ind], col_ind] + self.role_offsets[col_ind]
+
+    def solve(self, offsets: np.ndarray, active: np.ndarray):
+        """
+            Solves the assignment restricted to the active roles.
+
+            Parameters:
+                - offsets (np.ndarray): Cost added to every cell of each role.
+                - active (np.ndarray): Boolean mask of the roles that may be assigned.
+
+            Returns:
+                Tuple[np.ndarray, np.ndarray]: Assigned student indices and their role indices.
+        """
+        active_columns = np.flatnonzero(active)
+        if self.shape[0] == 0 or len(active_columns) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        # Roles with identical cost columns form one bucket
+        columns = self.type_rows[:, active_columns] + (self.role_offsets + offsets)[active_columns]
+        bucket_costs, role_buckets = np.unique(columns, axis=1, return_inverse=True)
+        role_buckets = role_buckets.reshape(-1)
+        bucket_counts = np.bincount(role_buckets, minlength=bucket_costs.shape[1])
+
+        # Constant shift keeps the distances small; every solution ships the same number of units
+        flow = transportation_flow(self.type_counts, bucket_counts, bucket_costs - bucket_costs.min())
+
+        role_order = np.argsort(role_buckets, kind="stable")
+        roles_by_bucket = np.split(active_columns[role_order], np.cumsum(bucket_counts)[:-1])
+
+        # Hand out students and roles of each bucket pair in index order
+        row_parts, col_parts = [], []
+        next_student = np.zeros(len(self.type_counts), dtype=np.int64)
+        next_role = np.zeros(len(bucket_counts), dtype=np.int64)
+        for student_type, bucket in zip(*np.nonzero(flow)):
+            amount = flow[student_type, bucket]
+            start_student, start_role = next_student[student_type], next_role[bucket]
+            row_parts.append(self.students_by_type[student_type][start_student:start_student + amount])
+            col_parts.append(roles_by_bucket[bucket][start_role:start_role + amount])
+            next_student[student_type] += amount
+            next_role[bucket] += amount
+
+        row_ind = np.concatenate(row_parts)
+        col_ind = np.concatenate(col_parts)
+        order = np.argsort(row_ind, kind="stable")
+        return row_ind[order], col_ind[order]
@@ -0,0 +1,97 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+
+class CostRowCache:
+    """
+        LRU cache of per-student-type cost rows, shared by all RoleAssignment runs of a process.
+
+        A cost row only depends on the role catalog, the cost weights and the student type, so rows
+        are stored per (catalog key, weights, type) and a new cohort on an unchanged catalog gathers
+        the rows of its types instead of recomputing them. The catalog key contains the catalog
+        version of the Database (see Database.invalidate_catalog), so rows of an edited catalog are
+        never reused. Least recently used rows are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+            Parameters:
+                - max_bytes (int): Memory cap for the cached rows (0 disables the cache).
+        """
+        self.max_bytes = max_bytes
+        self.rows = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def gather(self, catalog_key: Hashable, weights: Dict[str, float], type_codes: np.ndarray,
+               compute: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+            Returns the cost rows of the given student types, computing only the missing ones.
+
+            Parameters:
+                - catalog_key (Hashable): Identifies the role catalog (version and role set).
+                - weights (Dict[str, float]): Cost weights the rows were built with.
+                - type_codes (np.ndarray): One (preferred, excluded) code pair per student type.
+                - compute (Callable[[np.ndarray], np.ndarray]): Builds the rows of the given type codes.
+
+            Returns:
+                np.ndarray: A new array with one row per type.
+        """
+        if len(type_codes) == 0 or self.max_bytes <= 0:
+            return compute(type_codes)
+
+        weights_key = tuple(sorted(weights.items()))
+        keys = [(catalog_key, weights_key, code) for code in map(tuple, type_codes.tolist())]
+        cached = [self.rows.get(key) for key in keys]
+        missing = [t for t, row in enumerate(cached) if row is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            computed = compute(type_codes[missing])
+            for t, row in zip(missing, computed):
+                cached[t] = row
+                self._store(keys[t], row)
+        for key in keys:
+            if key in self.rows:
+                self.rows.move_to_end(key)
+
+        return np.stack(cached)
+
+    def _store(self, key, row: np.ndarray):
+        """Stores a read-only copy of a row and evicts the least recently used rows."""
+        if row.nbytes > self.max_bytes:
+            return
+        row = row.copy()
+        row.flags.writeable = False
+        self.rows[key] = row
+        self.nbytes += row.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.rows.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def invalidate(self, catalog_version: Optional[int] = None):
+        """
+            Drops the rows of one catalog version, or all rows if no version is given.
+        """
+        if catalog_version is None:
+            self.rows.clear()
+            self.nbytes = 0
+            return
+        for key in [key for key in self.rows if key[0][0] == catalog_version]:
+            self.nbytes -= self.rows.pop(key).nbytes
+
+
+# Process-wide cache used by RoleAssignment
+cost_row_cache = CostRowCache()
+
+
+def invalidate_catalog(db, cache: CostRowCache = cost_row_cache):
+    """
+        Marks the role catalog of db as changed: drops its cached rows and moves it to a new version.
+        Called after every role add/edit/delete.
+    """
+    cache.invalidate(db.catalog_version)
+    db.invalidate_catalog()
@@ -0,0 +1,256 @@
+import numpy as np
+from typing import Dict, Hashable, List, Optional
+
+from src.models.student import Student
+from src.models.role import Role
+
+# Hierarchy labels in the order of their integer codes (see Role._map_hierarchy)
+HIERARCHIES = ["Essential", "Next", "Rest", "Last", "Unknown"]
+
+# Cost weights in the order of the features of CostModel.type_features()
+FEATURES = ["essential", "next", "rest", "last", "unisex", "matched_gender", "exclusion"]
+
+
+def cost_dtype(weights: Dict[str, float], margin: float = 0) -> np.dtype:
+    """
+        Chooses the smallest dtype that holds every cost of the given weights exactly.
+
+        All default weights are small integers, so int16 (or int32) matrices use a quarter (or half) of
+        the memory of float64 and keep more of the matrix in cache. Fractional weights need float64.
+
+        Parameters:
+            - weights (Dict[str, float]): Cost weights, see RoleAssignment.cost_weights().
+            - margin (float): Largest absolute adjustment added to the costs later (e.g. special groups).
+
+        Returns:
+            np.dtype: int16, int32 or float64.
+    """
+    values = [weights[name] for name in FEATURES] + [margin]
+    if any(float(value) != int(value) for value in values):
+        return np.dtype(np.float64)
+
+    bound = max(abs(weights[name]) for name in FEATURES[:4]) + sum(abs(weights[name]) for name in FEATURES[4:])
+    bound += abs(margin)
+    for dtype in (np.int16, np.int32):
+        if bound <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.float64)
+
+
+class CostModel:
+    """
+        Integer-coded view of students and roles used to build the assignment cost matrix.
+
+        Genders and hierarchies are encoded once as small integer codes, so the full
+        students x roles matrix can be assembled with NumPy lookup tables and broadcasting
+        instead of a Python loop over every student/role pair.
+    """
+
+    def __init__(self, students: List[Student], roles: List[Role], cache=None,
+                 catalog_key: Optional[Hashable] = None):
+        """
+            Encodes the given students and roles.
+
+            Parameters:
+                - students (List[Student]): The students (rows of the cost matrix).
+                - roles (List[Role]): The roles (columns of the cost matrix).
+                - cache (Optional[CostRowCache]): Cache for the per-type cost rows.
+                - catalog_key (Optional[Hashable]): Identifies the role catalog in the cache; without
+                  a key the rows are not cached.
+        """
+        self.students = students
+        self.roles = roles
+        self.cache = cache
+        self.catalog_key = catalog_key
+
+        # Gender vocabulary is taken from the roles; student genders that no role uses
+        # can never match or be excluded, so they are encoded as -1.
+        self.genders = sorted({role.gender for role in roles})
+        gender_codes = {gender: code for code, gender in enumerate(self.genders)}
+        self.unisex_code = gender_codes.get("Unisex", -1)
+
+        hierarchy_codes = {hierarchy: code for code, hierarchy in enumerate(HIERARCHIES)}
+        self.role_gender_codes = np.array([gender_codes[role.gender] for role in roles], dtype=np.int8)
+        self.role_hierarchy_codes = np.array([hierarchy_codes[role.hierarchy] for role in roles], dtype=np.int8)
+
+        preferred_codes = np.array([gender_codes.get(student.preferred_gender, -1) for student in students],
+                                   dtype=np.int8)
+        excluded_codes = np.array([gender_codes.get(student.excluded_gender, -1) for student in students],
+                                  dtype=np.int8)
+
+        # Students with the same (preferred, excluded) codes share one cost row
+        student_codes = np.stack([preferred_codes, excluded_codes], axis=1).reshape(-1, 2)
+        self.type_codes, self.student_types = np.unique(student_codes, axis=0, return_inverse=True)
+        self.student_types = self.student_types.reshape(-1)
+
+    @property
+    def preferred_codes(self) -> np.ndarray:
+        """Preferred gender code per student (-1 if no role has that gender)."""
+        return self.type_codes[self.student_types, 0]
+
+    @property
+    def excluded_codes(self) -> np.ndarray:
+        """Excluded gender code per student (-1 if none)."""
+        return self.type_codes[self.student_types, 1]
+
+    def role_base_costs(self, weights: Dict[str, float]) -> np.ndarray:
+        """
+            Computes the student-independent part of each role's cost (hierarchy and unisex bonus).
+
+            Parameters:
+                - weights (Dict[str, float]): Cost weights, see RoleAssignment.cost_weights().
+
+            Returns:
+                np.ndarray: One base cost per role.
+        """
+        hierarchy_costs = np.array([weights["essential"], weights["next"], weights["rest"], weights["last"], 0],
+                                   dtype=np.float64)
+        base = hierarchy_costs[self.role_hierarchy_codes]
+        base += weights["unisex"] * (self.role_gender_codes == self.unisex_code)
+        return base
+
+    def type_cost_rows(self, weights: Dict[str, float]) -> np.ndarray:
+        """
+            Builds one cost row per distinct student type, reusing cached rows if a cache is set.
+
+            Parameters:
+                - weights (Dict[str, float]): Cost weights, see RoleAssignment.cost_weights().
+
+            Returns:
+                np.ndarray: Array of shape (number of student types, number of roles).
+        """
+        if self.cache is None or self.catalog_key is None:
+            return self.compute_type_rows(self.type_codes, weights)
+        return self.cache.gather(self.catalog_key, weights, self.type_codes,
+                                 lambda type_codes: self.compute_type_rows(type_codes, weights))
+
+    def compute_type_rows(self, type_codes: np.ndarray, weights: Dict[str, float]) -> np.ndarray:
+        """
+            Computes the cost rows of the given student types.
+
+            Parameters:
+                - type_codes (np.ndarray): One (preferred, excluded) code pair per type.
+                - weights (Dict[str, float]): Cost weights, see RoleAssignment.cost_weights().
+
+            Returns:
+                np.ndarray: Array of shape (number of types, number of roles).
+        """
+        preferred = type_codes[:, 0:1]
+        excluded = type_codes[:, 1:2]
+        role_genders = self.role_gender_codes[np.newaxis, :]
+
+        rows = np.broadcast_to(self.role_base_costs(weights), (len(type_codes), len(self.roles))).copy()
+        rows += weights["exclusion"] * (excluded == role_genders)
+        rows += weights["matched_gender"] * (preferred == role_genders)
+        return rows
+
+    def build(self, weights: Dict[str, float], dtype=np.float64, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+            Builds the full students x roles cost matrix.
+
+            Only the small per-type rows are computed in float64; the full matrix is gathered directly
+            in the target dtype, so no float64 matrix of the full size is allocated.
+
+            Parameters:
+                - weights (Dict[str, float]): Cost weights, see RoleAssignment.cost_weights().
+                - dtype (np.dtype): dtype of the matrix (see cost_dtype).
+                - out (Optional[np.ndarray]): Preallocated matrix of the right shape and dtype to fill.
+
+            Returns:
+                np.ndarray: The cost matrix of shape (number of students, number of roles).
+        """
+        type_rows = self.type_cost_rows(weights).astype(dtype, copy=False)
+        return np.take(type_rows, self.student_types, axis=0, out=out)
+
+    def build_memmap(self, weights: Dict[str, float], path: str, dtype=np.int16,
+                     chunk_rows: int = 4096) -> np.memmap:
+        """
+            Builds the full cost matrix into a memory-mapped file, one chunk of rows at a time, so
+            cohorts whose matrix does not fit in memory can be solved out of core.
+
+            Parameters:
+                - weights (Dict[str, float]): Cost weights, see RoleAssignment.cost_weights().
+                - path (str): File of the memmap (created or overwritten).
+                - dtype (np.dtype): dtype of the matrix (see cost_dtype).
+                - chunk_rows (int): Rows gathered at once.
+
+            Returns:
+                np.memmap: The cost matrix of shape (number of students, number of roles).
+        """
+        shape = (len(self.students), len(self.roles))
+        # A memmap cannot have zero size, so empty matrices stay in memory
+        if 0 in shape:
+            return np.zeros(shape, dtype=dtype)
+
+        type_rows = self.type_cost_rows(weights).astype(dtype, copy=False)
+        matrix = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+        for start in range(0, shape[0], chunk_rows):
+            rows = self.student_types[start:start + chunk_rows]
+            np.take(type_rows, rows, axis=0, out=matrix[start:start + len(rows)])
+        matrix.flush()
+        return matrix
+
+    def type_features(self) -> np.ndarray:
+        """
+            Encodes which cost weights apply to each (student type, role) pair.
+
+            A cost row is linear in the weights, so the rows for any weight vector w are
+            w @ features (summed over the FEATURES axis).
+
+            Returns:
+                np.ndarray: 0/1 array of shape (number of types, len(FEATURES), number of roles).
+        """
+        preferred = self.type_codes[:, 0:1]
+        excluded = self.type_codes[:, 1:2]
+        role_genders = self.role_gender_codes[np.newaxis, :]
+
+        features = np.zeros((len(self.type_codes), len(FEATURES), len(self.roles)))
+        features[:, :4] = self.role_hierarchy_codes[np.newaxis, :] == np.arange(4)[:, np.newaxis]
+        features[:, 4] = role_genders == self.unisex_code
+        features[:, 5] = preferred == role_genders
+        features[:, 6] = excluded == role_genders
+        return features
+
+    def build_many(self, weight_grid: List[Dict[str, float]]) -> np.ndarray:
+        """
+            Builds the cost matrices of several weight vectors in one vectorized pass.
+
+            Parameters:
+                - weight_grid (List[Dict[str, float]]): One set of cost weights per scenario.
+
+            Returns:
+                np.ndarray: Cost tensor of shape (number of scenarios, number of students, number of roles).
+        """
+        weights = np.array([[scenario[name] for name in FEATURES] for scenario in weight_grid],
+                           dtype=np.float64).reshape(-1, len(FEATURES))
+        type_rows = np.einsum("sk,tkr->str", weights, self.type_features())
+        return type_rows[:, self.student_types]
+
+    def allowed_edges(self, type_rows: np.ndarray):
+        """
+            Builds the CSR structure of all allowed (non-vetoed) student -> role edges.
+
+            Parameters:
+                - type_rows (np.ndarray): Per-type cost rows from type_cost_rows().
+
+            Returns:
+                Tuple[np.ndarray, np.ndarray, np.ndarray]: CSR indptr, column indices and edge costs.
+        """
+        num_students = len(self.students)
+        role_indices = np.arange(len(self.roles))
+        type_columns = [role_indices[self.role_gender_codes != excluded] for _, excluded in self.type_codes]
+        lengths = np.array([len(columns) for columns in type_columns], dtype=np.int64)
+
+        indptr = np.zeros(num_students + 1, dtype=np.int64)
+        np.cumsum(lengths[self.student_types], out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        data = np.empty(indptr[-1], dtype=type_rows.dtype)
+
+        # Students of one type share their allowed columns, so each type is filled in one step
+        for student_type, columns in enumerate(type_columns):
+            rows = np.flatnonzero(self.student_types == student_type)
+            positions = indptr[rows][:, np.newaxis] + np.arange(len(columns))
+            indices[positions] = columns
+            data[positions] = type_rows[student_type, columns]
+
+        return indptr, indices, data
@@ -0,0 +1,107 @@
+import numpy as np
+from typing import List, NamedTuple, Optional
+
+
+class HallViolation(NamedTuple):
+    """
+        A set of students with fewer allowed roles than students (Hall's condition fails).
+    """
+    students: np.ndarray  # Student indices of the set
+    roles: np.ndarray  # Role indices the set may be assigned to (its neighborhood)
+    deficiency: int  # Students of the set that cannot receive an allowed role
+    veto: Optional[str]  # The shared veto of the students, None for the whole cohort
+    minimal_students: np.ndarray  # A violating subset of which no proper subset violates (see minimal_cohort)
+
+
+class FeasibilityReport(NamedTuple):
+    feasible: bool  # Whether a veto-free assignment of every student exists
+    max_assigned: int  # Most students that can be assigned without violating a veto
+    violations: List[HallViolation]  # Largest deficiency first
+
+    def messages(self) -> List[str]:
+        """Describes the violations for display."""
+        messages = []
+        for violation in self.violations:
+            if violation.veto is None:
+                messages.append(f"{len(violation.students)} Teilnehmende, aber nur {len(violation.roles)} Rollen.")
+            else:
+                messages.append(f"{len(violation.students)} Teilnehmende mit Veto '{violation.veto}', aber nur "
+                                f"{len(violation.roles)} Rollen mit einem anderen Gender "
+                                f"({violation.deficiency} ohne vetofreie Rolle).")
+        return messages
+
+
+def check_feasibility(cost_model) -> FeasibilityReport:
+    """
+        Checks whether every student can receive a role that does not violate their veto.
+
+        A student's allowed roles are all roles except those of the vetoed gender, so two students with
+        different vetoes (or any student without a veto) together may use every role. The only sets of
+        students that can violate Hall's condition are therefore the whole cohort (more students than
+        roles) and the students sharing one veto (more of them than roles of the other genders). By
+        König's theorem the maximum veto-free matching is the cohort size minus the largest deficiency of
+        these sets, so the check is a counting argument over gender codes in O(students + roles), without
+        building the bipartite graph. Special groups are not taken into account.
+
+        Parameters:
+            - cost_model (CostModel): Gender codes of the students and roles.
+
+        Returns:
+            FeasibilityReport: The result, with the violating student and role sets.
+    """
+    num_students = len(cost_model.students)
+    num_roles = len(cost_model.roles)
+    role_genders = cost_model.role_gender_codes
+    excluded = cost_model.excluded_codes
+
+    roles_per_gender = np.bincount(role_genders, minlength=len(cost_model.genders))
+    students_per_veto = np.bincount(excluded[excluded >= 0], minlength=len(cost_model.genders))
+    allowed_roles = num_roles - roles_per_gender  # Roles of the other genders, per veto
+
+    violations = []
+    if num_students > num_roles:
+        violations.append(HallViolation(np.arange(num_students), np.arange(num_roles), num_students - num_roles, None,
+                                        minimal_cohort(excluded, allowed_roles, num_roles)))
+
+    for gender in np.flatnonzero(students_per_veto > allowed_roles):
+        students = np.flatnonzero(excluded == gender)
+        deficiency = int(students_per_veto[gender] - allowed_roles[gender])
+        violations.append(HallViolation(students, np.flatnonzero(role_genders != gender), deficiency,
+                                        cost_model.genders[gender], students[:allowed_roles[gender] + 1]))
+
+    violations.sort(key=lambda violation: -violation.deficiency)
+    max_deficiency = violations[0].deficiency if violations else 0
+    return FeasibilityReport(not violations, num_students - max_deficiency, violations)
+
+
+def minimal_cohort(excluded: np.ndarray, allowed_roles: np.ndarray, num_roles: int) -> np.ndarray:
+    """
+        Returns a minimal violating subset of a cohort with more students than roles.
+
+        Students with different vetoes or without a veto may together use every role, so num_roles + 1 of
+        them violate Hall's condition while no proper subset does, as long as no more students share a veto
+        than that veto allows roles. If too few students remain under this cap, the students of a veto
+        exceed it, and one student more than its allowed roles is the minimal subset.
+
+        Parameters:
+            - excluded (np.ndarray): Veto gender code per student (-1 without a veto).
+            - allowed_roles (np.ndarray): Number of roles each veto leaves allowed.
+            - num_roles (int): Number of roles.
+
+        Returns:
+            np.ndarray: Student indices of the subset, ascending.
+    """
+    # Position of each student among the students with the same veto
+    order = np.argsort(excluded, kind="stable")
+    sorted_codes = excluded[order]
+    rank = np.empty(len(excluded), dtype=np.intp)
+    rank[order] = np.arange(len(excluded)) - np.searchsorted(sorted_codes, sorted_codes)
+
+    capped = (excluded >= 0) & (rank >= allowed_roles[np.maximum(excluded, 0)])
+    eligible = np.flatnonzero(~capped)
+    if len(eligible) > num_roles:
+        return eligible[:num_roles + 1]
+
+    vetoes = np.unique(excluded[capped])
+    gender = vetoes[np.argmin(allowed_roles[vetoes])]
+    return np.flatnonzero(excluded == gender)[:allowed_roles[gender] + 1]
@@ -0,0 +1,495 @@
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Rows read at once by the chunked column reductions (in bytes of float64)
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def restricted_offsets(column_min: np.ndarray, column_max: np.ndarray, offsets: np.ndarray,
+                       active: np.ndarray, size: int) -> np.ndarray:
+    """
+        Returns column offsets that restrict an assignment to the active columns.
+
+        Inactive columns (read as ignored) get one constant cost above any assignment of active columns,
+        so they are only used by rows that no active column is left for; those rows count as unassigned.
+
+        Parameters:
+            - column_min, column_max (np.ndarray): Bounds of the cells of each column.
+            - offsets (np.ndarray): Cost added to every cell of each column.
+            - active (np.ndarray): Boolean mask of the columns that may be assigned.
+            - size (int): Side length of the padded square matrix (the larger matrix dimension).
+    """
+    column_offsets = np.array(offsets, dtype=np.float64)
+    bound = np.abs(np.concatenate([column_min + column_offsets, column_max + column_offsets])[
+        np.concatenate([active, active])]).max(initial=0)
+    column_offsets[~active] = 2 * (bound + 1) * (size + 1)
+    return column_offsets
+
+
+class IncrementalAssignment:
+    """
+        Shortest augmenting path assignment solver (Jonker-Volgenant style) that keeps its state.
+
+        The solver holds the current optimal assignment together with its dual potentials.
+        After the costs of a few columns or rows change, or a student/role is inserted or
+        removed, only the affected rows are unassigned and re-augmented against the kept
+        potentials. Each change therefore costs one shortest path search of O(n^2) instead
+        of a full O(n^3) solve.
+
+        Rectangular matrices are padded virtually to a square matrix: missing rows or columns
+        are dummies with zero cost, so a student on a dummy column has no role.
+
+        The matrix is only read one row (or column) at a time and reduced in row chunks, so it can be
+        a numpy.memmap that never resides in memory as a whole.
+    """
+
+    def __init__(self, cost_matrix: np.ndarray, column_offsets: Optional[np.ndarray] = None,
+                 ignored_columns: Optional[np.ndarray] = None, interrupt: Optional[Callable[[], None]] = None):
+        """
+            Solves the initial assignment problem.
+
+            Parameters:
+                - cost_matrix (np.ndarray): Students x roles cost matrix. It is referenced, not copied,
+                  so in-place edits followed by update_columns/update_rows are re-optimized.
+                - column_offsets (Optional[np.ndarray]): Cost added to every cell of each column when it is
+                  read, so a read-only matrix can be adjusted per column. Changing entries must be followed
+                  by update_columns.
+                - ignored_columns (Optional[np.ndarray]): Boolean mask of columns whose cells are read as 0,
+                  so every cell of such a column costs its offset. Changes must be followed by update_columns.
+                - interrupt (Optional[Callable[[], None]]): Called before every row augmentation, here and in
+                  later updates. An exception it raises (e.g. at a deadline) stops the solve and leaves the
+                  solver half-updated, so it must be discarded.
+        """
+        self.costs = cost_matrix
+        self.column_offsets = column_offsets
+        self.ignored_columns = ignored_columns
+        self.interrupt = interrupt
+        self.num_rows, self.num_cols = cost_matrix.shape
+        self._clear_constraints()
+        size = self.size
+        self.u = np.zeros(size)
+        self.v = np.zeros(size)
+        self.col4row = np.full(size, -1, dtype=np.intp)
+        self.row4col = np.full(size, -1, dtype=np.intp)
+        self._initialize()
+
+    @classmethod
+    def from_state(cls, cost_matrix: np.ndarray, u: np.ndarray, v: np.ndarray, col4row: np.ndarray,
+                   row4col: np.ndarray) -> "IncrementalAssignment":
+        """
+            Restores a solver from a kept assignment and its dual potentials without solving.
+
+            The state must be optimal for cost_matrix, or become optimal after update_columns/update_rows
+            for the cells that changed (e.g. a state taken from another solver whose matrix differs only
+            in those cells or in higher costs of unassigned cells).
+
+            Parameters:
+                - cost_matrix (np.ndarray): Students x roles cost matrix (referenced, not copied).
+                - u, v (np.ndarray): Row and column potentials of the padded square matrix.
+                - col4row, row4col (np.ndarray): The assignment of the padded square matrix.
+        """
+        engine = cls.__new__(cls)
+        engine.costs = cost_matrix
+        engine.column_offsets = None
+        engine.ignored_columns = None
+        engine.interrupt = None
+        engine.num_rows, engine.num_cols = cost_matrix.shape
+        engine._clear_constraints()
+        engine.u, engine.v = u.copy(), v.copy()
+        engine.col4row, engine.row4col = col4row.copy(), row4col.copy()
+        return engine
+
+    def state(self):
+        """Returns copies of the potentials and assignment (see from_state)."""
+        return self.u.copy(), self.v.copy(), self.col4row.copy(), self.row4col.copy()
+
+    def _clear_constraints(self):
+        """Removes the constraints of constrain()."""
+        self.blocked_cost = None  # Cost of the cells blocked by constrain(), None without constraints
+        self.row_pins = np.full(self.num_rows, -1, dtype=np.intp)  # Column each row is forced to, or -1
+        self.column_pins = np.full(self.num_cols, -1, dtype=np.intp)  # Row each column is forced to, or -1
+        self.excluded_cells: Dict[int, List[int]] = {}  # Blocked columns per row
+        self._pinned_rows = self._pinned_columns = np.empty(0, dtype=np.intp)
+
+    def constrain(self, forced: Iterable[Tuple[int, int]], excluded: Iterable[Tuple[int, int]], blocked_cost: float):
+        """
+            Restricts the assignment without editing the matrix: the blocked cells are read as blocked_cost.
+
+            A forced pair (i, j) blocks every other cell of row i and column j, an excluded pair blocks its
+            cell. Like the column offsets, the constraints are applied per row and column when they are read,
+            so constraining costs O(pairs) instead of a copy of the matrix. Rows whose cells got blocked while
+            they are assigned on them must be re-optimized with update_rows. Rows and columns must not be
+            inserted or deleted while the solver is constrained.
+
+            Parameters:
+                - forced (Iterable[Tuple[int, int]]): Pairs the assignment must contain.
+                - excluded (Iterable[Tuple[int, int]]): Pairs the assignment must not contain.
+                - blocked_cost (float): Cost of a blocked cell, larger than any feasible assignment.
+        """
+        self._clear_constraints()
+        self.blocked_cost = blocked_cost
+        for i, j in forced:
+            self.row_pins[i] = j
+            self.column_pins[j] = i
+        self._pinned_rows = np.flatnonzero(self.row_pins >= 0)
+        self._pinned_columns = np.flatnonzero(self.column_pins >= 0)
+        for i, j in excluded:
+            self.excluded_cells.setdefault(i, []).append(j)
+
+    def blocked(self, row_ind: np.ndarray, col_ind: np.ndarray) -> np.ndarray:
+        """Returns which of the given cells are blocked by constrain()."""
+        if self.blocked_cost is None:
+            return np.zeros(len(row_ind), dtype=bool)
+        pinned_row = self.row_pins[row_ind]
+        pinned_column = self.column_pins[col_ind]
+        blocked = ((pinned_row >= 0) & (pinned_row != col_ind)) | ((pinned_column >= 0) & (pinned_column != row_ind))
+        excluded = [j in self.excluded_cells.get(i, ()) for i, j in zip(row_ind.tolist(), col_ind.tolist())]
+        return blocked | np.array(excluded, dtype=bool)
+
+    @property
+    def size(self) -> int:
+        """Side length of the virtually padded square matrix."""
+        return max(self.num_rows, self.num_cols)
+
+    def _row(self, i: int) -> np.ndarray:
+        """Returns row i of the padded square matrix."""
+        size = self.size
+        if i >= self.num_rows:
+            return np.zeros(size)
+        row = np.asarray(self.costs[i], dtype=np.float64)
+        if self.ignored_columns is not None:
+            row = np.where(self.ignored_columns, 0.0, row)
+        if self.column_offsets is not None:
+            row = row + self.column_offsets
+        if self.blocked_cost is not None:
+            row = np.array(row)
+            pin = self.row_pins[i]
+            if pin >= 0:
+                value = row[pin]
+                row[:] = self.blocked_cost
+                row[pin] = value
+            else:
+                row[self._pinned_columns] = self.blocked_cost
+            row[self.excluded_cells.get(i, [])] = self.blocked_cost
+        if size > self.num_cols:
+            row = np.concatenate([row, np.zeros(size - self.num_cols)])
+        return row
+
+    def _column(self, j: int) -> np.ndarray:
+        """Returns column j of the padded square matrix."""
+        size = self.size
+        if j >= self.num_cols:
+            return np.zeros(size)
+        if self.ignored_columns is not None and self.ignored_columns[j]:
+            column = np.zeros(self.num_rows)
+        else:
+            column = np.asarray(self.costs[:, j], dtype=np.float64)
+        if self.column_offsets is not None:
+            column = column + self.column_offsets[j]
+        if self.blocked_cost is not None:
+            column = np.array(column)
+            pin = self.column_pins[j]
+            if pin >= 0:
+                value = column[pin]
+                column[:] = self.blocked_cost
+                column[pin] = value
+            else:
+                column[self._pinned_rows] = self.blocked_cost
+            column[[i for i, columns in self.excluded_cells.items() if j in columns]] = self.blocked_cost
+        if size > self.num_rows:
+            column = np.concatenate([column, np.zeros(size - self.num_rows)])
+        return column
+
+    def _initialize(self):
+        """
+            Cold start: column reduction, greedy matching on tight edges, then augmentation.
+        """
+        size = self.size
+        if size == 0:
+            return
+
+        if self.num_rows and self.num_cols:
+            column_min, column_argmin = self._column_minima()
+        else:
+            column_min = np.zeros(self.num_cols)
+            column_argmin = np.zeros(self.num_cols, dtype=np.intp)
+
+        # Dummy rows cost 0, so they bound every column minimum from above
+        if self.num_rows < size:
+            column_argmin = np.where(column_min <= 0, column_argmin, self.num_rows)
+            column_min = np.minimum(column_min, 0)
+        self.v[:self.num_cols] = column_min
+
+        for j, i in enumerate(column_argmin):
+            if i < self.num_rows and self.col4row[i] == -1:
+                self.col4row[i] = j
+                self.row4col[j] = i
+
+        for i in np.flatnonzero(self.col4row == -1):
+            self._augment(i)
+
+    def _column_minima(self):
+        """Returns the minimum of each column and its first row, reading the matrix in row chunks."""
+        chunk_rows = max(1, CHUNK_BYTES // (8 * self.num_cols))
+        column_min = np.full(self.num_cols, np.inf)
+        column_argmin = np.zeros(self.num_cols, dtype=np.intp)
+        for start in range(0, self.num_rows, chunk_rows):
+            block = self.costs[start:start + chunk_rows]
+            block_min = np.asarray(block.min(axis=0), dtype=np.float64)
+            better = block_min < column_min
+            column_min[better] = block_min[better]
+            column_argmin[better] = block.argmin(axis=0)[better] + start
+        if self.ignored_columns is not None:
+            column_min[self.ignored_columns] = 0
+            column_argmin[self.ignored_columns] = 0
+        if self.column_offsets is not None:
+            column_min += self.column_offsets
+        return column_min, column_argmin
+
+    def _augment(self, cur_row: int):
+        """
+            Assigns the free row cur_row along a shortest augmenting path and updates the potentials.
+
+            Requires non-negative reduced costs and all other rows assigned on tight edges.
+        """
+        if self.interrupt is not None:
+            self.interrupt()
+        size = self.size
+        u, v, col4row, row4col = self.u, self.v, self.col4row, self.row4col
+
+        shortest = np.full(size, np.inf)
+        path = np.full(size, -1, dtype=np.intp)
+        remaining = np.ones(size, dtype=bool)
+        visited_rows = []
+        min_val = 0.0
+        i = cur_row
+        sink = -1
+
+        while sink == -1:
+            visited_rows.append(i)
+            reduced = min_val + self._row(i) - u[i] - v
+            improved = remaining & (reduced < shortest)
+            path[improved] = i
+            shortest[improved] = reduced[improved]
+
+            candidates = np.where(remaining, shortest, np.inf)
+            lowest = candidates.min()
+            if not np.isfinite(lowest):
+                raise ValueError("cost matrix is infeasible")
+
+            # Prefer a free column among the equally short ones, it ends the search
+            ties = np.flatnonzero(candidates == lowest)
+            free = ties[row4col[ties] == -1]
+            j = free[0] if len(free) else ties[0]
+
+            min_val = lowest
+            remaining[j] = False
+            if row4col[j] == -1:
+                sink = j
+            else:
+                i = row4col[j]
+
+        # Update the dual potentials of all scanned rows and columns
+        u[cur_row] += min_val
+        other_rows = np.array(visited_rows[1:], dtype=np.intp)
+        u[other_rows] += min_val - shortest[col4row[other_rows]]
+        scanned = ~remaining
+        v[scanned] -= min_val - shortest[scanned]
+
+        # Flip the assignment along the path
+        j = sink
+        while True:
+            i = path[j]
+            row4col[j] = i
+            col4row[i], j = j, col4row[i]
+            if i == cur_row:
+                break
+
+    def _free_column(self, j: int) -> int:
+        """Unassigns column j and returns the row it was assigned to (or -1)."""
+        i = self.row4col[j]
+        if i != -1:
+            self.col4row[i] = -1
+            self.row4col[j] = -1
+        return i
+
+    def _free_row(self, i: int) -> int:
+        """Unassigns row i and returns the column it was assigned to (or -1)."""
+        j = self.col4row[i]
+        if j != -1:
+            self.row4col[j] = -1
+            self.col4row[i] = -1
+        return j
+
+    def update_columns(self, columns, values=None):
+        """
+            Re-optimizes after the costs of some columns changed.
+
+            Parameters:
+                - columns (Iterable[int]): Indices of the changed columns.
+                - values (Optional[np.ndarray]): New costs (rows x len(columns)). If omitted, the
+                  referenced cost matrix is assumed to have been edited in place.
+        """
+        columns = list(columns)
+        if values is not None:
+            self.costs[:, columns] = values
+
+        freed = []
+        for j in columns:
+            freed.append(self._free_column(j))
+            self.v[j] = (self._column(j) - self.u).min()
+        for i in freed:
+            if i != -1:
+                self._augment(i)
+
+    def update_rows(self, rows, values=None):
+        """
+            Re-optimizes after the costs of some rows changed.
+
+            Parameters:
+                - rows (Iterable[int]): Indices of the changed rows.
+                - values (Optional[np.ndarray]): New costs (len(rows) x columns). If omitted, the
+                  referenced cost matrix is assumed to have been edited in place.
+        """
+        rows = list(rows)
+        if values is not None:
+            self.costs[rows, :] = values
+
+        for i in rows:
+            self._free_row(i)
+            self.u[i] = (self._row(i) - self.v).min()
+        for i in rows:
+            self._augment(i)
+
+    def insert_row(self, values):
+        """
+            Appends a row (e.g. a new student) and re-optimizes.
+
+            Parameters:
+                - values (array-like): The costs of the new row, one per column.
+        """
+        values = np.asarray(values, dtype=self.costs.dtype).reshape(1, self.num_cols)
+        self.costs = np.vstack([self.costs, values])
+        i = self.num_rows
+
+        if self.num_rows < self.num_cols:
+            # The first dummy row becomes the new row
+            self.num_rows += 1
+            self.update_rows([i])
+            return
+
+        # Grow the square by the new row and a dummy column
+        self.num_rows += 1
+        self.v = np.append(self.v, -self.u.max(initial=0))
+        self.row4col = np.append(self.row4col, -1)
+        self.col4row = np.append(self.col4row, -1)
+        self.u = np.append(self.u, 0.0)
+        self.u[i] = (self._row(i) - self.v).min()
+        self._augment(i)
+
+    def insert_column(self, values):
+        """
+            Appends a column (e.g. a new role) and re-optimizes.
+
+            Parameters:
+                - values (array-like): The costs of the new column, one per row.
+        """
+        values = np.asarray(values, dtype=self.costs.dtype).reshape(self.num_rows, 1)
+        self.costs = np.hstack([self.costs, values])
+        j = self.num_cols
+
+        if self.num_cols < self.num_rows:
+            # The first dummy column becomes the new column
+            self.num_cols += 1
+            self.update_columns([j])
+            return
+
+        # Grow the square by the new column and a dummy row
+        self.num_cols += 1
+        self.v = np.append(self.v, (self._column(j)[:-1] - self.u).min(initial=0))
+        self.row4col = np.append(self.row4col, -1)
+        self.col4row = np.append(self.col4row, -1)
+        self.u = np.append(self.u, -self.v.max())
+        self._augment(self.size - 1)
+
+    def delete_row(self, i: int):
+        """
+            Removes row i (e.g. a student who left) and re-optimizes. Later rows shift down by one.
+        """
+        self.costs = np.delete(self.costs, i, axis=0)
+        column = self.col4row[i]
+        self.row4col[column] = -1
+        self.u = np.delete(self.u, i)
+        self.col4row = np.delete(self.col4row, i)
+        self.row4col[self.row4col > i] -= 1
+
+        if self.num_rows > self.num_cols:
+            # Shrink the square by dropping the last (dummy) column
+            self.num_rows -= 1
+            last = self.size
+            row = self.row4col[last]
+            self.v = self.v[:last]
+            self.row4col = self.row4col[:last]
+            # If the removed row held the dropped column, nothing is left free
+            if row != -1:
+                self.col4row[row] = -1
+                self._augment(row)
+            return
+
+        # Keep the square size by appending a dummy row
+        self.num_rows -= 1
+        self.u = np.append(self.u, -self.v.max())
+        self.col4row = np.append(self.col4row, -1)
+        self._augment(self.size - 1)
+
+    def delete_column(self, j: int):
+        """
+            Removes column j (e.g. a deleted role) and re-optimizes. Later columns shift down by one.
+        """
+        self.costs = np.delete(self.costs, j, axis=1)
+        row = self.row4col[j]
+        self.col4row[row] = -1
+        self.v = np.delete(self.v, j)
+        self.row4col = np.delete(self.row4col, j)
+        self.col4row[self.col4row > j] -= 1
+
+        if self.num_cols > self.num_rows:
+            # Shrink the square by dropping the last (dummy) row
+            self.num_cols -= 1
+            last = self.size
+            column = self.col4row[last]
+            self.u = self.u[:last]
+            self.col4row = self.col4row[:last]
+            if column != -1:
+                self.row4col[column] = -1
+            if row != last:
+                self._augment(row)
+            return
+
+        # Keep the square size by appending a dummy column
+        self.num_cols -= 1
+        self.v = np.append(self.v, -self.u.max())
+        self.row4col = np.append(self.row4col, -1)
+        self._augment(row)
+
+    def solution(self):
+        """
+            Returns the current assignment in the format of scipy's linear_sum_assignment.
+
+            Returns:
+                Tuple[np.ndarray, np.ndarray]: Assigned row indices (ascending) and their column indices.
+        """
+        rows = np.arange(self.num_rows)
+        columns = self.col4row[:self.num_rows]
+        real = columns < self.num_cols
+        return rows[real], columns[real]
+
+    def total_cost(self) -> float:
+        """Returns the cost of the current assignment."""
+        row_ind, col_ind = self.solution()
+        costs = np.asarray(self.costs[row_ind, col_ind], dtype=np.float64)
+        if self.ignored_columns is not None:
+            costs[self.ignored_columns[col_ind]] = 0
+        if self.column_offsets is not None:
+            costs += self.column_offsets[col_ind]
+        return costs.sum()
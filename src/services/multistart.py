@@ -0,0 +1,180 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, NamedTuple, Optional, Set
+
+import numpy as np
+
+from src.services import shared_matrix
+from src.services.anytime import BudgetExhausted
+from src.services.special_groups import DenseProblem
+from src.services.streaming_backend import StreamingProblem
+
+
+class WalkResult(NamedTuple):
+    """Outcome of one randomized special group walk."""
+    seed: int
+    valid: bool
+    cost: float
+    iterations: int
+    row_ind: np.ndarray
+    col_ind: np.ndarray
+    offsets: np.ndarray
+
+
+def check_deadline(deadline: float):
+    """Raises BudgetExhausted if the deadline (a time.perf_counter() value) has passed."""
+    if time.perf_counter() >= deadline:
+        raise BudgetExhausted()
+
+
+def random_walk(problem, special_groups: Dict[int, Set[int]], group_bonus: float, random_prob: float,
+                max_iterations: int, seed: int, deadline: Optional[float] = None) -> WalkResult:
+    """
+        Runs the randomized special group retries of RoleAssignment with its own random generator.
+
+        After every solve, each partially assigned group is either encouraged (group_bonus) or
+        removed (penalty of 1000) at random, until no group is partial or the iterations run out.
+
+        Parameters:
+            - problem (DenseProblem, SparseProblem, CompressedProblem or StreamingProblem): The assignment problem.
+            - special_groups (Dict[int, Set[int]]): GroupIDs mapped to the role indices of the group.
+            - group_bonus (float): Cost added to the roles of an encouraged group.
+            - random_prob (float): Probability of encouraging instead of removing a group.
+            - max_iterations (int): Maximum number of solves.
+            - seed (int): Seed of the walk.
+            - deadline (Optional[float]): time.perf_counter() value at which the walk stops. It is checked
+              before every solve and, for a StreamingProblem, within the solve.
+
+        Returns:
+            WalkResult: The last assignment of the walk and whether it is valid (an invalid walk without
+            assignment if the deadline passed before the first solve ended).
+    """
+    rng = random.Random(seed)
+    offsets = np.zeros(problem.shape[1])
+    all_roles = np.ones(problem.shape[1], dtype=bool)
+    empty = np.empty(0, dtype=np.intp)
+    result = WalkResult(seed, False, np.inf, 0, empty, empty, offsets.copy())
+    if deadline is not None and isinstance(problem, StreamingProblem):
+        problem.interrupt = partial(check_deadline, deadline)
+
+    for iteration in range(1, max_iterations + 1):
+        try:
+            if deadline is not None:
+                check_deadline(deadline)
+            row_ind, col_ind = problem.solve(offsets, all_roles)
+        except BudgetExhausted:
+            break
+        cost = (problem.cell_costs(row_ind, col_ind) + offsets[col_ind]).sum()
+        result = WalkResult(seed, True, cost, iteration, row_ind, col_ind, offsets.copy())
+
+        assigned_roles = set(col_ind.tolist())
+        for role_indices in special_groups.values():
+            assigned_count = len(role_indices & assigned_roles)
+            if 0 < assigned_count < len(role_indices):
+                columns = sorted(role_indices)
+                offsets[columns] += group_bonus if rng.random() < random_prob else 1000
+                result = result._replace(valid=False)
+        if result.valid:
+            break
+
+    return result
+
+
+# Problem of a worker process, set once by the pool initializer
+_worker_problem = None
+
+
+def _attach_shared_problem(name: str, shape, dtype: str):
+    """Pool initializer: wraps the shared cost matrix in a read-only DenseProblem."""
+    global _worker_problem
+    shared_matrix.attach(name, shape, dtype)
+    _worker_problem = DenseProblem(shared_matrix.worker_matrix())
+
+
+def _set_problem(problem):
+    """Pool initializer for problems without a dense matrix (pickled once per worker)."""
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _run_walk(arguments) -> WalkResult:
+    return random_walk(_worker_problem, *arguments)
+
+
+class MultiStartSearch:
+    """
+        Runs several independently seeded randomized special group walks and keeps the best one.
+
+        The walk seeds are derived from one master seed, so a search is reproducible and its result
+        does not depend on the number of workers. The walks run in worker processes; a dense cost
+        matrix is placed in shared memory once and read by all workers instead of being copied.
+    """
+
+    def __init__(self, problem, special_groups: Dict[int, Set[int]], group_bonus: float,
+                 random_prob: float = 0.5, max_iterations: int = 10):
+        """
+            Parameters:
+                - problem (DenseProblem, SparseProblem or CompressedProblem): The assignment problem
+                  without special group adjustments.
+                - special_groups (Dict[int, Set[int]]): GroupIDs mapped to the role indices of the group.
+                - group_bonus (float): Cost added to the roles of an encouraged group.
+                - random_prob (float): Probability of encouraging instead of removing a group.
+                - max_iterations (int): Maximum number of solves per walk.
+        """
+        self.problem = problem
+        self.special_groups = special_groups
+        self.group_bonus = group_bonus
+        self.random_prob = random_prob
+        self.max_iterations = max_iterations
+        self.entropy = None
+        self.results: List[WalkResult] = []
+
+    @property
+    def starts_converged(self) -> int:
+        """Number of walks that ended with a valid assignment."""
+        return sum(result.valid for result in self.results)
+
+    def solve(self, starts: int, seed: Optional[int] = None, max_workers: Optional[int] = None,
+              deadline: Optional[float] = None) -> WalkResult:
+        """
+            Runs the walks and returns the best one.
+
+            Parameters:
+                - starts (int): Number of walks.
+                - seed (Optional[int]): Master seed. If omitted, fresh entropy is used and stored in
+                  self.entropy, so the search can be repeated.
+                - max_workers (Optional[int]): Number of worker processes (default: one per walk, at
+                  most the number of CPUs). With 1 the walks run in the calling process.
+                - deadline (Optional[float]): time.perf_counter() value at which every walk stops (see random_walk).
+
+            Returns:
+                WalkResult: The valid walk with the lowest cost (ties go to the earlier walk), or the
+                cheapest walk if none converged.
+        """
+        sequence = np.random.SeedSequence(seed)
+        self.entropy = sequence.entropy
+        seeds = [int(s) for s in sequence.generate_state(starts)]
+        arguments = [(self.special_groups, self.group_bonus, self.random_prob, self.max_iterations, s, deadline)
+                     for s in seeds]
+
+        if max_workers is None:
+            max_workers = min(starts, os.cpu_count() or 1)
+
+        if max_workers <= 1:
+            self.results = [random_walk(self.problem, *args) for args in arguments]
+        elif isinstance(self.problem, DenseProblem):
+            self.results = self._run_shared(arguments, max_workers)
+        else:
+            with ProcessPoolExecutor(max_workers, initializer=_set_problem, initargs=(self.problem,)) as executor:
+                self.results = list(executor.map(_run_walk, arguments))
+
+        return min(self.results, key=lambda result: (not result.valid, result.cost))
+
+    def _run_shared(self, arguments, max_workers: int) -> List[WalkResult]:
+        """Runs the walks with the dense cost matrix in shared memory."""
+        with shared_matrix.shared_matrix(self.problem.cost_matrix) as initargs:
+            with ProcessPoolExecutor(max_workers, initializer=_attach_shared_problem, initargs=initargs) as executor:
+                return list(executor.map(_run_walk, arguments))
@@ -0,0 +1,158 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class StageRecord:
+    """
+        Measurements of one stage of a RoleAssignment run (e.g. "cost_matrix" or "solve").
+    """
+
+    __slots__ = ("name", "seconds", "iterations", "shape", "peak_memory", "_start_memory", "_peak")
+
+    def __init__(self, name: str, iterations: Optional[int] = None, shape: Optional[tuple] = None):
+        """
+            Parameters:
+                - name (str): Name of the stage.
+                - iterations (Optional[int]): Solver iterations of the stage, if any.
+                - shape (Optional[tuple]): Shape of the matrix the stage works on, if any.
+        """
+        self.name = name
+        self.seconds = 0.0
+        self.iterations = iterations
+        self.shape = shape
+        self.peak_memory = None  # Bytes allocated above the start of the stage (only with track_memory)
+        self._start_memory = 0
+        self._peak = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "iterations": self.iterations,
+            "shape": list(self.shape) if self.shape is not None else None,
+            "peak_memory": self.peak_memory,
+        }
+
+
+class StageTracer:
+    """
+        Records wall time, iteration count, matrix shape and (optionally) peak memory per stage.
+
+        RoleAssignment wraps every stage of a run in tracer.stage(name), so the records show whether
+        a slow run is spent loading roles, building the cost matrix, solving or writing the results.
+        Callbacks are called with every finished StageRecord. With a profile path, every solve is
+        run under cProfile and its statistics are dumped as a pstats file.
+    """
+
+    def __init__(self, callbacks: Iterable[Callable[[StageRecord], None]] = (), track_memory: bool = False,
+                 profile_path: Optional[str] = None):
+        """
+            Parameters:
+                - callbacks (Iterable[Callable[[StageRecord], None]]): Called with every finished stage.
+                - track_memory (bool): Measure the peak memory of every stage with tracemalloc
+                  (slows the run down noticeably).
+                - profile_path (Optional[str]): Path of the pstats file written for every profiled run.
+        """
+        self.callbacks = list(callbacks)
+        self.track_memory = track_memory
+        self.profile_path = profile_path
+        self.records: List[StageRecord] = []
+        self._open: List[StageRecord] = []
+        self._started_tracing = False
+
+    def _update_peaks(self):
+        """Propagates the traced peak to every open stage and starts a new peak window."""
+        _, peak = tracemalloc.get_traced_memory()
+        for record in self._open:
+            record._peak = max(record._peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str, iterations: Optional[int] = None, shape: Optional[tuple] = None):
+        """
+            Measures the enclosed block as one stage. Stages can be nested.
+
+            Yields:
+                StageRecord: The record, so the block can set iterations and shape.
+        """
+        record = StageRecord(name, iterations, shape)
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._update_peaks()
+            record._start_memory = tracemalloc.get_traced_memory()[0]
+        self._open.append(record)
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if self.track_memory:
+                self._update_peaks()
+                record.peak_memory = max(record._peak - record._start_memory, 0)
+            self._open.pop()
+            if self._started_tracing and not self._open:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+            self.records.append(record)
+            for callback in self.callbacks:
+                callback(record)
+
+    @contextmanager
+    def profile(self):
+        """Runs the enclosed block under cProfile if a profile path is set and dumps the statistics."""
+        if self.profile_path is None:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(self.profile_path)
+
+    def totals(self) -> Dict[str, Dict]:
+        """
+            Aggregates the records per stage name.
+
+            Returns:
+                Dict[str, Dict]: Number of calls and total seconds per stage, in order of first appearance.
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record.name, {"calls": 0, "seconds": 0.0})
+            total["calls"] += 1
+            total["seconds"] += record.seconds
+        return totals
+
+    def summary(self) -> Dict:
+        """Returns all records and the per-stage totals as a JSON-serializable dictionary."""
+        return {
+            "stages": [record.to_dict() for record in self.records],
+            "totals": self.totals(),
+            "profile": self.profile_path,
+        }
+
+    def write_summary(self, file_path: str):
+        """
+            Writes the summary as JSON.
+
+            Parameters:
+                - file_path (str): Path of the JSON file.
+        """
+        with open(file_path, mode="w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+
+
+def summary_path(csv_path: str) -> str:
+    """Returns the path of the stage summary written next to a results CSV."""
+    stem = csv_path[:-4] if csv_path.lower().endswith(".csv") else csv_path
+    return f"{stem}_stages.json"
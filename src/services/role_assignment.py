@@ -2,33 +2,91 @@ import sys
 sys.path.append('src')
 
 import csv
+import os
 import random
+import shutil
+import tempfile
+import threading
+import weakref
 import numpy as np
-from scipy.optimize import linear_sum_assignment
-from typing import List, Dict, Set
+from typing import Callable, List, Dict, Optional, Set
 
 from src.models.student import Student
 from src.data.database import Database
+from src.data.role_catalog import RoleCatalog
+from src.services.alternatives import MurtyEnumerator
+from src.services.anytime import AnytimeSearch, BudgetExhausted
+from src.services.compressed_backend import CompressedProblem
+from src.services.cost_cache import cost_row_cache
+from src.services.cost_model import CostModel, cost_dtype
+from src.services.feasibility import FeasibilityReport, check_feasibility
+from src.services.incremental import IncrementalAssignment
+from src.services.multistart import MultiStartSearch
+from src.services.profiling import StageTracer, summary_path
+from src.services.solve_result import SolveResult
+from src.services.sparse_backend import SparseProblem
+from src.services.streaming_backend import StreamingProblem
+from src.services.special_groups import DenseProblem, SpecialGroupSearch
+
+
+class SolveCancelled(Exception):
+    """Raised by RoleAssignment.solve when the run was cancelled (see RoleAssignment.cancel)."""
+
 
 class RoleAssignment:
     """
         Handles the role assignment process using a cost-based optimization approach.
     """
 
-    def __init__(self, db: Database, students: List[Student]):
+    def __init__(self, db: Database, students: List[Student], special_group_strategy: str = "random",
+                 backend: str = "dense", seed: Optional[int] = None, starts: int = 4,
+                 tracer: Optional[StageTracer] = None, dtype=None):
         """
             Initializes the RoleAssignment class.
 
             Parameters:
                 - db (Database): The database instance containing role data.
                 - students (List[Student]): The list of students to be assigned roles.
+                - special_group_strategy (str): "random" retries with randomized special group
+                  adjustments, "exact" searches the optimal all-or-nothing decisions (SpecialGroupSearch),
+                  "multistart" runs several seeded randomized walks in parallel and keeps the best
+                  (MultiStartSearch).
+                - backend (str): "dense" solves on the full cost matrix, "sparse" matches over the
+                  allowed (non-vetoed) edges only (SparseProblem), "compressed" solves a min-cost
+                  flow between student types and role buckets (CompressedProblem), "streaming" builds the
+                  cost matrix into a memory-mapped temporary file and solves it row by row (StreamingProblem).
+                - seed (Optional[int]): Seed of the randomized strategies, for reproducible results.
+                - starts (int): Number of walks of the "multistart" strategy.
+                - tracer (Optional[StageTracer]): Records timings of the run stages (a new tracer by default).
+                - dtype (Optional[np.dtype]): dtype of the dense cost matrix. By default the smallest integer
+                  type that holds all costs is chosen (see cost_dtype); pass np.float64 for custom weights
+                  that are set after construction.
         """
+        if special_group_strategy not in ("random", "exact", "multistart"):
+            raise ValueError(f"Unknown special group strategy: {special_group_strategy}")
+        if backend not in ("dense", "sparse", "compressed", "streaming"):
+            raise ValueError(f"Unknown solver backend: {backend}")
+
         self.db = db
         self.students = students
+        self.tracer = tracer if tracer is not None else StageTracer()
         self.roles = self.dynamic_role_loading()
         self.special_groups = self.fetch_special_groups()
+        self.special_group_strategy = special_group_strategy
+        self.backend = backend
+        self.seed = seed
+        self.rng = random.Random(seed)
         self.random_prob = 0.5
         self.max_iterations = 10
+        self.starts = starts
+        self.max_workers = None  # Worker processes of the "multistart" strategy (default: one per CPU)
+        self.starts_converged = None
+        self.dtype = dtype
+        self.memmap_dir = None  # Directory of the "streaming" backend's cost matrix file (default: system temp)
+        self._memmap_cleanup = None
+        # Called with (solver runs so far, maximum or None) between the solver runs of solve()
+        self.progress_callback: Optional[Callable[[int, Optional[int]], None]] = None
+        self.cancel_event = threading.Event()
 
         # Cost definitions for different role hierarchies
         self.cost_for_essential = 5
@@ -40,83 +98,440 @@ class RoleAssignment:
         self.cost_for_unisex = -2
         self.penalty_cost_for_exclusion = 1000
 
-        self.cost_matrix = self.construct_cost_matrix()
+        self.cost_model = CostModel(self.students, self.roles, cost_row_cache, self.catalog_key())
+        self.role_offsets = np.zeros(len(self.roles))  # Special group adjustments per role
+        self.adjusted_columns = set()  # Role indices whose costs changed since the last solver run
+        self._cost_matrix = None
+        self.problem = None
 
-        self.solution = []  # Stores successful assignments
-        self.high_cost_assignments = []  # Stores problematic assignments
-        self.not_assigned = []
-        self.min_cost = None  # Stores the total cost of the assignment
-        self.coverage = None
+        self.result = None  # SolveResult of the last stored assignment
+        self.feasibility = None  # FeasibilityReport of the last solve
+        self.anytime = None  # AnytimeSearch of the last solve with a time budget
 
     def dynamic_role_loading(self):
         """
             Dynamically loads available roles based on the number of participants.
             If the number of students is below the participant limit, only just_8b roles are loaded.
             Otherwise, all available roles are fetched.
+            Databases with a role catalog snapshot (see Database.role_catalog) serve both role sets from
+            it; other catalog sources (e.g. CatalogSnapshot) are queried for the two role lists.
         """
-        just8b_roles = self.db.load_roles_for_just8b()
-        participant_limit = len(just8b_roles)
-
-        # Load a limited role set if participants are few, otherwise load all roles
-        roles = just8b_roles if len(self.students) < participant_limit else self.db.fetch_all_roles()
+        with self.tracer.stage("load_roles") as record:
+            catalog = self.db.role_catalog() if hasattr(self.db, "role_catalog") else None
+            if isinstance(catalog, RoleCatalog):
+                # One cached snapshot holds both role sets
+                roles = catalog.roles_for(len(self.students))
+            else:
+                just8b_roles = self.db.load_roles_for_just8b()
+                participant_limit = len(just8b_roles)
+
+                # Load a limited role set if participants are few, otherwise load all roles
+                roles = just8b_roles if len(self.students) < participant_limit else self.db.fetch_all_roles()
+            record.shape = (len(roles),)
 
         return roles
 
+    def catalog_key(self):
+        """
+            Identifies the loaded role set in the cost row cache: the catalog version of the database
+            and the IDs of the roles. Databases without a catalog version are not cached.
+        """
+        catalog_version = getattr(self.db, "catalog_version", None)
+        if catalog_version is None:
+            return None
+        return catalog_version, tuple(role.id for role in self.roles)
+
+    def cost_weights(self) -> Dict[str, float]:
+        """
+            Collects the cost definitions into the weight dictionary used by the CostModel.
+        """
+        return {
+            "essential": self.cost_for_essential,
+            "next": self.cost_for_next,
+            "rest": self.cost_for_rest,
+            "last": self.cost_for_last,
+            "matched_gender": self.cost_for_matched_gender,
+            "unisex": self.cost_for_unisex,
+            "exclusion": self.penalty_cost_for_exclusion,
+        }
+
+    def scenario_weights(self) -> Dict[str, float]:
+        """
+            The cost weights including the special group bonus, the base of what-if scenarios
+            (see ScenarioEngine and weight_grid).
+        """
+        return {**self.cost_weights(), "special_group": self.cost_for_special_group}
+
+    def cost_dtype(self) -> np.dtype:
+        """
+            The dtype of the dense cost matrix: self.dtype if set, otherwise the smallest type that holds
+            every cost plus the special group adjustments of all retries.
+        """
+        if self.dtype is not None:
+            return np.dtype(self.dtype)
+        adjustment = max(1000, abs(self.cost_for_special_group))
+        return cost_dtype(self.scenario_weights(), margin=self.max_iterations * adjustment)
+
     def construct_cost_matrix(self):
         """
             Constructs a cost matrix for role assignment based on role hierarchy and exclusion constraints.
+            Students and roles are encoded as integer codes once, and the matrix is assembled from
+            per-student-type cost rows (see CostModel) in the dtype of cost_dtype().
         """
-        cost_matrix = np.zeros((len(self.students), len(self.roles)))
+        with self.tracer.stage("cost_matrix", shape=(len(self.students), len(self.roles))):
+            return self.cost_model.build(self.cost_weights(), self.cost_dtype())
 
-        for i, role in enumerate(self.roles):
-            if role.hierarchy == 'Essential':
-                cost_matrix[:, i] += self.cost_for_essential
-            elif role.hierarchy == 'Next':
-                cost_matrix[:, i] += self.cost_for_next
-            elif role.hierarchy == 'Rest':
-                cost_matrix[:, i] += self.cost_for_rest
-            elif role.hierarchy == 'Last':
-                cost_matrix[:, i] += self.cost_for_last
+    def type_cost_rows(self):
+        """
+            Builds the per-student-type cost rows used by the sparse and compressed backends.
+        """
+        with self.tracer.stage("cost_matrix") as record:
+            type_rows = self.cost_model.type_cost_rows(self.cost_weights())
+            record.shape = type_rows.shape
+        return type_rows
+
+    def memmap_cost_matrix(self) -> np.memmap:
+        """
+            Builds the cost matrix (without special group adjustments) into a memory-mapped file in a
+            temporary directory, in chunks of rows. The directory is removed with this instance.
+        """
+        directory = tempfile.mkdtemp(prefix="rollenverteilung_", dir=self.memmap_dir)
+        self._memmap_cleanup = weakref.finalize(self, shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, "cost_matrix.dat")
+        with self.tracer.stage("cost_matrix", shape=(len(self.students), len(self.roles))):
+            return self.cost_model.build_memmap(self.cost_weights(), path, self.cost_dtype())
+
+    @property
+    def cost_matrix(self):
+        """
+            The dense cost matrix including the special group adjustments.
+            It is built on first use, so the sparse, compressed and streaming backends never allocate it.
+        """
+        if self._cost_matrix is None:
+            cost_matrix = self.construct_cost_matrix()
+            adjusted = np.flatnonzero(self.role_offsets)
+            cost_matrix[:, adjusted] += self.role_offsets[adjusted].astype(cost_matrix.dtype)
+            self._cost_matrix = cost_matrix
+        return self._cost_matrix
+
+    @cost_matrix.setter
+    def cost_matrix(self, cost_matrix):
+        self._cost_matrix = cost_matrix
+
+    def assignment_problem(self):
+        """
+            Creates the assignment problem for the selected backend
+            (see DenseProblem, SparseProblem, CompressedProblem and StreamingProblem).
 
-        for i, student in enumerate(self.students):
-            for j, role in enumerate(self.roles):
-                if student.is_excluded_from(role.gender):
-                    cost_matrix[i, j] += self.penalty_cost_for_exclusion
-                if student.preferred_gender == role.gender:
-                    cost_matrix[i, j] += self.cost_for_matched_gender
-                if role.gender == "Unisex":
-                    cost_matrix[i, j] += self.cost_for_unisex
+            In an anytime solve the dense matrix is solved as a StreamingProblem instead, whose solves stop
+            at the deadline between two row augmentations (scipy's solver cannot be interrupted).
+        """
+        interrupt = self.anytime.check_deadline if self.anytime is not None else None
+        if self.backend == "sparse":
+            return SparseProblem(self.cost_model, self.type_cost_rows(), self.role_offsets)
+        if self.backend == "streaming":
+            return StreamingProblem(self.memmap_cost_matrix(), self.role_offsets, interrupt)
+        if self.backend == "compressed":
+            type_rows = self.type_cost_rows()
+            return CompressedProblem(self.cost_model, type_rows, self.role_offsets)
+        if self.anytime is not None:
+            return StreamingProblem(self.cost_matrix, interrupt=interrupt)
+        return DenseProblem(self.cost_matrix)
+
+    def adjust_roles(self, role_indices, delta):
+        """
+            Adds delta to the cost of the given roles for every student.
 
-        return cost_matrix
+            Parameters:
+                - role_indices (Iterable[int]): Indices of the roles to adjust.
+                - delta (float): Cost to add.
+        """
+        columns = sorted(role_indices)
+        self.role_offsets[columns] += delta
+        if self._cost_matrix is not None:
+            dtype = self._cost_matrix.dtype
+            if dtype.kind == "i" and delta != int(delta):
+                raise ValueError(f"Fractional cost adjustment {delta} on a {dtype} cost matrix; use dtype=np.float64")
+            self._cost_matrix[:, columns] += dtype.type(delta)
+        self.adjusted_columns |= set(columns)
+
+    def check_feasibility(self) -> FeasibilityReport:
+        """
+            Checks before solving whether every student can receive a role without violating a veto
+            (see check_feasibility). If not, the report names the students and roles that are short.
+        """
+        with self.tracer.stage("feasibility", shape=(len(self.students), len(self.roles))):
+            return check_feasibility(self.cost_model)
 
-    def solve(self):
+    def solve(self, time_budget: Optional[float] = None) -> SolveResult:
         """
-            Solves the role assignment problem using the Hungarian algorithm (linear sum assignment).
+            Solves the role assignment problem with the selected special group strategy.
             Assigns roles to students while minimizing the overall cost.
-        """
-        for _ in range(self.max_iterations):
-            row_ind, col_ind = linear_sum_assignment(self.cost_matrix)
-            assigned_students = set(row_ind)  # Track assigned students
+            The run is recorded as the "solve" stage of self.tracer (and profiled if it has a profile path).
+            The feasibility pre-check is stored in self.feasibility.
 
-            # Store the initial assignment
-            for student_idx, role_idx in zip(row_ind, col_ind):
-                cost = self.cost_matrix[student_idx, role_idx]
-                student = self.students[student_idx]
-                role = self.roles[role_idx]
+            The run can be cancelled from another thread with cancel(); it stops cooperatively between two
+            solver runs (the "multistart" strategy only before its walks start).
 
-                if cost >= 1000:
-                    self.high_cost_assignments.append((student, role, cost))
+            With a time budget the run is an anytime solve (see AnytimeSearch, stored in self.anytime): a
+            greedy assignment is available at once, the optimum of the relaxation with optional special
+            groups (solved on the student types, see CompressedProblem) gives a lower bound, and every solver
+            run of the strategy is repaired into a candidate. When the budget runs out, the best valid
+            assignment so far is returned; self.anytime.gap tells how far from optimal it may be. The dense
+            and streaming solvers stop within one row augmentation of the deadline (see assignment_problem),
+            also in the multistart walks. The sparse and compressed solvers cannot be interrupted, so after
+            their first run, a run only starts if one more run of the same length still fits into the budget.
+
+            Parameters:
+                - time_budget (Optional[float]): Seconds after which the best assignment so far is returned.
+
+            Returns:
+                SolveResult: The final assignment (also available as self.result).
+
+            Raises:
+                SolveCancelled: If the run was cancelled.
+        """
+        self.feasibility = self.check_feasibility()
+        self.check_cancelled()
+        self.anytime = None
+        with self.tracer.profile(), self.tracer.stage("solve", shape=(len(self.students), len(self.roles))) as record:
+            if time_budget is not None:
+                self.anytime = AnytimeSearch(self.type_cost_rows(), self.cost_model.student_types, self.special_groups,
+                                             self.cost_for_special_group, time_budget)
+                self.anytime.offer([], [])  # Greedy start
+                self.anytime.raise_bound(self.anytime.minimum_bound())
+            try:
+                if self.anytime is not None:
+                    self.relax_special_groups()
+                    self.anytime.check_deadline()
+                self.problem = self.assignment_problem()
+                if self.anytime is not None:
+                    self.anytime.check_deadline()
+                if self.special_group_strategy == "exact":
+                    record.iterations = self.solve_exact()
+                    if self.anytime is not None:
+                        self.anytime.raise_bound(self.anytime.best_cost)  # The search is exact
+                elif self.special_group_strategy == "multistart":
+                    record.iterations = self.solve_multistart()
                 else:
-                    self.solution.append((student, role, cost))
+                    record.iterations = self.solve_random()
+                completed = True
+            except BudgetExhausted:
+                completed = False
+
+            if self.anytime is not None:
+                # The strategy's assignment was offered as well, so the best one is reported either way
+                row_ind, col_ind = self.anytime.row_ind, self.anytime.col_ind
+                self.result = SolveResult(self.students, self.roles, row_ind, col_ind,
+                                          self.anytime.cell_costs(row_ind, col_ind))
+                if not completed:
+                    record.iterations = None
+        return self.result
+
+    def relax_special_groups(self):
+        """
+            Solves the relaxation in which every special group is optional (see AnytimeSearch.take_relaxation)
+            for the lower bound of an anytime solve. It is solved on the student types for every backend, which
+            takes a fraction of one solver run of the strategy.
+        """
+        problem = CompressedProblem(self.cost_model, self.anytime.type_rows)
+        row_ind, col_ind = problem.solve(self.anytime.relaxation_offsets(), np.ones(len(self.roles), dtype=bool))
+        self.anytime.take_relaxation(row_ind, col_ind)
+
+    def cancel(self):
+        """Requests the running (or next) solve to stop; safe to call from any thread."""
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        """Raises SolveCancelled if cancel() was called."""
+        if self.cancel_event.is_set():
+            raise SolveCancelled("Rollenverteilung abgebrochen.")
 
-            # Identify unassigned students
-            self.not_assigned = list(set(self.students) - {student for student, _, _ in self.solution})
-            self.min_cost = self.cost_matrix[row_ind, col_ind].sum()
-            self.coverage = round((len(self.solution) + len(self.high_cost_assignments)) / len(self.students) * 100, 1)
+    def report_progress(self, runs: int, total: Optional[int] = None):
+        """
+            Passes the progress to self.progress_callback and stops the run if it was cancelled or the time
+            budget has run out. Called between two solver runs.
+
+            Parameters:
+                - runs (int): Solver runs finished so far.
+                - total (Optional[int]): Maximum number of runs, None if unknown.
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(runs, total)
+        self.check_cancelled()
+        if self.anytime is not None:
+            self.anytime.check_deadline(next_run=not isinstance(self.problem, StreamingProblem))
+
+    def solve_random(self):
+        """
+            Solves the assignment as a linear sum assignment (see IncrementalAssignment) and retries with
+            randomized special group adjustments until every group is assigned completely or not at all.
+
+            Returns:
+                int: Number of solver runs.
+        """
+        # Retries only change the columns of special group roles, so the dense solver re-optimizes
+        # its previous solution instead of starting from scratch
+        engine = None
+        no_offsets = np.zeros(len(self.roles))
+        all_roles = np.ones(len(self.roles), dtype=bool)
+        iteration = 0
+        for iteration in range(1, self.max_iterations + 1):
+            with self.tracer.stage("assignment", iterations=iteration):
+                if self.backend != "dense":
+                    row_ind, col_ind = self.problem.solve(no_offsets, all_roles)
+                else:
+                    if engine is None:
+                        interrupt = self.anytime.check_deadline if self.anytime is not None else None
+                        engine = IncrementalAssignment(self.cost_matrix, interrupt=interrupt)
+                    else:
+                        engine.update_columns(self.adjusted_columns)
+                    row_ind, col_ind = engine.solution()
+            self.adjusted_columns = set()
+            self.store_assignment(row_ind, col_ind)
 
             # Handle special groups
             if self.handle_special_groups(col_ind):
-                return  # Valid assignment found
+                break  # Valid assignment found
+            if iteration < self.max_iterations:
+                self.report_progress(iteration, self.max_iterations)
+        return iteration
+
+    def solve_exact(self):
+        """
+            Finds the optimal assignment in which every special group is assigned completely or not at all.
+            Instead of random retries, the include/exclude decision of each group is searched with
+            branch-and-bound (see SpecialGroupSearch), so the result is deterministic.
+
+            Returns:
+                int: Number of solved search nodes.
+        """
+        search = SpecialGroupSearch(self.problem, self.special_groups, self.cost_for_special_group,
+                                    callback=self.search_progress)
+        _, row_ind, col_ind, included = search.solve()
+
+        # Reflect the decisions in the role costs, as the randomized retries do
+        for group_id, role_indices in self.special_groups.items():
+            self.adjust_roles(role_indices, self.cost_for_special_group if included[group_id] else 1000)
+
+        self.store_assignment(row_ind, col_ind)
+        return search.nodes_solved
+
+    def search_progress(self, nodes: int, row_ind, col_ind):
+        """Callback of SpecialGroupSearch: offers the node's assignment to an anytime solve."""
+        if self.anytime is not None:
+            self.anytime.offer(row_ind, col_ind)
+        self.report_progress(nodes)
+
+    def solve_multistart(self):
+        """
+            Runs several independently seeded randomized walks in worker processes (see MultiStartSearch)
+            and keeps the valid assignment with the lowest cost. The walk seeds are derived from self.seed.
+
+            Returns:
+                int: Number of solver runs of all walks.
+        """
+        search = MultiStartSearch(self.problem, self.special_groups, self.cost_for_special_group,
+                                  self.random_prob, self.max_iterations)
+        deadline = self.anytime.deadline if self.anytime is not None else None
+        best = search.solve(self.starts, self.seed, self.max_workers, deadline)
+        self.starts_converged = search.starts_converged
+
+        # Reflect the adjustments of the chosen walk in the role costs
+        for delta in np.unique(best.offsets[best.offsets != 0]):
+            self.adjust_roles(np.flatnonzero(best.offsets == delta), delta)
+
+        self.store_assignment(best.row_ind, best.col_ind)
+        return sum(walk.iterations for walk in search.results)
+
+    def alternatives(self, k: int, time_budget: Optional[float] = None, max_workers: int = 1) -> List[SolveResult]:
+        """
+            Enumerates the k best distinct assignments in increasing cost (see MurtyEnumerator).
+
+            The alternatives keep the special group decisions of the last solve: roles of groups that were
+            not assigned stay unassigned, and roles of fully assigned groups are made cheaper than any
+            trade-off (as in SpecialGroupSearch), so all assignments covering them are enumerated first.
+            The first result is the solved optimum (or an assignment of equal cost).
+
+            Parameters:
+                - k (int): Number of assignments.
+                - time_budget (Optional[float]): Seconds after which the assignments found so far are returned.
+                - max_workers (int): Worker processes for the subproblems.
+
+            Returns:
+                List[SolveResult]: The assignments, cheapest first.
+
+            Raises:
+                ValueError: If the backend is not "dense" (the enumeration needs the dense cost matrix, which
+                  the other backends avoid building).
+        """
+        if self.backend != "dense":
+            raise ValueError(f"Alternatives need the dense cost matrix, not the {self.backend} backend")
+        if self.result is None:
+            self.solve()
+
+        cost_matrix = self.cost_matrix
+        assigned_roles = set(self.result.col_ind.tolist())
+        active = np.ones(len(self.roles), dtype=bool)
+        forced = np.zeros(len(self.roles), dtype=bool)
+        for role_indices in self.special_groups.values():
+            columns = sorted(role_indices)
+            if role_indices <= assigned_roles:
+                forced[columns] = True
+            elif not role_indices & assigned_roles:
+                active[columns] = False
+
+        columns = np.flatnonzero(active)
+        costs = cost_matrix[:, columns] if len(columns) < len(self.roles) else cost_matrix
+        big_m = (float(costs.max(initial=0)) - float(costs.min(initial=0)) + 1) * max(len(self.students), 1)
+        enumerator = MurtyEnumerator(costs - big_m * forced[columns] if forced.any() else costs)
+
+        alternatives = []
+        for _, row_ind, col_ind in enumerator.enumerate(k, time_budget, max_workers):
+            col_ind = columns[col_ind]
+            # Assignments that leave a forced role free are ranked after all others
+            if not forced[col_ind].sum() == forced.sum():
+                break
+            alternatives.append(SolveResult(self.students, self.roles, row_ind, col_ind, cost_matrix[row_ind, col_ind]))
+        return alternatives
+
+    def store_assignment(self, row_ind, col_ind):
+        """
+            Stores an assignment from the solver as self.result, replacing the previous one.
+
+            Parameters:
+                - row_ind (array-like): Assigned student indices.
+                - col_ind (array-like): Assigned role indices.
+        """
+        costs = self.problem.cell_costs(row_ind, col_ind)
+        self.result = SolveResult(self.students, self.roles, row_ind, col_ind, costs)
+        if self.anytime is not None:
+            self.anytime.offer(row_ind, col_ind)
+
+    @property
+    def solution(self):
+        """Successful (student, role, cost) assignments of the last result."""
+        return self.result.solution if self.result else []
+
+    @property
+    def high_cost_assignments(self):
+        """Problematic (student, role, cost) assignments of the last result."""
+        return self.result.high_cost_assignments if self.result else []
+
+    @property
+    def not_assigned(self):
+        """Students without a successful assignment in the last result."""
+        return self.result.not_assigned if self.result else []
+
+    @property
+    def min_cost(self):
+        """Total cost of the last result."""
+        return self.result.min_cost if self.result else None
+
+    @property
+    def coverage(self):
+        """Coverage (in percent) of the last result."""
+        return self.result.coverage if self.result else None
 
     def handle_special_groups(self, col_ind):
         """
@@ -133,14 +548,12 @@ class RoleAssignment:
             assigned_count = len(role_indices & assigned_roles)  # Count assigned roles in this group
 
             if 0 < assigned_count < len(role_indices):  # Partial assignment detected
-                if random.random() < self.random_prob:
+                if self.rng.random() < self.random_prob:
                     # Enforce full group assignment
-                    for i in role_indices:
-                        self.cost_matrix[:, i] += self.cost_for_special_group  # Encourage assignment
+                    self.adjust_roles(role_indices, self.cost_for_special_group)  # Encourage assignment
                 else:
                     # Remove group from assignment
-                    for i in role_indices:
-                        self.cost_matrix[:, i] += 1000  # High penalty for assignment
+                    self.adjust_roles(role_indices, 1000)  # High penalty for assignment
 
                 valid = False  # Trigger a re-run
         return valid
@@ -149,21 +562,24 @@ class RoleAssignment:
     def fetch_special_groups(self):
         """
         Fetches special groups and maps them to role indices in self.roles.
+        The group roles come from one JOIN query (see Database.fetch_special_group_roles) and are mapped
+        through a role ID to index dictionary, so the setup is linear in the catalog size.
 
         Returns:
             Dict[int, Set[int]]: A dictionary where keys are GroupIDs and values are sets of role indices.
         """
         special_groups = {}
-        group_ids = self.db.fetch_special_groups_ID()
-
-        for group_id in group_ids:
-            roles_in_group = self.db.get_roles_from_group(group_id)
+        with self.tracer.stage("special_groups") as record:
+            group_roles = self.db.fetch_special_group_roles()
 
             # Map roles to their indices in self.roles
-            role_indices = {i for i, role in enumerate(self.roles) if role.id in {r.id for r in roles_in_group}}
+            role_index = {role.id: i for i, role in enumerate(self.roles)}
+            for group_id, role_ids in group_roles.items():
+                role_indices = {role_index[role_id] for role_id in role_ids if role_id in role_index}
 
-            if role_indices:
-                special_groups[group_id] = role_indices
+                if role_indices:
+                    special_groups[group_id] = role_indices
+            record.shape = (len(group_roles),)
 
         return special_groups
 
@@ -179,6 +595,15 @@ class RoleAssignment:
         print("=" * 40)
         print(f"**Gesamtkosten der Zuweisung:** {self.min_cost}")
         print(f"**Gesamtabdeckung der Zuweisung:** {self.coverage}%\n")
+        if self.anytime is not None:
+            print(f"**Untere Schranke:** {self.anytime.lower_bound} "
+                  f"(Optimalitätslücke: {self.anytime.gap:.1%} nach {self.anytime.summary()['seconds']:.2f}s)\n")
+
+        if self.feasibility is not None and not self.feasibility.feasible:
+            print("\n⚠️ **Keine vetofreie Zuweisung aller Teilnehmenden möglich:**")
+            for message in self.feasibility.messages():
+                print(f"🚨 {message}")
+            print("=" * 40)
 
         if self.high_cost_assignments:
             print("\n⚠️ **Problematische Zuweisungen:**")
@@ -192,13 +617,21 @@ class RoleAssignment:
                 print(f"❌ {student.first_name} {student.last_name}")
             print("=" * 40)
 
-    def write_results_to_csv(self, file_path):
+    def write_results_to_csv(self, file_path, write_stage_summary: bool = False):
         """
         Writes the role assignment results to a CSV file.
 
         Parameters:
             - file_path (str): The path where the CSV file will be saved.
+            - write_stage_summary (bool): Also write the stage timings of self.tracer as JSON next to
+              the CSV (see summary_path).
         """
+        with self.tracer.stage("write_csv", shape=(len(self.students),)):
+            self._write_results(file_path)
+        if write_stage_summary:
+            self.tracer.write_summary(summary_path(file_path))
+
+    def _write_results(self, file_path):
         with open(file_path, mode="w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
             writer.writerow([
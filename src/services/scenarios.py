@@ -0,0 +1,150 @@
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from src.services import shared_matrix
+from src.services.solve_result import SolveResult
+from src.services.special_groups import SpecialGroupSearch
+
+# Metric columns of the comparison table (after the weight columns)
+METRIC_FIELDS = ["Gesamtkosten", "Abdeckung", "Veto verletzt", "Genderwünsche erfüllt [%]"]
+
+
+def weight_grid(base: Dict[str, float], **axes: Iterable[float]) -> List[Dict[str, float]]:
+    """
+        Builds the cartesian product of the given weight values; other weights keep their base value.
+
+        Example: weight_grid(assignment.scenario_weights(), matched_gender=[-2, -4, -8], unisex=[0, -2])
+
+        Parameters:
+            - base (Dict[str, float]): The default weights.
+            - axes (Iterable[float]): Values per weight name.
+
+        Returns:
+            List[Dict[str, float]]: One weight dictionary per scenario.
+    """
+    unknown = set(axes) - set(base)
+    if unknown:
+        raise ValueError(f"Unknown cost weights: {', '.join(sorted(unknown))}")
+    names = list(axes)
+    return [{**base, **dict(zip(names, values))} for values in itertools.product(*axes.values())]
+
+
+def solve_scenario(cost_matrix: np.ndarray, special_groups: Dict[int, Set[int]], group_bonus: float):
+    """
+        Solves one scenario with the exact special group search (see SpecialGroupSearch).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Assigned student indices and their role indices.
+    """
+    _, row_ind, col_ind, _ = SpecialGroupSearch(cost_matrix, special_groups, group_bonus).solve()
+    return row_ind, col_ind
+
+
+def _solve_shared_scenario(arguments):
+    index, special_groups, group_bonus = arguments
+    return solve_scenario(shared_matrix.worker_matrix()[index], special_groups, group_bonus)
+
+
+class ScenarioEngine:
+    """
+        Compares role assignments under different cost weights (what-if analysis).
+
+        The cost rows are linear in the weights (see CostModel.type_features), so the cost matrices of
+        all scenarios are built as one scenarios x students x roles tensor. The scenarios are
+        independent assignments and are solved in worker processes that read the tensor from shared
+        memory. Special groups are decided exactly per scenario (as the "exact" strategy does).
+    """
+
+    def __init__(self, assignment):
+        """
+            Parameters:
+                - assignment (RoleAssignment): Provides students, roles, special groups and the default weights.
+        """
+        self.assignment = assignment
+        self.cost_model = assignment.cost_model
+        self.results: List[SolveResult] = []
+
+    def cost_tensor(self, scenarios: List[Dict[str, float]]) -> np.ndarray:
+        """Builds the cost matrices of all scenarios (see CostModel.build_many)."""
+        shape = (len(scenarios), len(self.cost_model.students), len(self.cost_model.roles))
+        with self.assignment.tracer.stage("cost_matrix", shape=shape):
+            return self.cost_model.build_many(scenarios)
+
+    def solve(self, scenarios: List[Dict[str, float]], max_workers: Optional[int] = None) -> List[Dict]:
+        """
+            Solves every scenario and returns the comparison table.
+
+            Parameters:
+                - scenarios (List[Dict[str, float]]): Weights per scenario (see weight_grid); the
+                  "special_group" weight is the bonus of included special groups.
+                - max_workers (Optional[int]): Number of worker processes (default: number of CPUs).
+                  With 1 the scenarios are solved in the calling process.
+
+            Returns:
+                List[Dict]: One row per scenario with its weights and METRIC_FIELDS. The assignments are
+                stored in self.results.
+        """
+        tensor = self.cost_tensor(scenarios)
+        special_groups = self.assignment.special_groups
+        bonuses = [scenario["special_group"] for scenario in scenarios]
+
+        with self.assignment.tracer.stage("solve", iterations=len(scenarios), shape=tensor.shape):
+            if max_workers is None:
+                max_workers = min(len(scenarios), os.cpu_count() or 1)
+            if max_workers <= 1:
+                solutions = [solve_scenario(tensor[s], special_groups, bonus) for s, bonus in enumerate(bonuses)]
+            else:
+                arguments = [(s, special_groups, bonus) for s, bonus in enumerate(bonuses)]
+                with shared_matrix.shared_matrix(tensor) as initargs:
+                    with ProcessPoolExecutor(max_workers, initializer=shared_matrix.attach,
+                                             initargs=initargs) as executor:
+                        solutions = list(executor.map(_solve_shared_scenario, arguments))
+
+        self.results = []
+        table = []
+        for s, (scenario, (row_ind, col_ind)) in enumerate(zip(scenarios, solutions)):
+            result = SolveResult(self.assignment.students, self.assignment.roles, row_ind, col_ind,
+                                 tensor[s, row_ind, col_ind], penalty=scenario["exclusion"])
+            self.results.append(result)
+            table.append({**scenario, **self.metrics(result)})
+        return table
+
+    def metrics(self, result: SolveResult) -> Dict:
+        """
+            Computes the comparison metrics of one scenario result.
+
+            Veto violations and fulfilled gender wishes are counted from the gender codes, so they do not
+            depend on the scenario's weights. A wish counts as fulfilled for unisex roles, as in the
+            results CSV.
+        """
+        model = self.cost_model
+        role_genders = model.role_gender_codes[result.col_ind]
+        vetoed = model.excluded_codes[result.row_ind] == role_genders
+        matched = (model.preferred_codes[result.row_ind] == role_genders) | (role_genders == model.unisex_code)
+        num_students = len(model.students)
+        return {
+            "Gesamtkosten": float(result.min_cost),
+            "Abdeckung": result.coverage,
+            "Veto verletzt": int(vetoed.sum()),
+            "Genderwünsche erfüllt [%]": round(matched.sum() / num_students * 100, 1) if num_students else 0.0,
+        }
+
+
+def write_table(table: List[Dict], file_path: str):
+    """
+        Writes a comparison table (see ScenarioEngine.solve) to a CSV file.
+
+        Parameters:
+            - table (List[Dict]): Rows of the table.
+            - file_path (str): Path of the CSV file.
+    """
+    fieldnames = [name for name in table[0] if name not in METRIC_FIELDS] + METRIC_FIELDS if table else METRIC_FIELDS
+    with open(file_path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(table)
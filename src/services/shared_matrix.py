@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Matrix of a worker process, set once by the pool initializer attach()
+_worker_matrix = None
+_worker_memory = None
+
+
+@contextmanager
+def shared_matrix(matrix: np.ndarray):
+    """
+        Copies a matrix into a shared memory block for the lifetime of the context.
+
+        Yields:
+            Tuple[str, tuple, str]: Block name, shape and dtype; the initargs of attach().
+    """
+    matrix = np.ascontiguousarray(matrix)
+    memory = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    try:
+        np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=memory.buf)[...] = matrix
+        yield memory.name, matrix.shape, matrix.dtype.str
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def attach(name: str, shape, dtype: str):
+    """Pool initializer: maps the shared matrix read-only into the worker process."""
+    global _worker_matrix, _worker_memory
+    # Pool workers share the resource tracker of the parent, which unlinks the block once
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_matrix = np.ndarray(shape, dtype=dtype, buffer=_worker_memory.buf)
+    _worker_matrix.flags.writeable = False
+
+
+def worker_matrix() -> np.ndarray:
+    """Returns the shared matrix attached in this worker process."""
+    return _worker_matrix
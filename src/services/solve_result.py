@@ -0,0 +1,83 @@
+import numpy as np
+from typing import List, Tuple
+
+from src.models.role import Role
+from src.models.student import Student
+
+
+class SolveResult:
+    """
+        Immutable, array-backed result of a role assignment.
+
+        Only the assigned student indices, role indices and costs are stored (as read-only arrays).
+        The (student, role, cost) tuples used for display and export are built on demand from the
+        student and role lists, so a solver run keeps one compact result instead of growing lists.
+    """
+
+    __slots__ = ("students", "roles", "row_ind", "col_ind", "costs", "penalty")
+
+    def __init__(self, students: List[Student], roles: List[Role], row_ind, col_ind, costs, penalty: float = 1000):
+        """
+            Parameters:
+                - students (List[Student]): The students (rows of the cost matrix).
+                - roles (List[Role]): The roles (columns of the cost matrix).
+                - row_ind (array-like): Assigned student indices.
+                - col_ind (array-like): Assigned role indices.
+                - costs (array-like): Cost of each assignment.
+                - penalty (float): Assignments costing at least this much violate a veto (or a removed
+                  special group) and are reported as high cost assignments.
+        """
+        arrays = []
+        for values, dtype in ((row_ind, np.intp), (col_ind, np.intp), (costs, np.float64)):
+            array = np.array(values, dtype=dtype)
+            array.flags.writeable = False
+            arrays.append(array)
+
+        object.__setattr__(self, "students", students)
+        object.__setattr__(self, "roles", roles)
+        object.__setattr__(self, "row_ind", arrays[0])
+        object.__setattr__(self, "col_ind", arrays[1])
+        object.__setattr__(self, "costs", arrays[2])
+        object.__setattr__(self, "penalty", penalty)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SolveResult is immutable")
+
+    def __len__(self) -> int:
+        return len(self.row_ind)
+
+    @property
+    def high_cost_mask(self) -> np.ndarray:
+        """Boolean mask of the assignments at or above the penalty."""
+        return self.costs >= self.penalty
+
+    def _tuples(self, mask: np.ndarray) -> List[Tuple[Student, Role, float]]:
+        return [(self.students[i], self.roles[j], cost)
+                for i, j, cost in zip(self.row_ind[mask], self.col_ind[mask], self.costs[mask])]
+
+    @property
+    def solution(self) -> List[Tuple[Student, Role, float]]:
+        """Successful (student, role, cost) assignments."""
+        return self._tuples(~self.high_cost_mask)
+
+    @property
+    def high_cost_assignments(self) -> List[Tuple[Student, Role, float]]:
+        """Problematic (student, role, cost) assignments."""
+        return self._tuples(self.high_cost_mask)
+
+    @property
+    def not_assigned(self) -> List[Student]:
+        """Students without a successful assignment, in input order."""
+        assigned = np.zeros(len(self.students), dtype=bool)
+        assigned[self.row_ind[~self.high_cost_mask]] = True
+        return [self.students[i] for i in np.flatnonzero(~assigned)]
+
+    @property
+    def min_cost(self) -> float:
+        """Total cost of the assignment."""
+        return self.costs.sum()
+
+    @property
+    def coverage(self) -> float:
+        """Share of students (in percent) that received a role."""
+        return round(len(self.row_ind) / len(self.students) * 100, 1) if self.students else 0.0
@@ -0,0 +1,153 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_bipartite_matching, min_weight_full_bipartite_matching
+from typing import Optional, Tuple
+
+from src.services.cost_model import CostModel
+
+
+class SparseProblem:
+    """
+        Assignment problem over the allowed (non-vetoed) student -> role edges only.
+
+        Vetoed pairs are left out of a CSR graph instead of being stored as penalty entries of a
+        dense matrix, and the assignment is a minimum weight full bipartite matching. Only if
+        the vetoes make a full matching impossible are vetoed edges added back with their
+        penalty cost, and only for the students (or roles) that some maximum matching leaves
+        unmatched. Roles whose offset outweighs every cell cost (the forced roles of a special
+        group search) also get their vetoed edges, so they are covered whenever the dense problem
+        would cover them. Implements the problem interface of DenseProblem.
+    """
+
+    def __init__(self, cost_model: CostModel, type_rows: np.ndarray, role_offsets: Optional[np.ndarray] = None):
+        """
+            Parameters:
+                - cost_model (CostModel): Encoded students and roles.
+                - type_rows (np.ndarray): Per-type cost rows (including the veto penalty).
+                - role_offsets (Optional[np.ndarray]): Cost already added to each role (e.g. special groups).
+        """
+        self.cost_model = cost_model
+        self.type_rows = type_rows
+        self.shape = (len(cost_model.students), len(cost_model.roles))
+        self.role_offsets = np.zeros(self.shape[1]) if role_offsets is None else role_offsets
+        self.indptr, self.indices, self.data = cost_model.allowed_edges(type_rows)
+        self.vetoed_students = 0
+
+    def cost_bounds(self) -> Tuple[float, float]:
+        """Returns the smallest and largest cell cost."""
+        costs = self.type_rows + self.role_offsets
+        return costs.min(initial=0), costs.max(initial=0)
+
+    def cell_costs(self, row_ind: np.ndarray, col_ind: np.ndarray) -> np.ndarray:
+        """Returns the costs of the given (student, role) cells."""
+        return self.type_rows[self.cost_model.student_types[row_ind], col_ind] + self.role_offsets[col_ind]
+
+    def _vetoed_edges(self, rows: np.ndarray, columns: np.ndarray, active_columns: np.ndarray):
+        """
+            Returns the vetoed edges of the given students and roles, restricted to the active roles.
+        """
+        role_genders = self.cost_model.role_gender_codes
+        excluded = self.cost_model.excluded_codes
+        edge_rows, edge_columns = [], []
+
+        for i in rows:
+            vetoed = active_columns[role_genders[active_columns] == excluded[i]]
+            edge_rows.append(np.full(len(vetoed), i))
+            edge_columns.append(vetoed)
+        for j in columns:
+            vetoed = np.flatnonzero(excluded == role_genders[j])
+            edge_rows.append(vetoed)
+            edge_columns.append(np.full(len(vetoed), j))
+
+        if not edge_rows:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(edge_rows).astype(np.intp), np.concatenate(edge_columns).astype(np.intp)
+
+    @staticmethod
+    def _exposable(graph: csr_matrix, match: np.ndarray) -> np.ndarray:
+        """
+            Returns the vertices of the row side of graph that some maximum matching leaves unmatched:
+            the unmatched ones and every vertex reachable from them along alternating paths.
+
+            Parameters:
+                - graph (csr_matrix): Biadjacency matrix from the row side to the column side.
+                - match (np.ndarray): Matched column per row (-1 if unmatched) of a maximum matching.
+        """
+        matched_row = np.full(graph.shape[1], -1, dtype=np.int64)
+        matched_rows = np.flatnonzero(match >= 0)
+        matched_row[match[matched_rows]] = matched_rows
+
+        reached = match < 0
+        frontier = np.flatnonzero(reached)
+        while len(frontier):
+            columns = np.unique(graph[frontier].indices)
+            rows = matched_row[columns]
+            rows = np.unique(rows[rows >= 0])
+            frontier = rows[~reached[rows]]
+            reached[frontier] = True
+        return np.flatnonzero(reached)
+
+    def solve(self, offsets: np.ndarray, active: np.ndarray):
+        """
+            Solves the assignment restricted to the active roles.
+
+            Parameters:
+                - offsets (np.ndarray): Cost added to every cell of each role.
+                - active (np.ndarray): Boolean mask of the roles that may be assigned.
+
+            Returns:
+                Tuple[np.ndarray, np.ndarray]: Assigned student indices and their role indices.
+        """
+        num_students, num_roles = self.shape
+        active_columns = np.flatnonzero(active)
+        if num_students == 0 or len(active_columns) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        # Restrict the allowed edges to the active roles and renumber their columns
+        column_map = np.full(num_roles, -1, dtype=np.int64)
+        column_map[active_columns] = np.arange(len(active_columns))
+        keep = active[self.indices]
+        rows = np.repeat(np.arange(num_students), np.diff(self.indptr))[keep]
+        columns = self.indices[keep].astype(np.intp)
+        costs = self.data[keep] + self.role_offsets[columns] + offsets[columns]
+
+        shape = (num_students, len(active_columns))
+        graph = csr_matrix((np.ones(len(rows)), (rows, column_map[columns])), shape=shape)
+
+        # Fall back to vetoed edges only for the side the vetoes leave unmatched, from every vertex
+        # that a maximum matching may leave unmatched (which ones a solver leaves is arbitrary)
+        if num_students <= len(active_columns):
+            match = maximum_bipartite_matching(graph, perm_type="column")
+            unmatched = np.flatnonzero(match == -1)
+            exposed_rows = self._exposable(graph, match) if len(unmatched) else unmatched
+            exposed_columns = np.empty(0, dtype=np.intp)
+        else:
+            role_graph = graph.T.tocsr()
+            match = maximum_bipartite_matching(role_graph, perm_type="column")
+            unmatched = active_columns[match == -1]
+            exposed_rows = np.empty(0, dtype=np.intp)
+            exposed_columns = active_columns[self._exposable(role_graph, match)] if len(unmatched) else unmatched
+        self.vetoed_students = len(unmatched)
+
+        # Roles priced below every cell cost must be covered, through a vetoed edge if need be
+        low, high = self.cost_bounds()
+        forced = active_columns[offsets[active_columns] < -(high - low)]
+        exposed_columns = np.union1d(exposed_columns, forced).astype(np.intp)
+        extra_rows, extra_columns = self._vetoed_edges(exposed_rows, exposed_columns, active_columns)
+        if len(extra_rows):
+            # Edges found from both sides are kept once
+            pairs = np.unique(np.stack([extra_rows, extra_columns]), axis=1)
+            extra_rows, extra_columns = pairs[0], pairs[1]
+
+        if len(extra_rows):
+            extra_costs = self.cell_costs(extra_rows, extra_columns) + offsets[extra_columns]
+            rows = np.concatenate([rows, extra_rows])
+            columns = np.concatenate([columns, extra_columns])
+            costs = np.concatenate([costs, extra_costs])
+
+        # The matching needs non-zero weights; a constant shift does not change the optimum,
+        # as every full matching has the same number of edges
+        weights = costs - costs.min(initial=0) + 1
+        graph = csr_matrix((weights, (rows, column_map[columns])), shape=shape)
+        row_ind, col_ind = min_weight_full_bipartite_matching(graph)
+        return row_ind, active_columns[col_ind]
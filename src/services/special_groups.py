@@ -0,0 +1,222 @@
+import heapq
+import itertools
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from typing import Callable, Dict, FrozenSet, Optional, Set, Tuple
+
+# Rows gathered at once into the solver buffer by restricted dense solves (in bytes of float64)
+GATHER_BYTES = 4 * 1024 * 1024
+
+
+class DenseProblem:
+    """
+        Assignment problem over a dense students x roles cost matrix, solved with linear_sum_assignment.
+
+        Problems share a small interface used by SpecialGroupSearch and RoleAssignment: the matrix
+        shape, bounds of the cell costs, the costs of given cells and a solve over a subset of
+        the roles with an additive cost offset per role.
+    """
+
+    def __init__(self, cost_matrix: np.ndarray):
+        """
+            Parameters:
+                - cost_matrix (np.ndarray): Students x roles cost matrix.
+        """
+        self.cost_matrix = cost_matrix
+        self.shape = cost_matrix.shape
+        self._buffer = None
+
+    def __getstate__(self):
+        return {"cost_matrix": self.cost_matrix, "shape": self.shape, "_buffer": None}
+
+    def cost_bounds(self) -> Tuple[float, float]:
+        """Returns the smallest and largest cell cost."""
+        return float(self.cost_matrix.min(initial=0)), float(self.cost_matrix.max(initial=0))
+
+    def cell_costs(self, row_ind: np.ndarray, col_ind: np.ndarray) -> np.ndarray:
+        """Returns the costs of the given (student, role) cells."""
+        return self.cost_matrix[row_ind, col_ind]
+
+    def solve(self, offsets: np.ndarray, active: np.ndarray):
+        """
+            Solves the assignment restricted to the active roles.
+
+            Parameters:
+                - offsets (np.ndarray): Cost added to every cell of each role.
+                - active (np.ndarray): Boolean mask of the roles that may be assigned.
+
+            Returns:
+                Tuple[np.ndarray, np.ndarray]: Assigned student indices and their role indices.
+        """
+        columns = np.flatnonzero(active)
+        num_rows = self.shape[0]
+
+        # The offset matrix is written into one float64 buffer that is reused by every solve, so
+        # linear_sum_assignment gets a contiguous float64 matrix and neither side copies it again.
+        # The active columns are gathered in row chunks, so the full column subset is never copied.
+        if self._buffer is None:
+            self._buffer = np.empty(num_rows * self.shape[1])
+        adjusted = self._buffer[:num_rows * len(columns)].reshape(num_rows, len(columns))
+        if len(columns) == self.shape[1]:
+            np.add(self.cost_matrix, offsets, out=adjusted)
+        else:
+            chunk_rows = max(1, GATHER_BYTES // (8 * max(self.shape[1], 1)))
+            column_offsets = offsets[columns]
+            for start in range(0, num_rows, chunk_rows):
+                np.add(self.cost_matrix[start:start + chunk_rows, columns], column_offsets,
+                       out=adjusted[start:start + chunk_rows])
+
+        row_ind, col_ind = linear_sum_assignment(adjusted)
+        return row_ind, columns[col_ind]
+
+
+class SpecialGroupSearch:
+    """
+        Exact branch-and-bound search over include/exclude decisions for special groups.
+
+        Every special group must either be assigned completely (included, its roles get the
+        special group bonus) or not at all (excluded, its roles are removed). A node of the
+        search fixes the decision for some groups; the remaining groups stay optional and
+        receive the bonus only if it lowers their cost, so each node's Hungarian solve is a
+        lower bound for all decisions below it. Nodes are explored best-first and solved
+        subproblems are memoized by their decisions.
+
+        Decisions that leave students without a role (because excluded groups shrink the role
+        pool below the cohort size) are only chosen if no decision assigns more students.
+    """
+
+    def __init__(self, problem, special_groups: Dict[int, Set[int]], group_bonus: float,
+                 callback: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None):
+        """
+            Initializes the search.
+
+            Parameters:
+                - problem (DenseProblem or np.ndarray): The assignment problem without special group
+                  adjustments, or its dense cost matrix.
+                - special_groups (Dict[int, Set[int]]): GroupIDs mapped to the role indices of the group.
+                - group_bonus (float): Cost added to every role of an included group.
+                - callback (Optional[Callable[[int, np.ndarray, np.ndarray], None]]): Called with the number
+                  of solved nodes and the node's row/column indices after every node; an exception raised
+                  by it aborts the search.
+        """
+        self.problem = DenseProblem(problem) if isinstance(problem, np.ndarray) else problem
+        self.special_groups = special_groups
+        self.group_bonus = group_bonus
+        self.memo = {}
+        self.nodes_solved = 0
+        self.callback = callback
+
+    def relax(self, decisions: FrozenSet[Tuple[int, bool]]):
+        """
+            Solves the subproblem for the given decisions with all other groups optional.
+
+            Parameters:
+                - decisions (FrozenSet[Tuple[int, bool]]): (GroupID, included) pairs fixed at this node.
+
+            Returns:
+                Optional[Tuple[float, float, np.ndarray, np.ndarray]]: The objective (cost plus a penalty
+                per unassigned student), the cost and the row/column indices of the optimal assignment,
+                or None if the forced groups cannot all be assigned (the solve leaves one of their roles open).
+        """
+        if decisions in self.memo:
+            return self.memo[decisions]
+
+        decided = dict(decisions)
+        num_students, num_roles = self.problem.shape
+        offsets = np.zeros(num_roles)
+        active = np.ones(num_roles, dtype=bool)
+        forced = np.zeros(num_roles, dtype=bool)
+
+        for group_id, role_indices in self.special_groups.items():
+            columns = list(role_indices)
+            if group_id not in decided:
+                offsets[columns] += min(self.group_bonus, 0)
+            elif decided[group_id]:
+                offsets[columns] += self.group_bonus
+                forced[columns] = True
+            else:
+                active[columns] = False
+
+        result = None
+        if forced.sum() <= num_students:
+            low, high = self.problem.cost_bounds()
+            low, high = low + offsets.min(initial=0), high + offsets.max(initial=0)
+            assignable = min(num_students, int(active.sum()))
+
+            # Forced roles are made cheaper than any trade-off between the other roles
+            big_m = (high - low + 1) * max(assignable, 1)
+            row_ind, col_ind = self.problem.solve(offsets - big_m * forced, active)
+            self.nodes_solved += 1
+            if self.callback is not None:
+                self.callback(self.nodes_solved, row_ind, col_ind)
+
+            # A forced role left uncovered means the included groups cannot all be assigned
+            covered = np.zeros(num_roles, dtype=bool)
+            covered[col_ind] = True
+            if not (covered | ~forced).all():
+                result = None
+            else:
+                # Every unassigned student outweighs any cost difference between assignments
+                cost = (self.problem.cell_costs(row_ind, col_ind) + offsets[col_ind]).sum()
+                unassigned = min(num_students, num_roles) - len(row_ind)
+                unassigned_penalty = 2 * (max(abs(low), abs(high)) + 1) * max(num_students, 1)
+                result = (cost + unassigned_penalty * unassigned, cost, row_ind, col_ind)
+
+        self.memo[decisions] = result
+        return result
+
+    def unresolved_groups(self, col_ind: np.ndarray, decisions: FrozenSet[Tuple[int, bool]]):
+        """
+            Returns the undecided groups whose assignment in col_ind is not a valid decision.
+
+            A partially assigned group is always unresolved. With a positive bonus a fully assigned
+            group is unresolved as well, because the relaxation priced it without the bonus.
+        """
+        decided = dict(decisions)
+        assigned_roles = set(col_ind.tolist())
+        unresolved = []
+        for group_id, role_indices in self.special_groups.items():
+            if group_id in decided:
+                continue
+            assigned_count = len(role_indices & assigned_roles)
+            if 0 < assigned_count < len(role_indices) or (self.group_bonus > 0 and assigned_count > 0):
+                unresolved.append(group_id)
+        return unresolved
+
+    def solve(self):
+        """
+            Runs the best-first branch-and-bound search.
+
+            Returns:
+                Optional[Tuple[float, np.ndarray, np.ndarray, Dict[int, bool]]]: The optimal cost, row and
+                column indices and the include decision per group, or None if no decision set is feasible.
+        """
+        counter = itertools.count()
+        root = frozenset()
+        relaxed = self.relax(root)
+        if relaxed is None:
+            return None
+
+        heap = [(relaxed[0], next(counter), root)]
+        while heap:
+            lower_bound, _, decisions = heapq.heappop(heap)
+            _, cost, row_ind, col_ind = self.relax(decisions)
+            unresolved = self.unresolved_groups(col_ind, decisions)
+
+            if not unresolved:
+                # The relaxation is all-or-nothing and every open node has a higher lower bound
+                assigned_roles = set(col_ind.tolist())
+                included = dict(decisions)
+                for group_id, role_indices in self.special_groups.items():
+                    included.setdefault(group_id, bool(role_indices & assigned_roles))
+                return cost, row_ind, col_ind, included
+
+            # Branch on the unresolved group with the most roles
+            group_id = max(unresolved, key=lambda g: len(self.special_groups[g]))
+            for include in (True, False):
+                child = decisions | {(group_id, include)}
+                child_result = self.relax(child)
+                if child_result is not None:
+                    heapq.heappush(heap, (child_result[0], next(counter), child))
+
+        return None
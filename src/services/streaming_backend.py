@@ -0,0 +1,102 @@
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+from src.services.incremental import CHUNK_BYTES, IncrementalAssignment, restricted_offsets
+
+
+class StreamingProblem:
+    """
+        Assignment problem over a cost matrix that is read row by row (e.g. a numpy.memmap on disk).
+
+        The matrix is solved with the shortest augmenting path solver (IncrementalAssignment), which
+        only reads single rows and row chunks. Offsets and inactive roles are applied per column when
+        rows are read, so the matrix itself is never modified or copied, and the solver is kept between
+        solves: a solve with other offsets only re-augments the rows of the changed columns.
+        Implements the problem interface of DenseProblem.
+    """
+
+    def __init__(self, cost_matrix: np.ndarray, role_offsets: Optional[np.ndarray] = None,
+                 interrupt: Optional[Callable[[], None]] = None):
+        """
+            Parameters:
+                - cost_matrix (np.ndarray): Students x roles cost matrix (typically a numpy.memmap).
+                - role_offsets (Optional[np.ndarray]): Cost already added to each role (e.g. special groups).
+                - interrupt (Optional[Callable[[], None]]): Called between the row augmentations of a solve;
+                  an exception it raises stops the solve (see IncrementalAssignment).
+        """
+        self.cost_matrix = cost_matrix
+        self.shape = cost_matrix.shape
+        self.role_offsets = np.zeros(self.shape[1]) if role_offsets is None else role_offsets
+        self.interrupt = interrupt
+        self.engine = None
+
+        # Column bounds of the matrix, computed in one pass over row chunks
+        self.column_min = np.zeros(self.shape[1])
+        self.column_max = np.zeros(self.shape[1])
+        if self.shape[0]:
+            self.column_min[:] = np.inf
+            self.column_max[:] = -np.inf
+            chunk_rows = max(1, CHUNK_BYTES // (8 * max(self.shape[1], 1)))
+            for start in range(0, self.shape[0], chunk_rows):
+                block = cost_matrix[start:start + chunk_rows]
+                np.minimum(self.column_min, block.min(axis=0), out=self.column_min)
+                np.maximum(self.column_max, block.max(axis=0), out=self.column_max)
+
+    def __getstate__(self):
+        # Worker processes reopen the memmap file read-only instead of receiving a pickled copy
+        state = dict(self.__dict__, engine=None, interrupt=None)
+        if isinstance(self.cost_matrix, np.memmap):
+            state["cost_matrix"] = (self.cost_matrix.filename, self.cost_matrix.dtype.str, self.shape)
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state["cost_matrix"], tuple):
+            filename, dtype, shape = state["cost_matrix"]
+            state["cost_matrix"] = np.memmap(filename, dtype=dtype, mode="r", shape=shape)
+        self.__dict__.update(state)
+
+    def cost_bounds(self) -> Tuple[float, float]:
+        """Returns the smallest and largest cell cost."""
+        return ((self.column_min + self.role_offsets).min(initial=0),
+                (self.column_max + self.role_offsets).max(initial=0))
+
+    def cell_costs(self, row_ind: np.ndarray, col_ind: np.ndarray) -> np.ndarray:
+        """Returns the costs of the given (student, role) cells."""
+        return self.cost_matrix[row_ind, col_ind] + self.role_offsets[col_ind]
+
+    def solve(self, offsets: np.ndarray, active: np.ndarray):
+        """
+            Solves the assignment restricted to the active roles.
+
+            Inactive roles are read with one constant cost above any assignment of active roles, so they
+            are only used by students that no active role is left for; those students are reported as
+            unassigned.
+
+            Parameters:
+                - offsets (np.ndarray): Cost added to every cell of each role.
+                - active (np.ndarray): Boolean mask of the roles that may be assigned.
+
+            Returns:
+                Tuple[np.ndarray, np.ndarray]: Assigned student indices and their role indices.
+        """
+        column_offsets = restricted_offsets(self.column_min, self.column_max, self.role_offsets + offsets, active,
+                                            max(self.shape))
+        inactive = ~active
+
+        try:
+            if self.engine is None:
+                self.engine = IncrementalAssignment(self.cost_matrix, column_offsets, inactive, self.interrupt)
+            else:
+                engine = self.engine
+                engine.interrupt = self.interrupt
+                changed = np.flatnonzero((engine.column_offsets != column_offsets) | (engine.ignored_columns != inactive))
+                engine.column_offsets[changed] = column_offsets[changed]
+                engine.ignored_columns[changed] = inactive[changed]
+                engine.update_columns(changed)
+        except BaseException:
+            self.engine = None  # An interrupted solver is half-updated; the next solve starts cold
+            raise
+
+        row_ind, col_ind = self.engine.solution()
+        keep = active[col_ind]
+        return row_ind[keep], col_ind[keep]
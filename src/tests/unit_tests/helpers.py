@@ -0,0 +1,10 @@
+# Shared helpers of the unit tests (not a test module itself)
+
+from src.services.role_assignment import RoleAssignment
+
+
+def solve(db, students, **options):
+    """Runs a full assignment and returns the solver."""
+    assignment = RoleAssignment(db, students, **options)
+    assignment.solve()
+    return assignment
@@ -0,0 +1,94 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_alternatives
+
+import itertools
+import unittest
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.alternatives import MurtyEnumerator
+from src.services.role_assignment import RoleAssignment
+
+
+def all_assignment_costs(cost_matrix):
+    """Returns the sorted costs of every maximal assignment of the matrix."""
+    num_rows, num_cols = cost_matrix.shape
+    if num_rows <= num_cols:
+        costs = [cost_matrix[range(num_rows), columns].sum()
+                 for columns in itertools.permutations(range(num_cols), num_rows)]
+    else:
+        costs = [cost_matrix[rows, range(num_cols)].sum()
+                 for rows in itertools.permutations(range(num_rows), num_cols)]
+    return sorted(costs)
+
+
+class TestMurtyEnumerator(unittest.TestCase):
+    """
+    Unit tests for the k-best assignment enumeration.
+    """
+
+    def test_matches_brute_force(self):
+        """
+        Test that the k best costs match full enumeration, also for more rows than columns and integer costs.
+        """
+        rng = np.random.default_rng(8)
+        for shape in [(4, 4), (3, 5), (5, 3), (4, 6)]:
+            for dtype in (float, np.int16, float, np.int16, float):
+                cost_matrix = rng.integers(-5, 20, size=shape).astype(dtype)
+                expected = all_assignment_costs(cost_matrix)
+                k = min(15, len(expected))
+                results = MurtyEnumerator(cost_matrix).enumerate(k)
+
+                self.assertEqual(len(results), k)
+                np.testing.assert_allclose([cost for cost, _, _ in results], expected[:k])
+                assignments = {tuple(zip(rows.tolist(), columns.tolist())) for _, rows, columns in results}
+                self.assertEqual(len(assignments), k)
+                for cost, rows, columns in results:
+                    self.assertAlmostEqual(cost, cost_matrix[rows, columns].sum())
+
+    def test_parallel_matches_sequential(self):
+        """
+        Test that solving the subproblems in worker processes gives the same enumeration.
+        """
+        cost_matrix = np.random.default_rng(2).integers(0, 30, size=(8, 10)).astype(float)
+        sequential = MurtyEnumerator(cost_matrix).enumerate(12)
+        parallel = MurtyEnumerator(cost_matrix).enumerate(12, max_workers=2)
+        np.testing.assert_allclose([cost for cost, _, _ in sequential], [cost for cost, _, _ in parallel])
+
+    def test_time_budget(self):
+        """
+        Test that a zero time budget still returns the optimal assignment.
+        """
+        cost_matrix = np.random.default_rng(4).integers(0, 30, size=(30, 30)).astype(float)
+        results = MurtyEnumerator(cost_matrix).enumerate(100, time_budget=0)
+        self.assertEqual(len(results), 1)
+        row_ind, col_ind = linear_sum_assignment(cost_matrix)
+        self.assertAlmostEqual(results[0][0], cost_matrix[row_ind, col_ind].sum())
+
+    def test_role_assignment_alternatives(self):
+        """
+        Test that the alternatives start with the solved optimum and respect special groups.
+        """
+        db = SyntheticDatabase(synthetic_roles(12, seed=6), {1: [1, 2, 3], 2: [5, 6]})
+        assignment = RoleAssignment(db, synthetic_students(8, seed=6), special_group_strategy="exact")
+        assignment.solve()
+        alternatives = assignment.alternatives(5)
+
+        self.assertEqual(len(alternatives), 5)
+        self.assertAlmostEqual(alternatives[0].min_cost, assignment.min_cost)
+        costs = [result.min_cost for result in alternatives]
+        self.assertEqual(costs, sorted(costs))
+        for result in alternatives:
+            assigned = set(result.col_ind.tolist())
+            for role_indices in assignment.special_groups.values():
+                self.assertIn(len(role_indices & assigned), (0, len(role_indices)))
+
+        sparse = RoleAssignment(db, synthetic_students(8, seed=6), backend="sparse")
+        with self.assertRaises(ValueError):
+            sparse.alternatives(5)
+        self.assertIsNone(sparse._cost_matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_anytime
+
+import time
+import unittest
+
+import numpy as np
+
+from src.benchmarks.bench_pipeline import special_groups
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.anytime import AnytimeSearch
+from src.services.role_assignment import RoleAssignment
+from src.tests.unit_tests.test_special_groups import brute_force
+
+
+def is_valid(col_ind, special_groups):
+    """Whether every special group is assigned completely or not at all."""
+    assigned = set(col_ind.tolist())
+    return all(len(roles & assigned) in (0, len(roles)) for roles in special_groups.values())
+
+
+class TestAnytime(unittest.TestCase):
+    """
+    Unit tests for solving with a time budget (greedy start, repair, lower bound and gap).
+    """
+
+    def setUp(self):
+        self.db = SyntheticDatabase(synthetic_roles(60, seed=4), {1: [1, 2, 3, 4], 2: [5, 6, 7, 8], 3: [9, 10, 11]})
+        self.students = synthetic_students(60, seed=4)
+        self.optimum = RoleAssignment(self.db, self.students, special_group_strategy="exact").solve().min_cost
+
+    def test_zero_budget(self):
+        """
+        Test that an exhausted budget still returns a valid, complete assignment bracketed by the bound.
+        """
+        for strategy in ("random", "exact", "multistart"):
+            with self.subTest(strategy=strategy):
+                assignment = RoleAssignment(self.db, self.students, special_group_strategy=strategy, seed=1)
+                result = assignment.solve(time_budget=0)
+                anytime = assignment.anytime
+
+                self.assertEqual(len(result), 60)
+                self.assertTrue(is_valid(result.col_ind, assignment.special_groups))
+                self.assertEqual(result.min_cost, anytime.best_cost)
+                self.assertLessEqual(anytime.lower_bound, self.optimum)
+                self.assertGreaterEqual(anytime.best_cost, self.optimum)
+                self.assertAlmostEqual(anytime.gap, (anytime.best_cost - anytime.lower_bound) / anytime.best_cost)
+                self.assertIsNone(assignment.tracer.records[-1].iterations)
+
+    def test_generous_budget(self):
+        """
+        Test that a run that finishes reports the optimum, proven by the exact strategy.
+        """
+        assignment = RoleAssignment(self.db, self.students, special_group_strategy="exact")
+        result = assignment.solve(time_budget=60)
+        self.assertEqual(result.min_cost, self.optimum)
+        self.assertEqual(assignment.anytime.gap, 0)
+        self.assertGreater(assignment.tracer.records[-1].iterations, 0)
+
+        # The randomized strategy keeps the best of its runs and the repaired relaxation
+        assignment = RoleAssignment(self.db, self.students, seed=1)
+        result = assignment.solve(time_budget=60)
+        self.assertTrue(is_valid(result.col_ind, assignment.special_groups))
+        self.assertGreaterEqual(result.min_cost, self.optimum)
+        self.assertLessEqual(assignment.anytime.lower_bound, self.optimum)
+        self.assertEqual([cost for _, cost, _ in assignment.anytime.history],
+                         sorted([cost for _, cost, _ in assignment.anytime.history], reverse=True))
+
+    def test_wall_time(self):
+        """
+        Test that the budget bounds the wall time of runs whose solver runs take longer than the budget.
+        """
+        db = SyntheticDatabase(synthetic_roles(1200, seed=2), special_groups("many", 1200))
+        students = synthetic_students(1000, seed=2)
+        for backend, strategy in (("dense", "exact"), ("dense", "random"), ("dense", "multistart"),
+                                  ("streaming", "exact")):
+            with self.subTest(backend=backend, strategy=strategy):
+                assignment = RoleAssignment(db, students, special_group_strategy=strategy, seed=1, backend=backend)
+                start = time.perf_counter()
+                result = assignment.solve(time_budget=0.1)
+                elapsed = time.perf_counter() - start
+
+                self.assertLess(elapsed, 0.1 + 0.2)
+                self.assertEqual(len(result), 1000)
+                self.assertTrue(is_valid(result.col_ind, assignment.special_groups))
+                self.assertEqual(result.min_cost, assignment.anytime.best_cost)
+
+    def test_bounds_small(self):
+        """
+        Test the lower bounds and the repaired candidates against brute force on small random problems.
+        """
+        rng = np.random.default_rng(3)
+        for _ in range(20):
+            num_students, num_roles = rng.integers(2, 6), 6
+            type_rows = rng.integers(-5, 30, size=(3, num_roles)).astype(float)
+            student_types = np.arange(num_students) % 3
+            special_groups = {1: {0, 1}, 2: {2, 3, 4}}
+            bonus = float(rng.choice([-3, 2]))
+            optimum = brute_force(type_rows[student_types], special_groups, bonus)
+
+            search = AnytimeSearch(type_rows, student_types, special_groups, bonus, time_budget=60)
+            self.assertLessEqual(search.minimum_bound(), optimum)
+
+            # A partially assigned group is dropped or completed
+            row_ind, col_ind = np.arange(num_students), rng.permutation(num_roles)[:num_students]
+            search.offer(row_ind, col_ind)
+            self.assertTrue(is_valid(search.col_ind, special_groups))
+            self.assertGreaterEqual(search.best_cost, optimum)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_batch
+
+import csv
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles
+from src.data.survey_loader import load_students
+from src.services.batch import CatalogSnapshot, expand_paths, result_paths, solve_files
+from src.services.profiling import summary_path
+from src.services.role_assignment import RoleAssignment
+
+SURVEY_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data", "survey_data")
+
+
+class TestBatch(unittest.TestCase):
+    """
+    Unit tests for solving many survey files in worker processes.
+    """
+
+    def setUp(self):
+        self.files = sorted(glob.glob(os.path.join(SURVEY_DIR, "test_data_*.csv")))[:4]
+        db = SyntheticDatabase(synthetic_roles(60, seed=1), {1: [1, 2, 3], 2: [10, 11]})
+        self.catalog = CatalogSnapshot.from_database(db)
+        self.output_dir = tempfile.mkdtemp()
+
+    def test_load_students(self):
+        """
+        Test that every survey row becomes a student and missing vetoes are stored as "Kein".
+        """
+        students = load_students(self.files[0])
+        with open(self.files[0], encoding="utf-8") as file:
+            rows = list(csv.reader(file))[1:]
+
+        self.assertEqual(len(students), len(rows))
+        for student, row in zip(students, rows):
+            self.assertEqual(student.first_name, row[5])
+            self.assertEqual(student.excluded_gender, row[8] or "Kein")
+
+    def test_parallel_matches_sequential(self):
+        """
+        Test that the process pool produces the same results and summary as single solves.
+        """
+        rows = solve_files(self.files, self.catalog, self.output_dir, max_workers=2,
+                           special_group_strategy="exact")
+
+        self.assertEqual([row["Datei"] for row in rows], self.files)
+        for file_path, row in zip(self.files, rows):
+            solver = RoleAssignment(self.catalog, load_students(file_path), special_group_strategy="exact")
+            solver.solve()
+
+            self.assertEqual(row["Fehler"], "")
+            self.assertAlmostEqual(row["Gesamtkosten"], solver.min_cost)
+            self.assertEqual(row["Zugewiesen"], len(solver.solution))
+            with open(row["Ergebnisdatei"], encoding="utf-8") as file:
+                self.assertEqual(len(list(csv.reader(file))) - 1, len(solver.students))
+            self.assertTrue(os.path.exists(summary_path(row["Ergebnisdatei"])))
+
+        with open(os.path.join(self.output_dir, "summary.csv"), encoding="utf-8") as file:
+            self.assertEqual(len(list(csv.DictReader(file))), len(self.files))
+
+    def test_errors_are_reported_per_file(self):
+        """
+        Test that a broken file is reported in the summary without stopping the batch.
+        """
+        broken = os.path.join(self.output_dir, "broken.csv")
+        with open(broken, "w", encoding="utf-8") as file:
+            file.write("Nachname,Vorname\nA,B\n")
+
+        rows = solve_files([broken, self.files[0]], self.catalog, self.output_dir, max_workers=1, profile=True)
+        self.assertIn("Fehlende Spalten", rows[0]["Fehler"])
+        self.assertEqual(rows[1]["Fehler"], "")
+        self.assertTrue(os.path.exists(os.path.splitext(rows[1]["Ergebnisdatei"])[0] + ".pstats"))
+
+    def test_duplicate_file_names(self):
+        """
+        Test that inputs with the same file name get separate results files, also with multistart walks
+        inside the workers.
+        """
+        input_dir = tempfile.mkdtemp()
+        file_paths = [os.path.join(input_dir, name, "kurs.csv") for name in ("a", "b")]
+        for source, path in zip(self.files, file_paths):
+            os.makedirs(os.path.dirname(path))
+            shutil.copy(source, path)
+
+        rows = solve_files(file_paths, self.catalog, self.output_dir, max_workers=2,
+                           special_group_strategy="multistart", seed=3)
+        self.assertEqual([os.path.basename(row["Ergebnisdatei"]) for row in rows],
+                         ["a_kurs_ergebnis.csv", "b_kurs_ergebnis.csv"])
+        for file_path, row in zip(file_paths, rows):
+            solver = RoleAssignment(self.catalog, load_students(file_path), special_group_strategy="multistart", seed=3)
+            solver.solve()
+
+            self.assertEqual(row["Fehler"], "")
+            self.assertAlmostEqual(row["Gesamtkosten"], solver.min_cost)
+            with open(row["Ergebnisdatei"], encoding="utf-8") as file:
+                self.assertEqual(len(list(csv.reader(file))) - 1, len(solver.students))
+
+        self.assertEqual(result_paths(["kurs.csv", "a/kurs.csv", "a_kurs.csv", "x/a/kurs.csv"], "out"),
+                         [os.path.join("out", name) for name in ["kurs_ergebnis.csv", "a_kurs_2_ergebnis.csv",
+                                                                  "a_kurs_3_ergebnis.csv", "x_a_kurs_ergebnis.csv"]])
+
+    def test_expand_paths(self):
+        """
+        Test that directories and glob patterns are expanded to CSV files.
+        """
+        self.assertEqual(expand_paths([SURVEY_DIR]), sorted(glob.glob(os.path.join(SURVEY_DIR, "*.csv"))))
+        self.assertEqual(expand_paths(self.files[:2] + [self.files[0]]), self.files[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_bench_pipeline
+
+import copy
+import unittest
+
+from src.benchmarks.bench_pipeline import Scenario, compare, run_suite, special_groups
+
+
+class TestBenchPipeline(unittest.TestCase):
+    """
+    Unit tests for the pipeline benchmark and its baseline comparison.
+    """
+
+    def setUp(self):
+        self.results = run_suite([Scenario(20, 30, "small"), Scenario(40, 70, "many")], repeat=1)
+
+    def test_reproducible_results(self):
+        """
+        Test that the seeded scenarios reproduce their results and time every stage.
+        """
+        again = run_suite([Scenario(20, 30, "small"), Scenario(40, 70, "many")], repeat=1)
+
+        self.assertEqual(compare(again, self.results, threshold=float("inf")), [])
+        for result in self.results.values():
+            self.assertTrue({"load_students", "cost_matrix", "solve", "write_csv"} <= set(result["stages"]))
+            self.assertGreaterEqual(result["seconds"], result["stages"]["solve"])
+
+    def test_regressions(self):
+        """
+        Test that slowdowns above threshold and noise floor, and changed results, are reported.
+        """
+        slower = copy.deepcopy(self.results)
+        slower["20_veto30_small"]["stages"]["solve"] += 1.0
+        slower["40_veto70_many"]["min_cost"] += 1
+
+        regressions = compare(slower, self.results, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("20_veto30_small [solve]"))
+        self.assertTrue(regressions[1].startswith("40_veto70_many: Ergebnis geändert"))
+        self.assertEqual(compare(slower, self.results, threshold=0.2, min_delta=2.0)[1:], [])
+
+    def test_special_groups(self):
+        """
+        Test that the group configurations use distinct existing roles.
+        """
+        for num_roles in (5, 10, 100):
+            groups = special_groups("many", num_roles)
+            role_ids = [role_id for roles in groups.values() for role_id in roles]
+            self.assertEqual(len(role_ids), len(set(role_ids)))
+            self.assertTrue(all(1 <= role_id <= num_roles for role_id in role_ids))
+        self.assertEqual(special_groups("none", 10), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
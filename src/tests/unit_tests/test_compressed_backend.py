@@ -0,0 +1,94 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_compressed_backend
+
+import time
+import unittest
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.compressed_backend import CompressedProblem, transportation_flow
+from src.services.cost_model import CostModel
+from src.tests.unit_tests.helpers import solve
+
+# Default weights of RoleAssignment.cost_weights()
+WEIGHTS = {"essential": 5, "next": 15, "rest": 20, "last": 25, "matched_gender": -4, "unisex": -2,
+           "exclusion": 1000}
+
+
+class TestCompressedBackend(unittest.TestCase):
+    """
+    Unit tests for the type-compressed min-cost flow backend.
+    """
+
+    def test_transportation_matches_expanded_assignment(self):
+        """
+        Test the flow cost against linear_sum_assignment on the expanded matrix.
+        """
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            supply = rng.integers(0, 5, rng.integers(1, 5))
+            demand = rng.integers(0, 5, rng.integers(1, 6))
+            costs = rng.integers(-10, 10, (len(supply), len(demand))).astype(float)
+
+            flow = transportation_flow(supply, demand, costs)
+            expanded = costs[np.repeat(np.arange(len(supply)), supply)][:, np.repeat(np.arange(len(demand)), demand)]
+            row_ind, col_ind = linear_sum_assignment(expanded)
+
+            self.assertEqual(flow.sum(), min(supply.sum(), demand.sum()))
+            self.assertTrue((flow.sum(axis=1) <= supply).all() and (flow.sum(axis=0) <= demand).all())
+            self.assertAlmostEqual((flow * costs).sum(), expanded[row_ind, col_ind].sum())
+
+    def test_matches_dense_backend(self):
+        """
+        Test that the compressed and dense backends find assignments of equal cost.
+        """
+        for size, num_roles in [(20, 30), (40, 25), (30, 30)]:
+            db = SyntheticDatabase(synthetic_roles(num_roles, seed=size), {1: [0, 1, 2], 2: [5, 6]})
+            students = synthetic_students(size, seed=size)
+            for strategy in ("random", "exact"):
+                dense = solve(db, students, special_group_strategy=strategy, seed=size)
+                compressed = solve(db, students, special_group_strategy=strategy, backend="compressed",
+                                   seed=size)
+
+                self.assertAlmostEqual(dense.min_cost, compressed.min_cost)
+                self.assertEqual(len(dense.solution), len(compressed.solution))
+                self.assertIsNone(compressed._cost_matrix)
+
+    def test_stable_expansion(self):
+        """
+        Test that students of one type receive the roles of one bucket in index order.
+        """
+        roles = synthetic_roles(30, seed=1)
+        students = synthetic_students(30, veto_percentage=0, seed=1)
+        model = CostModel(students, roles)
+        problem = CompressedProblem(model, model.type_cost_rows(WEIGHTS))
+
+        row_ind, col_ind = problem.solve(np.zeros(len(roles)), np.ones(len(roles), dtype=bool))
+        self.assertTrue((np.diff(row_ind) > 0).all())
+        self.assertEqual(sorted(col_ind.tolist()), list(range(30)))
+        for student_type in range(len(model.type_codes)):
+            typed = model.student_types[row_ind] == student_type
+            for bucket in np.unique(problem.type_rows[:, col_ind[typed]], axis=1).T:
+                same = typed & (problem.type_rows[:, col_ind] == bucket[:, np.newaxis]).all(axis=0)
+                self.assertTrue((np.diff(col_ind[same]) > 0).all())
+
+    def test_large_cohort(self):
+        """
+        Test that 100,000 students are assigned without building the dense matrix.
+        """
+        roles = synthetic_roles(100000, seed=3)
+        students = synthetic_students(100000, seed=3)
+        model = CostModel(students, roles)
+        problem = CompressedProblem(model, model.type_cost_rows(WEIGHTS))
+
+        start = time.perf_counter()
+        row_ind, col_ind = problem.solve(np.zeros(len(roles)), np.ones(len(roles), dtype=bool))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(np.unique(col_ind)), 100000)
+        self.assertLess(elapsed, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
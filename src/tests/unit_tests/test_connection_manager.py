@@ -0,0 +1,148 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_connection_manager
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from src.data.connection_manager import ConnectionManager
+
+
+class TestConnectionManager(unittest.TestCase):
+    """
+    Unit tests for the pooled readers and serialized writers of the connection manager.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.manager = ConnectionManager(os.path.join(self.directory.name, "test.db"), max_readers=2, timeout=2)
+        with self.manager.write() as connection:
+            connection.execute("CREATE TABLE Counter (ID INTEGER PRIMARY KEY, Value INTEGER)")
+            connection.execute("INSERT INTO Counter VALUES (1, 0)")
+
+    def tearDown(self):
+        self.manager.close()
+        self.directory.cleanup()
+
+    def value(self):
+        with self.manager.read() as connection:
+            return connection.execute("SELECT Value FROM Counter WHERE ID = 1").fetchone()[0]
+
+    def test_concurrent_readers(self):
+        """
+        Test that threads read concurrently and reuse the pooled connections.
+        """
+        barrier = threading.Barrier(2, timeout=2)
+        values, errors = [], []
+
+        def read():
+            try:
+                with self.manager.read() as connection:
+                    barrier.wait()  # Both readers hold a connection at the same time
+                    values.append(connection.execute("SELECT Value FROM Counter").fetchone()[0])
+            except Exception as e:
+                errors.append(e)
+
+        for _ in range(3):
+            threads = [threading.Thread(target=read) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            barrier.reset()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(values, [0] * 6)
+        self.assertEqual(len(self.manager._readers), 2)
+
+    def test_nested_read(self):
+        """
+        Test that a nested read block reuses the connection of the thread.
+        """
+        with self.manager.read() as outer:
+            with self.manager.read() as inner:
+                self.assertIs(inner, outer)
+
+    def test_pool_bound(self):
+        """
+        Test that a reader waits for a free connection and gives up after the timeout.
+        """
+        self.manager.timeout = 0.1
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with self.manager.read():
+                held.set()
+                release.wait(2)
+
+        threads = [threading.Thread(target=hold) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        held.wait(2)
+        try:
+            while len(self.manager._readers) < 2:
+                time.sleep(0.01)
+            with self.assertRaises(sqlite3.OperationalError):
+                with self.manager.read():
+                    pass
+        finally:
+            release.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(self.value(), 0)
+
+    def test_serialized_writers(self):
+        """
+        Test that concurrent read-modify-write transactions do not lose updates.
+        """
+        def increment():
+            for _ in range(25):
+                with self.manager.write() as connection:
+                    value = connection.execute("SELECT Value FROM Counter").fetchone()[0]
+                    connection.execute("UPDATE Counter SET Value = ?", (value + 1,))
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.value(), 100)
+
+    def test_readers_see_committed(self):
+        """
+        Test that readers only see committed writes, also while a write transaction is open.
+        """
+        with self.manager.write() as connection:
+            connection.execute("UPDATE Counter SET Value = 5")
+            self.assertEqual(self.value(), 0)
+        self.assertEqual(self.value(), 5)
+
+    def test_rollback(self):
+        """
+        Test that a failing write block is rolled back and nested blocks join the outer transaction.
+        """
+        with self.assertRaises(ValueError):
+            with self.manager.write() as connection:
+                connection.execute("UPDATE Counter SET Value = 7")
+                with self.manager.write() as inner:
+                    self.assertIs(inner, connection)
+                    inner.execute("INSERT INTO Counter VALUES (2, 1)")
+                raise ValueError()
+        self.assertEqual(self.value(), 0)
+        with self.manager.read() as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM Counter").fetchone()[0], 1)
+
+    def test_read_only(self):
+        """
+        Test that pooled connections cannot write.
+        """
+        with self.manager.read() as connection:
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("UPDATE Counter SET Value = 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
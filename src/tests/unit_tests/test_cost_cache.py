@@ -0,0 +1,86 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_cost_cache
+
+import unittest
+
+import numpy as np
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.cost_cache import CostRowCache, cost_row_cache, invalidate_catalog
+from src.services.cost_model import CostModel
+from src.services.role_assignment import RoleAssignment
+
+
+class VersionedDatabase(SyntheticDatabase):
+    """SyntheticDatabase with a catalog version like Database."""
+
+    def __init__(self, roles):
+        super().__init__(roles)
+        self.catalog_version = 1
+
+    def invalidate_catalog(self):
+        self.catalog_version += 1
+
+
+class TestCostRowCache(unittest.TestCase):
+    """
+    Unit tests for the per-type cost row cache.
+    """
+
+    def setUp(self):
+        cost_row_cache.invalidate()
+        cost_row_cache.hits = cost_row_cache.misses = 0
+        self.db = VersionedDatabase(synthetic_roles(40, seed=5))
+
+    def test_reuses_rows_for_unchanged_catalog(self):
+        """
+        Test that a second cohort on the same catalog gathers its rows from the cache.
+        """
+        first = RoleAssignment(self.db, synthetic_students(30, seed=1))
+        expected = first.construct_cost_matrix()
+        misses = cost_row_cache.misses
+
+        second = RoleAssignment(self.db, synthetic_students(30, seed=1))
+        self.assertTrue(np.array_equal(second.construct_cost_matrix(), expected))
+        self.assertEqual(cost_row_cache.misses, misses)
+        self.assertGreater(cost_row_cache.hits, 0)
+
+        uncached = CostModel(second.students, second.roles).build(second.cost_weights())
+        self.assertTrue(np.array_equal(expected, uncached))
+
+    def test_invalidation_and_weights(self):
+        """
+        Test that an edited catalog or changed weights do not reuse rows.
+        """
+        students = synthetic_students(30, seed=2)
+        RoleAssignment(self.db, students).construct_cost_matrix()
+        misses = cost_row_cache.misses
+
+        invalidate_catalog(self.db)
+        RoleAssignment(self.db, students).construct_cost_matrix()
+        self.assertEqual(cost_row_cache.misses, 2 * misses)
+
+        assignment = RoleAssignment(self.db, students)
+        assignment.cost_for_essential = 50
+        matrix = assignment.construct_cost_matrix()
+        self.assertEqual(cost_row_cache.misses, 3 * misses)
+        self.assertTrue(np.array_equal(matrix, CostModel(students, assignment.roles).build(assignment.cost_weights())))
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used rows are evicted at the memory cap.
+        """
+        cache = CostRowCache(max_bytes=2 * 8 * 10)
+        compute = lambda codes: np.repeat(codes[:, :1].astype(float), 10, axis=1)
+        codes = np.array([[0, -1], [1, -1], [2, -1]])
+
+        cache.gather("catalog", {}, codes[:2], compute)
+        cache.gather("catalog", {}, codes[:1], compute)
+        rows = cache.gather("catalog", {}, codes[2:], compute)
+
+        self.assertTrue(np.array_equal(rows, np.full((1, 10), 2.0)))
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+        self.assertEqual([key[2] for key in cache.rows], [(0, -1), (2, -1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_cost_matrix
+
+import random
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.data.database import Database
+from src.models.role import Role
+from src.models.student import Student
+from src.services.role_assignment import RoleAssignment
+
+
+def loop_cost_matrix(assignment):
+    """Reference implementation: the original per-cell double loop."""
+    cost_matrix = np.zeros((len(assignment.students), len(assignment.roles)))
+
+    for i, role in enumerate(assignment.roles):
+        if role.hierarchy == 'Essential':
+            cost_matrix[:, i] += assignment.cost_for_essential
+        elif role.hierarchy == 'Next':
+            cost_matrix[:, i] += assignment.cost_for_next
+        elif role.hierarchy == 'Rest':
+            cost_matrix[:, i] += assignment.cost_for_rest
+        elif role.hierarchy == 'Last':
+            cost_matrix[:, i] += assignment.cost_for_last
+
+    for i, student in enumerate(assignment.students):
+        for j, role in enumerate(assignment.roles):
+            if student.is_excluded_from(role.gender):
+                cost_matrix[i, j] += assignment.penalty_cost_for_exclusion
+            if student.preferred_gender == role.gender:
+                cost_matrix[i, j] += assignment.cost_for_matched_gender
+            if role.gender == "Unisex":
+                cost_matrix[i, j] += assignment.cost_for_unisex
+
+    return cost_matrix
+
+
+def mock_database(roles):
+    """Creates a Database mock that serves the given roles and no special groups."""
+    db = MagicMock(spec=Database)
+    db.load_roles_for_just8b.return_value = roles
+    db.fetch_all_roles.return_value = roles
+    db.fetch_special_group_roles.return_value = {}
+    return db
+
+
+class TestCostMatrix(unittest.TestCase):
+    """
+    Verifies that the vectorized cost matrix equals the original per-cell construction.
+    """
+
+    def setUp(self):
+        """
+        Set up roles covering every gender/hierarchy (including invalid values) and random students.
+        """
+        rng = random.Random(7)
+        genders = ["Männlich", "Weiblich", "Divers", "Unisex", "männlich"]
+        hierarchies = ["Essential", "Next", "Rest", "Last", "E"]
+        self.roles = [
+            Role(i, f"Vorname{i}", f"Nachname{i}", "Klasse 8b", rng.choice(genders), rng.choice(hierarchies),
+                 None, None, 0)
+            for i in range(40)
+        ]
+        student_genders = ["Männlich", "Weiblich", "Divers", "Unisex", "weiblich"]
+        self.students = [
+            Student(f"S{i}", "Test", rng.choice(student_genders),
+                    rng.choice([None, "Kein"] + student_genders))
+            for i in range(60)
+        ]
+
+    def test_matches_reference_loop(self):
+        """
+        Test that the vectorized matrix is identical to the per-cell loop.
+        """
+        assignment = RoleAssignment(mock_database(self.roles), self.students)
+        np.testing.assert_array_equal(assignment.cost_matrix, loop_cost_matrix(assignment))
+
+    def test_matches_reference_loop_with_custom_weights(self):
+        """
+        Test that changed cost definitions are picked up by the vectorized construction.
+        """
+        assignment = RoleAssignment(mock_database(self.roles), self.students)
+        assignment.cost_for_next = 11
+        assignment.cost_for_matched_gender = -7
+        assignment.penalty_cost_for_exclusion = 500
+        np.testing.assert_array_equal(assignment.construct_cost_matrix(), loop_cost_matrix(assignment))
+
+    def test_compact_dtype(self):
+        """
+        Test that integer weights give an int16 matrix, fractional or huge weights a wider type,
+        and that the solve result does not depend on the dtype.
+        """
+        assignment = RoleAssignment(mock_database(self.roles), self.students)
+        self.assertEqual(assignment.cost_matrix.dtype, np.int16)
+
+        fractional = RoleAssignment(mock_database(self.roles), self.students)
+        fractional.cost_for_unisex = -1.5
+        self.assertEqual(fractional.construct_cost_matrix().dtype, np.float64)
+        np.testing.assert_array_equal(fractional.construct_cost_matrix(), loop_cost_matrix(fractional))
+
+        huge = RoleAssignment(mock_database(self.roles), self.students)
+        huge.penalty_cost_for_exclusion = 100000
+        self.assertEqual(huge.construct_cost_matrix().dtype, np.int32)
+
+        wide = RoleAssignment(mock_database(self.roles), self.students, dtype=np.float64)
+        self.assertEqual(wide.cost_matrix.dtype, np.float64)
+        self.assertEqual(wide.solve().min_cost, assignment.solve().min_cost)
+
+    def test_empty_student_list(self):
+        """
+        Test that an empty cohort yields an empty matrix with one column per role.
+        """
+        assignment = RoleAssignment(mock_database(self.roles), [])
+        self.assertEqual(assignment.cost_matrix.shape, (0, len(self.roles)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_feasibility
+
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_bipartite_matching
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.models.role import Role
+from src.models.student import Student
+from src.services.cost_model import CostModel
+from src.services.feasibility import check_feasibility
+from src.services.role_assignment import RoleAssignment
+
+WEIGHTS = {"essential": 5, "next": 15, "rest": 20, "last": 25, "matched_gender": -4, "unisex": -2,
+           "exclusion": 1000}
+
+
+class TestFeasibility(unittest.TestCase):
+    """
+    Unit tests for the veto feasibility pre-check.
+    """
+
+    def test_matches_hopcroft_karp(self):
+        """
+        Test the counted maximum matching against Hopcroft-Karp on the allowed-edge graph.
+        """
+        rng = np.random.default_rng(0)
+        for seed in range(40):
+            num_students, num_roles = rng.integers(1, 40, 2)
+            model = CostModel(synthetic_students(num_students, veto_percentage=int(rng.integers(0, 101)), seed=seed),
+                              synthetic_roles(num_roles, seed=seed))
+            indptr, indices, _ = model.allowed_edges(model.type_cost_rows(WEIGHTS))
+            graph = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(num_students, num_roles))
+            matched = (maximum_bipartite_matching(graph, perm_type="column") >= 0).sum()
+
+            report = check_feasibility(model)
+            self.assertEqual(report.max_assigned, matched)
+            self.assertEqual(report.feasible, matched == num_students)
+            for violation in report.violations:
+                self.assertEqual(len(violation.students) - len(violation.roles), violation.deficiency)
+                self.assertMinimalViolation(graph, model.excluded_codes, violation.minimal_students)
+                if violation.veto is not None:
+                    self.assertTrue(set(graph[violation.minimal_students].indices) <= set(violation.roles))
+
+    def assertMinimalViolation(self, graph, excluded, students):
+        """
+        Asserts that the students have fewer allowed roles than students, and that no proper subset does:
+        neither the subsets without one student nor the students sharing one veto (only a subset within
+        one veto can have fewer allowed roles than the whole set).
+        """
+        def violates(subset):
+            return len(np.unique(graph[subset].indices)) < len(subset)
+
+        self.assertTrue(violates(students))
+        for i in range(len(students)):
+            self.assertFalse(violates(np.delete(students, i)))
+        for code in np.unique(excluded[students]):
+            subset = students[excluded[students] == code]
+            if len(subset) < len(students):
+                self.assertFalse(violates(subset))
+
+    def test_minimal_cohort_violation(self):
+        """
+        Test that the minimal subset of a too large cohort does not contain a smaller violating veto group.
+        """
+        roles = [Role(i, f"V{i}", f"N{i}", "Klasse 8b", gender, "Essential", "yes", None, 0)
+                 for i, gender in enumerate(["Männlich", "Männlich", "Weiblich"], start=1)]
+        students = ([Student(f"V{i}", f"N{i}", "Weiblich", "Männlich") for i in range(3)]
+                    + [Student(f"V{i}", f"N{i}", "Divers", None) for i in range(3, 5)])
+        report = check_feasibility(CostModel(students, roles))
+
+        cohort = next(violation for violation in report.violations if violation.veto is None)
+        self.assertEqual(cohort.minimal_students.tolist(), [0, 1])
+
+        students.append(Student("V5", "N5", "Divers", "Weiblich"))
+        report = check_feasibility(CostModel(students, roles))
+        cohort = next(violation for violation in report.violations if violation.veto is None)
+        self.assertEqual(cohort.minimal_students.tolist(), [0, 3, 4, 5])
+
+    def test_short_gender_bucket(self):
+        """
+        Test that a veto shared by more students than roles of the other genders is reported.
+        """
+        roles = [Role(i, f"V{i}", f"N{i}", "Klasse 8b", gender, "Essential", "yes", None, 0)
+                 for i, gender in enumerate(["Weiblich"] * 3 + ["Männlich"], start=1)]
+        students = [Student(f"V{i}", f"N{i}", "Männlich", "Weiblich") for i in range(3)]
+        assignment = RoleAssignment(SyntheticDatabase(roles), students + [Student("V", "N", "Weiblich", None)])
+        assignment.solve()
+
+        report = assignment.feasibility
+        self.assertFalse(report.feasible)
+        self.assertEqual(report.max_assigned, 2)
+        self.assertEqual(report.violations[0].veto, "Weiblich")
+        self.assertEqual(report.violations[0].students.tolist(), [0, 1, 2])
+        self.assertEqual(report.violations[0].roles.tolist(), [3])
+        self.assertEqual(len(assignment.high_cost_assignments), 2)
+        self.assertIn("Veto 'Weiblich'", report.messages()[0])
+
+    def test_feasible_cohort(self):
+        """
+        Test that a cohort without vetoes and enough roles is feasible.
+        """
+        model = CostModel(synthetic_students(30, veto_percentage=0), synthetic_roles(30))
+        report = check_feasibility(model)
+        self.assertTrue(report.feasible)
+        self.assertEqual((report.max_assigned, report.violations), (30, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_incremental
+
+import unittest
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.services.incremental import IncrementalAssignment
+
+
+class TestIncrementalAssignment(unittest.TestCase):
+    """
+    Compares the incremental solver against scipy's linear_sum_assignment after every edit.
+    """
+
+    def assertOptimal(self, engine):
+        """
+        Asserts that the engine's assignment is complete, one-to-one and of optimal cost.
+        """
+        row_ind, col_ind = linear_sum_assignment(engine.costs)
+        rows, columns = engine.solution()
+        self.assertEqual(len(rows), min(engine.costs.shape))
+        self.assertEqual(len(set(columns.tolist())), len(columns))
+        self.assertAlmostEqual(engine.total_cost(), engine.costs[row_ind, col_ind].sum())
+
+    def test_cold_start(self):
+        """
+        Test the initial solve on square and rectangular matrices.
+        """
+        rng = np.random.default_rng(1)
+        for shape in [(0, 0), (0, 3), (3, 0), (5, 5), (4, 9), (9, 4)]:
+            self.assertOptimal(IncrementalAssignment(rng.integers(-5, 40, size=shape).astype(float)))
+
+    def test_column_updates_in_place(self):
+        """
+        Test re-optimizing after in-place column edits, as done by the special group retries.
+        """
+        rng = np.random.default_rng(2)
+        costs = rng.integers(0, 30, size=(12, 20)).astype(float)
+        engine = IncrementalAssignment(costs)
+        for _ in range(10):
+            columns = rng.choice(20, size=3, replace=False)
+            costs[:, columns] += rng.choice([-3, 1000])
+            engine.update_columns(columns)
+            self.assertOptimal(engine)
+
+    def test_constraints_read_per_row(self):
+        """
+        Test forced and excluded pairs against linear_sum_assignment on an explicitly blocked copy.
+        """
+        rng = np.random.default_rng(4)
+        for shape in [(6, 6), (5, 9)]:
+            costs = rng.integers(0, 30, size=shape).astype(np.int16)
+            engine = IncrementalAssignment(costs)
+            row_ind, col_ind = engine.solution()
+            forced, excluded = [(row_ind[0], col_ind[0])], [(row_ind[1], col_ind[1]), (row_ind[2], col_ind[3])]
+            big = 10000.0
+            blocked = costs.astype(float)
+            for i, j in forced:
+                blocked[i, :], blocked[:, j], blocked[i, j] = big, big, costs[i, j]
+            for i, j in excluded:
+                blocked[i, j] = big
+
+            constrained = IncrementalAssignment.from_state(costs, *engine.state())
+            constrained.constrain(forced, excluded, big)
+            constrained.update_rows([row_ind[1]])
+            rows, columns = constrained.solution()
+            expected_rows, expected_columns = linear_sum_assignment(blocked)
+            self.assertFalse(constrained.blocked(rows, columns).any())
+            self.assertAlmostEqual(blocked[rows, columns].sum(), blocked[expected_rows, expected_columns].sum())
+            np.testing.assert_array_equal(constrained.blocked(np.array([row_ind[0], row_ind[2]]),
+                                                              np.array([col_ind[1], col_ind[3]])), [True, True])
+
+    def test_random_edit_sequences(self):
+        """
+        Test random sequences of cost updates, insertions and deletions of rows and columns.
+        """
+        rng = np.random.default_rng(3)
+        for _ in range(100):
+            engine = IncrementalAssignment(
+                rng.integers(-5, 40, size=(int(rng.integers(0, 8)), int(rng.integers(0, 8)))).astype(float))
+            for _ in range(12):
+                num_rows, num_cols = engine.num_rows, engine.num_cols
+                operation = rng.integers(0, 6)
+                if operation == 0 and num_cols:
+                    columns = rng.choice(num_cols, size=int(rng.integers(1, num_cols + 1)), replace=False)
+                    engine.update_columns(columns, rng.integers(-5, 40, size=(num_rows, len(columns))))
+                elif operation == 1 and num_rows:
+                    rows = rng.choice(num_rows, size=int(rng.integers(1, num_rows + 1)), replace=False)
+                    engine.update_rows(rows, rng.integers(-5, 40, size=(len(rows), num_cols)))
+                elif operation == 2:
+                    engine.insert_row(rng.integers(-5, 40, size=num_cols))
+                elif operation == 3:
+                    engine.insert_column(rng.integers(-5, 40, size=num_rows))
+                elif operation == 4 and num_rows:
+                    engine.delete_row(int(rng.integers(0, num_rows)))
+                elif operation == 5 and num_cols:
+                    engine.delete_column(int(rng.integers(0, num_cols)))
+                self.assertOptimal(engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
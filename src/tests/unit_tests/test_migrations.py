@@ -0,0 +1,180 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_migrations
+
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from src.data.database import SEED_PATH, Database, restore_database
+from src.data.migrations import MIGRATIONS, Migration, migrate, schema_version
+
+
+class TestMigrations(unittest.TestCase):
+    """
+    Unit tests for the versioned schema migrations of the roles database.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "roles.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_unversioned(self) -> sqlite3.Connection:
+        """Creates a database as seeded before migrations existed (version 0, no indexes)."""
+        connection = sqlite3.connect(self.db_path)
+        with open(SEED_PATH, "r") as seed_file:
+            connection.executescript(seed_file.read())
+        return connection
+
+    def indexes(self, connection) -> set:
+        return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index' "
+                                                     "AND name LIKE 'idx_%'")}
+
+    def test_upgrade_in_place(self):
+        """
+        Test that an existing database is upgraded on open without losing data, and only once.
+        """
+        connection = self.create_unversioned()
+        rows = connection.execute("SELECT * FROM Roles ORDER BY ID").fetchall()
+        self.assertEqual(schema_version(connection), 0)
+        connection.close()
+
+        db = Database(self.db_path)
+        try:
+            self.assertEqual(schema_version(db.connection), len(MIGRATIONS))
+            self.assertTrue({"idx_roles_catalog", "idx_roles_group", "idx_roles_just8b"} <= self.indexes(db.connection))
+            self.assertEqual([tuple(row) for row in db.connection.execute("SELECT * FROM Roles ORDER BY ID")],
+                             rows)
+            self.assertEqual(migrate(db.connection), len(MIGRATIONS))
+        finally:
+            db.close()
+
+    def test_catalog_uses_index(self):
+        """
+        Test that the catalog query and the special group JOIN are answered from the indexes.
+        """
+        db = Database(self.db_path)
+        try:
+            def plan(query):
+                return " ".join(row[3] for row in db.connection.execute(f"EXPLAIN QUERY PLAN {query}"))
+
+            catalog_plan = plan("SELECT * FROM Roles ORDER BY Essential_Next_Rest_Last, Nachname, Vorname_Position")
+            self.assertIn("COVERING INDEX idx_roles_catalog", catalog_plan)
+            self.assertNotIn("TEMP B-TREE", catalog_plan)
+            self.assertIn("idx_roles_group", plan("SELECT SpecialGroups.GroupID, Roles.ID FROM SpecialGroups "
+                                                  "JOIN Roles ON Roles.Soziale_Beziehungen = SpecialGroups.GroupID"))
+        finally:
+            db.close()
+
+    def test_next_unused_id(self):
+        """
+        Test the free ID ranges against a scan of all IDs under random inserts, deletes and ID changes.
+        """
+        connection = self.create_unversioned()
+        connection.execute("DELETE FROM Roles WHERE ID IN (1, 5, 6, 7)")
+        connection.commit()
+        connection.close()
+
+        db = Database(self.db_path)
+        rng = random.Random(0)
+        try:
+            def first_gap():
+                role_ids = {row[0] for row in db.connection.execute("SELECT ID FROM Roles")}
+                return next(i for i in range(1, len(role_ids) + 2) if i not in role_ids)
+
+            self.assertEqual(db.get_next_unused_id(), 1)
+            for _ in range(400):
+                role_ids = [row[0] for row in db.connection.execute("SELECT ID FROM Roles")]
+                other_id = rng.randint(1, max(role_ids, default=0) + 10)
+                with db.transaction() as connection:
+                    operation = rng.random()
+                    if operation < 0.4:
+                        connection.execute("INSERT INTO Roles (ID) VALUES (?)", (db.get_next_unused_id(),))
+                    elif operation < 0.55 and other_id not in role_ids:
+                        connection.execute("INSERT INTO Roles (ID) VALUES (?)", (other_id,))
+                    elif operation < 0.9 and role_ids:
+                        connection.execute("DELETE FROM Roles WHERE ID = ?", (rng.choice(role_ids),))
+                    elif role_ids and other_id not in role_ids:
+                        connection.execute("UPDATE Roles SET ID = ? WHERE ID = ?", (other_id, rng.choice(role_ids)))
+                self.assertEqual(db.get_next_unused_id(), first_gap())
+        finally:
+            db.close()
+
+    def test_restore(self):
+        """
+        Test that restoring the seed rebuilds the migrated objects, so new IDs are free again.
+        """
+        db = Database(self.db_path)
+        try:
+            with db.transaction() as connection:
+                connection.execute("DELETE FROM Roles WHERE ID IN (3, 4)")
+        finally:
+            db.close()
+
+        restore_database(self.db_path)
+        db = Database(self.db_path)
+        try:
+            role_ids = {row[0] for row in db.connection.execute("SELECT ID FROM Roles")}
+            self.assertEqual(schema_version(db.connection), len(MIGRATIONS))
+            self.assertEqual(db.get_next_unused_id(), max(role_ids) + 1)
+            self.assertIn("idx_roles_catalog", self.indexes(db.connection))
+            with db.transaction() as connection:
+                connection.execute("INSERT INTO Roles (ID) VALUES (?)", (db.get_next_unused_id(),))
+        finally:
+            db.close()
+
+    def test_missing_objects(self):
+        """
+        Test that migrations whose objects were dropped are applied again although the version says otherwise.
+        """
+        Database(self.db_path).close()
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("DROP INDEX idx_roles_group")
+        connection.execute("DROP TRIGGER trg_roles_delete_free_ids")
+        connection.commit()
+        connection.close()
+
+        db = Database(self.db_path)
+        try:
+            self.assertIn("idx_roles_group", self.indexes(db.connection))
+            triggers = {row[0] for row in db.connection.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+            self.assertIn("trg_roles_delete_free_ids", triggers)
+            self.assertEqual(schema_version(db.connection), len(MIGRATIONS))
+        finally:
+            db.close()
+
+    def test_failed_migration(self):
+        """
+        Test that a failing migration is rolled back and leaves the last completed version.
+        """
+        connection = self.create_unversioned()
+        migrations = [Migration("Index", ["CREATE INDEX idx_test ON Roles (Thema)"]),
+                      Migration("Broken", ["CREATE INDEX idx_broken ON Roles (Thema)", "SELECT * FROM Missing"])]
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                migrate(connection, migrations)
+            self.assertEqual(schema_version(connection), 1)
+            self.assertEqual(self.indexes(connection), {"idx_test"})
+        finally:
+            connection.close()
+
+    def test_newer_database(self):
+        """
+        Test that a database written by a newer program version is refused and left unchanged.
+        """
+        connection = self.create_unversioned()
+        connection.execute(f"PRAGMA user_version = {len(MIGRATIONS) + 1}")
+        try:
+            with self.assertRaises(sqlite3.DatabaseError):
+                migrate(connection)
+            self.assertEqual(schema_version(connection), len(MIGRATIONS) + 1)
+            self.assertEqual(self.indexes(connection), set())
+        finally:
+            connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
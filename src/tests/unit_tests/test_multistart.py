@@ -0,0 +1,85 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_multistart
+
+import unittest
+
+import numpy as np
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.multistart import MultiStartSearch, random_walk
+from src.services.role_assignment import RoleAssignment
+from src.services.special_groups import DenseProblem
+from src.tests.unit_tests.helpers import solve
+
+SPECIAL_GROUPS = {1: [1, 2, 3], 2: [5, 6], 3: [8, 9, 10, 11]}
+
+
+class TestMultiStart(unittest.TestCase):
+    """
+    Unit tests for the parallel multi-start special group search.
+    """
+
+    def setUp(self):
+        self.db = SyntheticDatabase(synthetic_roles(30, seed=4), SPECIAL_GROUPS)
+        self.students = synthetic_students(24, seed=4)
+
+    def test_reproducible_from_master_seed(self):
+        """
+        Test that the same master seed gives the same result in-process and in worker processes.
+        """
+        sequential = RoleAssignment(self.db, self.students, special_group_strategy="multistart", seed=5, starts=6)
+        sequential.max_workers = 1
+        sequential.solve()
+        parallel = RoleAssignment(self.db, self.students, special_group_strategy="multistart", seed=5, starts=6)
+        parallel.max_workers = 2
+        parallel.solve()
+
+        self.assertAlmostEqual(sequential.min_cost, parallel.min_cost)
+        self.assertEqual(sequential.starts_converged, parallel.starts_converged)
+        self.assertEqual([(s, r) for s, r, _ in sequential.solution], [(s, r) for s, r, _ in parallel.solution])
+
+    def test_best_of_walks(self):
+        """
+        Test that the search keeps the cheapest valid walk and counts the converged walks.
+        """
+        assignment = RoleAssignment(self.db, self.students)
+        problem = DenseProblem(assignment.cost_matrix.copy())
+        search = MultiStartSearch(problem, assignment.special_groups, assignment.cost_for_special_group)
+        best = search.solve(8, seed=1, max_workers=1)
+
+        valid_costs = [result.cost for result in search.results if result.valid]
+        self.assertEqual(search.starts_converged, len(valid_costs))
+        self.assertTrue(best.valid)
+        self.assertAlmostEqual(best.cost, min(valid_costs))
+        for result in search.results:
+            again = random_walk(problem, assignment.special_groups, assignment.cost_for_special_group, 0.5, 10,
+                                result.seed)
+            self.assertAlmostEqual(again.cost, result.cost)
+
+    def test_valid_groups_and_cost(self):
+        """
+        Test that the chosen assignment respects all-or-nothing groups for every backend.
+        """
+        for backend in ("dense", "sparse", "compressed"):
+            assignment = solve(self.db, self.students, special_group_strategy="multistart", backend=backend,
+                               seed=3, starts=4)
+            assigned = {assignment.roles.index(role) for _, role, _ in assignment.solution}
+            assigned |= {assignment.roles.index(role) for _, role, _ in assignment.high_cost_assignments}
+            for role_indices in assignment.special_groups.values():
+                self.assertIn(len(role_indices & assigned), (0, len(role_indices)))
+            self.assertGreaterEqual(assignment.starts_converged, 1)
+
+            exact = solve(self.db, self.students, special_group_strategy="exact", backend=backend)
+            self.assertGreaterEqual(assignment.min_cost, exact.min_cost - 1e-9)
+
+    def test_random_strategy_is_seeded(self):
+        """
+        Test that the randomized strategy is reproducible with a seed.
+        """
+        first = solve(self.db, self.students, seed=9)
+        second = solve(self.db, self.students, seed=9)
+        self.assertEqual(first.min_cost, second.min_cost)
+        self.assertTrue(np.array_equal(first.role_offsets, second.role_offsets))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_pragmas
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.benchmarks.bench_database import run_profile
+from src.data.database import Database
+from src.data.pragmas import DEFAULT_PROFILE, PERFORMANCE_PROFILE
+
+
+class TestPragmas(unittest.TestCase):
+    """
+    Unit tests for the pragma profiles and the immutable database snapshots.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "roles.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_profiles(self):
+        """
+        Test that the profile is applied to the writer and the readers, and that switching converts the file.
+        """
+        db = Database(self.db_path, PERFORMANCE_PROFILE)
+        try:
+            self.assertEqual(db.connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(db.connection.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+            with db.connections.read() as connection:
+                self.assertEqual(connection.execute("PRAGMA cache_size").fetchone()[0], PERFORMANCE_PROFILE.cache_size)
+        finally:
+            db.close()
+        self.assertFalse(os.path.exists(self.db_path + "-wal"))
+
+        db = Database(self.db_path, DEFAULT_PROFILE)
+        try:
+            self.assertEqual(db.connection.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+            self.assertEqual(db.connection.execute("PRAGMA synchronous").fetchone()[0], 2)  # FULL
+        finally:
+            db.close()
+
+    def test_readers_during_write(self):
+        """
+        Test that readers neither wait for nor see an open write transaction in WAL mode.
+        """
+        db = Database(self.db_path, PERFORMANCE_PROFILE)
+        db.connections.timeout = 0.1
+        try:
+            count = len(db.fetch_all_roles())
+            with db.transaction() as connection:
+                connection.execute("DELETE FROM Roles")
+                self.assertEqual(len(db.fetch_all_roles()), count)
+                self.assertEqual(len(db.role_catalog().all_roles), count)
+            db.invalidate_catalog()
+            self.assertEqual(db.role_catalog().all_roles, [])
+        finally:
+            db.close()
+
+    def test_snapshot(self):
+        """
+        Test that a snapshot keeps the state it was taken at, cannot be written and is removed afterwards.
+        """
+        db = Database(self.db_path)
+        try:
+            roles = [role.id for role in db.fetch_all_roles()]
+            group_roles = db.fetch_special_group_roles()
+            with db.snapshot() as snapshot:
+                with db.transaction() as connection:
+                    connection.execute("DELETE FROM Roles")
+                db.invalidate_catalog()
+
+                self.assertEqual([role.id for role in snapshot.fetch_all_roles()], roles)
+                self.assertEqual(snapshot.fetch_special_group_roles(), group_roles)
+                with self.assertRaises(sqlite3.OperationalError):
+                    snapshot.transaction().__enter__()
+                path = snapshot.db_path
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(db.fetch_all_roles(), [])
+        finally:
+            db.close()
+
+    def test_benchmark(self):
+        """
+        Test that the benchmark runs for both profiles and leaves the catalog as seeded.
+        """
+        for profile in (DEFAULT_PROFILE, PERFORMANCE_PROFILE):
+            results = run_profile(profile, 5, self.directory.name)
+            self.assertTrue({"insert", "update", "delete", "catalog", "snapshot", "reads_during_edits"} <= set(results))
+            self.assertTrue(all(value >= 0 for value in results.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
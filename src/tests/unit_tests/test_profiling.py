@@ -0,0 +1,85 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_profiling
+
+import json
+import os
+import pstats
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.profiling import StageTracer, summary_path
+from src.services.role_assignment import RoleAssignment
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Unit tests for the per-stage timing and profiling hooks.
+    """
+
+    def setUp(self):
+        self.db = SyntheticDatabase(synthetic_roles(30, seed=2), {1: [1, 2, 3], 2: [10, 11]})
+        self.students = synthetic_students(25, seed=2)
+        self.output_dir = tempfile.mkdtemp()
+
+    def test_run_stages(self):
+        """
+        Test that a run records every stage with shapes and iterations and calls the callbacks.
+        """
+        finished = []
+        tracer = StageTracer(callbacks=[finished.append])
+        assignment = RoleAssignment(self.db, self.students, tracer=tracer, seed=1)
+        assignment.solve()
+        assignment.write_results_to_csv(os.path.join(self.output_dir, "ergebnis.csv"))
+
+        names = [record.name for record in tracer.records]
+        self.assertEqual(names[:2], ["load_roles", "special_groups"])
+        self.assertEqual(names[-2:], ["solve", "write_csv"])
+        self.assertIn("cost_matrix", names)
+        self.assertEqual(finished, tracer.records)
+
+        solve = tracer.records[-2]
+        self.assertEqual(solve.shape, (25, 30))
+        self.assertEqual(solve.iterations, names.count("assignment"))
+        self.assertGreaterEqual(solve.seconds, tracer.totals()["assignment"]["seconds"])
+
+    def test_peak_memory(self):
+        """
+        Test that nested stages report their own peak and the outer stage includes it.
+        """
+        tracer = StageTracer(track_memory=True)
+        with tracer.stage("outer") as outer:
+            with tracer.stage("inner"):
+                block = np.ones(1_000_000)
+                del block
+            small = np.ones(1000)
+
+        inner = tracer.records[0]
+        self.assertGreaterEqual(inner.peak_memory, 8_000_000)
+        self.assertGreaterEqual(outer.peak_memory, inner.peak_memory)
+        self.assertLess(small.nbytes, inner.peak_memory)
+
+    def test_summary_and_profile(self):
+        """
+        Test the JSON summary next to the results CSV and the pstats file of a profiled run.
+        """
+        profile_path = os.path.join(self.output_dir, "run.pstats")
+        tracer = StageTracer(profile_path=profile_path)
+        assignment = RoleAssignment(self.db, self.students, special_group_strategy="exact", tracer=tracer)
+        assignment.solve()
+        csv_path = os.path.join(self.output_dir, "ergebnis.csv")
+        assignment.write_results_to_csv(csv_path, write_stage_summary=True)
+
+        with open(summary_path(csv_path), encoding="utf-8") as file:
+            summary = json.load(file)
+        self.assertEqual([stage["name"] for stage in summary["stages"]], [r.name for r in tracer.records])
+        self.assertEqual(summary["totals"]["solve"]["calls"], 1)
+        self.assertEqual(summary["profile"], profile_path)
+
+        stats = pstats.Stats(profile_path)
+        self.assertTrue(any(function == "solve_exact" for _, _, function in stats.stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_role_catalog
+
+import unittest
+
+from src.data.database import Database
+from src.models.student import Student
+from src.services.role_assignment import RoleAssignment
+
+
+class TestRoleCatalog(unittest.TestCase):
+    """
+    Unit tests for the single-query role catalog snapshot.
+    """
+
+    def setUp(self):
+        self.db = Database()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_matches_queries(self):
+        """
+        Test that the snapshot holds the same roles, in the same order, as the two role queries.
+        """
+        catalog = self.db.role_catalog()
+        self.assertEqual([role.id for role in catalog.all_roles], [role.id for role in self.db.fetch_all_roles()])
+        self.assertEqual([role.id for role in catalog.just8b_roles],
+                         [role.id for role in self.db.load_roles_for_just8b()])
+        self.assertEqual([vars(role) for role in catalog.all_roles], [vars(role) for role in self.db.fetch_all_roles()])
+
+        # Both role sets share the Role objects
+        all_roles = {id(role) for role in catalog.all_roles}
+        self.assertTrue(all(id(role) in all_roles for role in catalog.just8b_roles))
+
+    def test_roles_for(self):
+        """
+        Test the role set per participant count.
+        """
+        catalog = self.db.role_catalog()
+        limit = len(catalog.just8b_roles)
+        self.assertIs(catalog.roles_for(limit - 1), catalog.just8b_roles)
+        self.assertIs(catalog.roles_for(limit), catalog.all_roles)
+
+    def test_reuse(self):
+        """
+        Test that repeated solves reuse the snapshot until the catalog changes.
+        """
+        catalog = self.db.role_catalog()
+        students = [Student(f"S{i}", "Test", "Weiblich") for i in range(3)]
+        self.assertIs(RoleAssignment(self.db, students).roles, catalog.just8b_roles)
+        self.assertIs(RoleAssignment(self.db, students).roles, catalog.just8b_roles)
+
+        self.db.invalidate_catalog()
+        self.assertIsNot(self.db.role_catalog(), catalog)
+        self.assertIs(self.db.role_catalog(), self.db.role_catalog())
+
+    def test_special_group_roles(self):
+        """
+        Test that the JOIN returns the same group roles as the per-group queries and that the solver maps them.
+        """
+        group_ids = self.db.fetch_all_group_ids()[:3]
+        original = self.db.fetch_special_groups_ID()
+        self.set_special_groups(group_ids)
+        try:
+            expected = {group_id: sorted(role.id for role in self.db.get_roles_from_group(group_id))
+                        for group_id in self.db.fetch_special_groups_ID()}
+            self.assertEqual(self.db.fetch_special_group_roles(), {g: ids for g, ids in expected.items() if ids})
+
+            students = [Student(f"S{i}", "Test", "Weiblich") for i in range(len(self.db.role_catalog().all_roles))]
+            assignment = RoleAssignment(self.db, students)
+            self.assertEqual({g: {assignment.roles[i].id for i in indices}
+                              for g, indices in assignment.special_groups.items()},
+                             {g: set(ids) for g, ids in expected.items() if ids})
+        finally:
+            self.set_special_groups(original)
+
+    def set_special_groups(self, group_ids):
+        with self.db.transaction() as connection:
+            connection.execute("DELETE FROM SpecialGroups")
+            connection.executemany("INSERT INTO SpecialGroups (GroupID) VALUES (?)", [(g,) for g in group_ids])
+
+
+if __name__ == "__main__":
+    unittest.main()
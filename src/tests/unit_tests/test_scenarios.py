@@ -0,0 +1,72 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_scenarios
+
+import os
+import tempfile
+import unittest
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.role_assignment import RoleAssignment
+from src.services.scenarios import METRIC_FIELDS, ScenarioEngine, weight_grid, write_table
+
+
+class TestScenarios(unittest.TestCase):
+    """
+    Unit tests for the batched what-if scenario engine.
+    """
+
+    def setUp(self):
+        self.db = SyntheticDatabase(synthetic_roles(24, seed=4), {1: [1, 2, 3], 2: [7, 8]})
+        self.students = synthetic_students(20, seed=4)
+        self.assignment = RoleAssignment(self.db, self.students, special_group_strategy="exact")
+        self.grid = weight_grid(self.assignment.scenario_weights(), matched_gender=[-4, -12],
+                                unisex=[-2, 0], special_group=[-3, -30])
+
+    def test_weight_grid(self):
+        """
+        Test the cartesian product over the given weights and the rejection of unknown names.
+        """
+        self.assertEqual(len(self.grid), 8)
+        self.assertEqual({scenario["essential"] for scenario in self.grid}, {5})
+        self.assertEqual(len({(s["matched_gender"], s["unisex"], s["special_group"]) for s in self.grid}), 8)
+        with self.assertRaises(ValueError):
+            weight_grid(self.assignment.scenario_weights(), gender=[1])
+
+    def test_matches_single_runs(self):
+        """
+        Test that every scenario matches an exact solve with the same weights, in and out of process.
+        """
+        engine = ScenarioEngine(self.assignment)
+        table = engine.solve(self.grid, max_workers=2)
+        self.assertEqual(engine.solve(self.grid, max_workers=1), table)
+
+        for scenario, row in zip(self.grid, table):
+            single = RoleAssignment(self.db, self.students, special_group_strategy="exact")
+            for name, attribute in [("matched_gender", "cost_for_matched_gender"), ("unisex", "cost_for_unisex"),
+                                    ("special_group", "cost_for_special_group")]:
+                setattr(single, attribute, scenario[name])
+            single.solve()
+
+            self.assertAlmostEqual(row["Gesamtkosten"], single.construct_cost_matrix()[
+                single.result.row_ind, single.result.col_ind].sum())
+            self.assertEqual(row["Veto verletzt"], len(single.high_cost_assignments))
+            self.assertEqual(row["Abdeckung"], single.coverage)
+
+    def test_metrics_and_table(self):
+        """
+        Test that stronger gender weights never lower the gender match rate and the table is written.
+        """
+        grid = weight_grid(self.assignment.scenario_weights(), matched_gender=[0, -4, -40])
+        table = ScenarioEngine(self.assignment).solve(grid, max_workers=1)
+        rates = [row["Genderwünsche erfüllt [%]"] for row in table]
+        self.assertEqual(rates, sorted(rates))
+
+        path = os.path.join(tempfile.mkdtemp(), "scenarios.csv")
+        write_table(table, path)
+        with open(path, encoding="utf-8") as file:
+            header = file.readline().strip().split(",")
+        self.assertEqual(header[-len(METRIC_FIELDS):], METRIC_FIELDS)
+        self.assertIn("matched_gender", header)
+
+
+if __name__ == "__main__":
+    unittest.main()
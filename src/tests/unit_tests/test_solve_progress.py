@@ -0,0 +1,87 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_solve_progress
+
+import threading
+import unittest
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.role_assignment import RoleAssignment, SolveCancelled
+
+
+class TestSolveProgress(unittest.TestCase):
+    """
+    Unit tests for the progress callback and the cooperative cancellation of a solve.
+    """
+
+    def setUp(self):
+        # Overlapping special groups that cannot all be assigned keep the randomized retries going
+        self.db = SyntheticDatabase(synthetic_roles(12, seed=4), {1: [1, 2, 3, 4], 2: [5, 6, 7, 8], 3: [9, 10, 11]})
+        self.students = synthetic_students(6, seed=4)
+
+    def test_progress(self):
+        """
+        Test that the callback receives the finished solver runs between the runs.
+        """
+        for strategy, total in (("random", 10), ("exact", None)):
+            with self.subTest(strategy=strategy):
+                progress = []
+                assignment = RoleAssignment(self.db, self.students, special_group_strategy=strategy, seed=1)
+                assignment.progress_callback = lambda runs, maximum: progress.append((runs, maximum))
+                assignment.solve()
+
+                self.assertTrue(progress)
+                self.assertEqual([runs for runs, _ in progress], list(range(1, len(progress) + 1)))
+                self.assertTrue(all(maximum == total for _, maximum in progress))
+                self.assertLessEqual(len(progress), assignment.tracer.records[-1].iterations)
+
+    def test_cancel(self):
+        """
+        Test that cancelling from the callback stops the run and that a cancelled solver raises at once.
+        """
+        for strategy in ("random", "exact"):
+            with self.subTest(strategy=strategy):
+                assignment = RoleAssignment(self.db, self.students, special_group_strategy=strategy, seed=1)
+                assignment.progress_callback = lambda runs, maximum: assignment.cancel()
+                with self.assertRaises(SolveCancelled):
+                    assignment.solve()
+                self.assertEqual(assignment.tracer.records[-1].name, "solve")
+
+        assignment = RoleAssignment(self.db, self.students, special_group_strategy="multistart")
+        assignment.cancel()
+        with self.assertRaises(SolveCancelled):
+            assignment.solve()
+        self.assertIsNone(assignment.result)
+
+    def test_worker_thread(self):
+        """
+        Test that a solve in a worker thread reports to the calling thread and can be cancelled from it.
+        """
+        assignment = RoleAssignment(self.db, self.students, seed=1)
+        started = threading.Event()
+        resume = threading.Event()
+
+        def wait_for_cancel(runs, maximum):
+            started.set()
+            resume.wait(5)
+
+        assignment.progress_callback = wait_for_cancel
+        outcome = []
+        worker = threading.Thread(target=lambda: outcome.append(self.run_solve(assignment)))
+        worker.start()
+
+        self.assertTrue(started.wait(5))
+        assignment.cancel()
+        resume.set()
+        worker.join(5)
+        self.assertEqual(outcome, ["cancelled"])
+
+    @staticmethod
+    def run_solve(assignment):
+        try:
+            assignment.solve()
+            return "done"
+        except SolveCancelled:
+            return "cancelled"
+
+
+if __name__ == "__main__":
+    unittest.main()
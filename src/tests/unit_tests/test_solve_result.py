@@ -0,0 +1,78 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_solve_result
+
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.models.role import Role
+from src.models.student import Student
+from src.services.role_assignment import RoleAssignment
+from src.services.solve_result import SolveResult
+
+
+class TestSolveResult(unittest.TestCase):
+    """
+    Unit tests for the compact, array-backed solve result.
+    """
+
+    def setUp(self):
+        self.students = [Student(f"V{i}", f"N{i}", "Weiblich") for i in range(4)]
+        self.roles = [Role(i, f"R{i}", "X", "Klasse 8b", "Weiblich", "Essential", "yes", None, 0) for i in range(3)]
+
+    def test_accessors(self):
+        """
+        Test the tuples, unassigned students, cost and coverage built from the arrays.
+        """
+        result = SolveResult(self.students, self.roles, [0, 2, 3], [1, 0, 2], [5, 1001, 1])
+
+        self.assertEqual(result.solution, [(self.students[0], self.roles[1], 5), (self.students[3], self.roles[2], 1)])
+        self.assertEqual(result.high_cost_assignments, [(self.students[2], self.roles[0], 1001)])
+        self.assertEqual(result.not_assigned, [self.students[1], self.students[2]])
+        self.assertEqual(result.min_cost, 1007)
+        self.assertEqual(result.coverage, 75.0)
+
+    def test_immutable(self):
+        """
+        Test that neither the attributes nor the arrays can be changed.
+        """
+        result = SolveResult(self.students, self.roles, [0], [1], [5])
+        with self.assertRaises(AttributeError):
+            result.costs = np.zeros(1)
+        with self.assertRaises(ValueError):
+            result.costs[0] = 0
+
+    def test_retries_do_not_accumulate(self):
+        """
+        Test that randomized retries replace the stored result instead of appending to it.
+        """
+        db = SyntheticDatabase(synthetic_roles(30, seed=2), {1: [1, 2, 3], 2: [5, 6], 3: [8, 9, 10, 11]})
+        assignment = RoleAssignment(db, synthetic_students(25, seed=2), seed=4)
+        result = assignment.solve()
+
+        self.assertIs(result, assignment.result)
+        self.assertEqual(len(assignment.solution) + len(assignment.high_cost_assignments), 25)
+        self.assertEqual(len(set(result.row_ind.tolist())), len(result))
+
+    def test_output_before_solve(self):
+        """
+        Test that printing and writing the results before a solve show an empty assignment.
+        """
+        assignment = RoleAssignment(SyntheticDatabase(synthetic_roles(5, seed=1)), synthetic_students(4, seed=1))
+        path = os.path.join(tempfile.mkdtemp(), "ergebnis.csv")
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            assignment.print_solution()
+        assignment.write_results_to_csv(path)
+
+        self.assertIn("Gesamtkosten der Zuweisung:** None", output.getvalue())
+        with open(path, encoding="utf-8") as file:
+            self.assertEqual(len(list(csv.reader(file))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
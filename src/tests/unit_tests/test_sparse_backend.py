@@ -0,0 +1,75 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_sparse_backend
+
+import unittest
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.models.role import Role
+from src.models.student import Student
+from src.tests.unit_tests.helpers import solve
+
+
+class TestSparseBackend(unittest.TestCase):
+    """
+    Unit tests for the sparse (allowed edges only) solver backend.
+    """
+
+    def test_matches_dense_without_vetoes_needed(self):
+        """
+        Test that both backends find assignments of equal cost when vetoes can be respected.
+        """
+        for size, num_roles in [(20, 30), (40, 25), (30, 30)]:
+            db = SyntheticDatabase(synthetic_roles(num_roles, seed=size))
+            students = synthetic_students(size, veto_percentage=60, seed=size)
+            dense = solve(db, students, special_group_strategy="exact")
+            sparse = solve(db, students, special_group_strategy="exact", backend="sparse")
+
+            self.assertAlmostEqual(dense.min_cost, sparse.min_cost)
+            self.assertEqual(sparse.high_cost_assignments, [])
+            self.assertIsNone(sparse._cost_matrix)
+
+    def test_vetoes_violated_only_when_necessary(self):
+        """
+        Test that only as many vetoes are violated as the role genders force.
+        """
+        roles = [Role(i, f"R{i}", "Test", "Klasse 8b", "Männlich" if i < 4 else "Weiblich", "Essential",
+                      "yes", None, 0) for i in range(6)]
+        # Five students refuse male roles, but only two female roles exist
+        students = [Student(f"S{i}", "Test", "Weiblich", "Männlich") for i in range(5)]
+        sparse = solve(SyntheticDatabase(roles), students, backend="sparse")
+
+        self.assertEqual(len(sparse.high_cost_assignments), 3)
+        self.assertEqual(len(sparse.solution), 2)
+        self.assertTrue(all(role.gender == "Weiblich" for _, role, _ in sparse.solution))
+
+    def test_uncovered_roles_with_more_students(self):
+        """
+        Test the fallback when there are more students than roles and a role gender is vetoed by most.
+        """
+        roles = [Role(i, f"R{i}", "Test", "Klasse 8b", "Divers", "Essential", "yes", None, 0) for i in range(3)]
+        students = [Student(f"S{i}", "Test", "Weiblich", "Divers" if i else None) for i in range(6)]
+        sparse = solve(SyntheticDatabase(roles), students, backend="sparse")
+
+        self.assertEqual(len(sparse.solution) + len(sparse.high_cost_assignments), 3)
+        self.assertEqual(len(sparse.high_cost_assignments), 2)
+
+    def test_forced_group_needs_vetoed_edges(self):
+        """
+        Test that the exact search covers an included group through vetoed edges like the dense backend.
+        """
+        cases = [(3, 4, {1: [3, 1, 2]}, 100, 18), (3, 9, {1: [9, 1, 4], 2: [5, 8, 3, 7]}, 90, 74),
+                 (2, 5, {1: [2, 4]}, 90, 36)]
+        for num_students, num_roles, groups, veto_percentage, seed in cases:
+            with self.subTest(seed=seed):
+                db = SyntheticDatabase(synthetic_roles(num_roles, seed=seed), groups)
+                students = synthetic_students(num_students, veto_percentage=veto_percentage, seed=seed)
+                dense = solve(db, students, special_group_strategy="exact")
+                sparse = solve(db, students, special_group_strategy="exact", backend="sparse")
+
+                self.assertAlmostEqual(sparse.min_cost, dense.min_cost)
+                assigned = {role.id for _, role, _ in sparse.solution + sparse.high_cost_assignments}
+                for role_ids in groups.values():
+                    self.assertIn(len(assigned & set(role_ids)), (0, len(role_ids)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_special_groups
+
+import itertools
+import unittest
+
+import numpy as np
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.role_assignment import RoleAssignment
+from src.services.special_groups import SpecialGroupSearch
+
+
+def brute_force(cost_matrix, special_groups, bonus):
+    """Enumerates every assignment of students to distinct roles and returns the best valid cost."""
+    num_students, num_roles = cost_matrix.shape
+    best = None
+    for roles in itertools.permutations(range(num_roles), num_students):
+        assigned = set(roles)
+        cost = sum(cost_matrix[i, j] for i, j in enumerate(roles))
+        valid = True
+        for role_indices in special_groups.values():
+            count = len(role_indices & assigned)
+            if 0 < count < len(role_indices):
+                valid = False
+            elif count:
+                cost += bonus * count
+        if valid and (best is None or cost < best):
+            best = cost
+    return best
+
+
+class TestSpecialGroupSearch(unittest.TestCase):
+    """
+    Unit tests for the exact special group branch-and-bound search.
+    """
+
+    def test_matches_brute_force(self):
+        """
+        Test that the search finds the optimal all-or-nothing cost on random instances.
+        """
+        rng = np.random.default_rng(3)
+        for bonus in (-3, 2):
+            for _ in range(25):
+                cost_matrix = rng.integers(-5, 30, size=(4, 7)).astype(float)
+                special_groups = {7: {0, 1, 2}, 9: {3, 4}}
+                cost, row_ind, col_ind, included = SpecialGroupSearch(cost_matrix, special_groups, bonus).solve()
+
+                self.assertAlmostEqual(cost, brute_force(cost_matrix, special_groups, bonus))
+                assigned = set(col_ind.tolist())
+                for group_id, role_indices in special_groups.items():
+                    self.assertEqual(role_indices <= assigned, included[group_id])
+                    self.assertIn(len(role_indices & assigned), (0, len(role_indices)))
+
+    def test_group_larger_than_cohort_is_excluded(self):
+        """
+        Test that a group with more roles than students is never forced.
+        """
+        cost_matrix = np.zeros((2, 4))
+        cost, _, col_ind, included = SpecialGroupSearch(cost_matrix, {1: {0, 1, 2}}, -3).solve()
+        self.assertFalse(included[1])
+        self.assertTrue(set(col_ind.tolist()).isdisjoint({0, 1, 2}))
+
+    def test_deterministic(self):
+        """
+        Test that repeated searches return the same assignment.
+        """
+        rng = np.random.default_rng(11)
+        cost_matrix = rng.integers(0, 10, size=(6, 9)).astype(float)
+        special_groups = {1: {0, 1, 2}, 2: {3, 4, 5}}
+        first = SpecialGroupSearch(cost_matrix, special_groups, -3).solve()
+        second = SpecialGroupSearch(cost_matrix, special_groups, -3).solve()
+        np.testing.assert_array_equal(first[2], second[2])
+
+    def test_exact_strategy_in_role_assignment(self):
+        """
+        Test that the exact strategy assigns special groups all-or-nothing for a full RoleAssignment.
+        """
+        roles = synthetic_roles(30, seed=5)
+        db = SyntheticDatabase(roles, special_groups={7: [1, 2, 3], 8: [10, 20]})
+        assignment = RoleAssignment(db, synthetic_students(20, seed=5), special_group_strategy="exact")
+        assignment.solve()
+
+        assigned_ids = {role.id for _, role, _ in assignment.solution + assignment.high_cost_assignments}
+        self.assertEqual(len(assignment.solution) + len(assignment.high_cost_assignments), 20)
+        for role_ids in ({1, 2, 3}, {10, 20}):
+            self.assertIn(len(role_ids & assigned_ids), (0, len(role_ids)))
+
+
+if __name__ == "__main__":
+    unittest.main()
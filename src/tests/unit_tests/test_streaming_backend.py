@@ -0,0 +1,111 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_streaming_backend
+
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.benchmarks.synthetic import SyntheticDatabase, synthetic_roles, synthetic_students
+from src.services.anytime import BudgetExhausted
+from src.services.cost_model import CostModel
+from src.services.role_assignment import RoleAssignment
+from src.services.special_groups import DenseProblem
+from src.services.streaming_backend import StreamingProblem
+
+# Default weights of RoleAssignment.cost_weights()
+WEIGHTS = {"essential": 5, "next": 15, "rest": 20, "last": 25, "matched_gender": -4, "unisex": -2,
+           "exclusion": 1000}
+
+
+class TestStreamingBackend(unittest.TestCase):
+    """
+    Unit tests for the memory-mapped cost matrix and the row-streaming backend.
+    """
+
+    def test_chunked_memmap(self):
+        """
+        Test that the memmap built in row chunks equals the in-memory matrix.
+        """
+        model = CostModel(synthetic_students(103, seed=1), synthetic_roles(40, seed=1))
+        path = os.path.join(tempfile.mkdtemp(), "costs.dat")
+        matrix = model.build_memmap(WEIGHTS, path, np.int16, chunk_rows=10)
+
+        self.assertIsInstance(matrix, np.memmap)
+        self.assertEqual(os.path.getsize(path), 103 * 40 * 2)
+        np.testing.assert_array_equal(matrix, model.build(WEIGHTS))
+
+    def test_matches_linear_sum_assignment(self):
+        """
+        Test warm-started streaming solves and cold dense solves with changing offsets and active roles
+        against linear_sum_assignment on the active columns.
+        """
+        rng = np.random.default_rng(3)
+        for shape in [(12, 12), (8, 15), (15, 8)]:
+            costs = rng.integers(0, 30, size=shape).astype(np.int16)
+            streaming, dense = StreamingProblem(costs), DenseProblem(costs)
+            for _ in range(8):
+                offsets = rng.integers(-10, 10, size=shape[1]).astype(float)
+                active = rng.random(shape[1]) < 0.8
+                columns = np.flatnonzero(active)
+                expected_rows, expected_columns = linear_sum_assignment(costs[:, columns] + offsets[columns])
+                expected = (costs[expected_rows, columns[expected_columns]] + offsets[columns[expected_columns]]).sum()
+
+                for problem in (streaming, dense):
+                    row_ind, col_ind = problem.solve(offsets, active)
+                    self.assertEqual(len(row_ind), len(expected_rows))
+                    self.assertEqual(len(set(col_ind.tolist())), len(col_ind))
+                    self.assertTrue(active[col_ind].all())
+                    self.assertAlmostEqual((costs[row_ind, col_ind] + offsets[col_ind]).sum(), expected)
+
+    def test_interrupted_solve(self):
+        """
+        Test that an interrupt stops a solve between row augmentations and the next solve starts cold.
+        """
+        costs = np.random.default_rng(5).integers(0, 30, size=(20, 25)).astype(np.int16)
+        calls = []
+
+        def interrupt():
+            calls.append(1)
+            if len(calls) == 3:
+                raise BudgetExhausted()
+
+        problem = StreamingProblem(costs, interrupt=interrupt)
+        active = np.ones(25, dtype=bool)
+        with self.assertRaises(BudgetExhausted):
+            problem.solve(np.zeros(25), active)
+        self.assertIsNone(problem.engine)
+
+        row_ind, col_ind = problem.solve(np.zeros(25), active)
+        expected_rows, expected_columns = linear_sum_assignment(costs)
+        self.assertEqual(costs[row_ind, col_ind].sum(), costs[expected_rows, expected_columns].sum())
+        self.assertIsNone(pickle.loads(pickle.dumps(problem)).interrupt)
+
+    def test_role_assignment(self):
+        """
+        Test that the streaming backend finds assignments of the dense cost in a temporary memmap file.
+        """
+        db = SyntheticDatabase(synthetic_roles(30, seed=5), {1: [1, 2, 3], 2: [8, 9]})
+        students = synthetic_students(40, seed=5)
+        for strategy in ("random", "exact", "multistart"):
+            dense = RoleAssignment(db, students, special_group_strategy=strategy, seed=2)
+            streaming = RoleAssignment(db, students, special_group_strategy=strategy, backend="streaming", seed=2)
+            streaming.max_workers = 2
+            dense.solve()
+            streaming.solve()
+
+            self.assertAlmostEqual(streaming.min_cost, dense.min_cost)
+            self.assertIsNone(streaming._cost_matrix)
+            self.assertIsInstance(streaming.problem.cost_matrix, np.memmap)
+
+        problem = pickle.loads(pickle.dumps(streaming.problem))
+        self.assertEqual(problem.cost_matrix.filename, streaming.problem.cost_matrix.filename)
+        directory = os.path.dirname(streaming.problem.cost_matrix.filename)
+        del streaming, problem
+        self.assertFalse(os.path.exists(directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
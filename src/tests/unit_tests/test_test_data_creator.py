@@ -0,0 +1,81 @@
+# Run test with: PYTHONPATH=src python -m unittest src.tests.unit_tests.test_test_data_creator
+
+import csv
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.data.test_data_creator import (AVOID_GENDER_OPTIONS, GENDER_OPTIONS, HEADERS, SurveyDistribution,
+                                        generate_rows, generate_test_data)
+from src.services.batch import load_students
+
+
+class TestTestDataCreator(unittest.TestCase):
+    """
+    Unit tests for the seeded, streaming survey generator.
+    """
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def test_exact_empty_share_across_chunks(self):
+        """
+        Test that the number of rows without a veto is exact when the rows are streamed in chunks.
+        """
+        for num_rows, empty_percentage, chunk_size in [(10, 30, 3), (1000, 45, 128), (257, 100, 50), (40, 0, 7)]:
+            chunks = list(generate_rows(num_rows, empty_percentage, seed=1, chunk_size=chunk_size))
+            rows = [row for chunk in chunks for row in chunk]
+
+            self.assertTrue(all(len(chunk) <= chunk_size for chunk in chunks))
+            self.assertEqual([row[0] for row in rows], list(range(1, num_rows + 1)))
+            self.assertEqual(sum(row[8] == "" for row in rows), int(num_rows * empty_percentage / 100))
+
+    def test_seeded_file(self):
+        """
+        Test that a seed reproduces the file and that the file loads as a survey.
+        """
+        paths = [os.path.join(self.output_dir, f"survey_{i}.csv") for i in range(3)]
+        generate_test_data(paths[0], 500, 60, seed=7, chunk_size=64)
+        generate_test_data(paths[1], 500, 60, seed=7, chunk_size=64)
+        generate_test_data(paths[2], 500, 60, seed=8, chunk_size=64)
+        contents = []
+        for path in paths:
+            with open(path, encoding="utf-8") as file:
+                contents.append(file.read())
+
+        self.assertEqual(contents[0], contents[1])
+        self.assertNotEqual(contents[0], contents[2])
+        students = load_students(paths[0])
+        self.assertEqual(len(students), 500)
+        self.assertEqual(sum(student.excluded_gender == "Kein" for student in students), 300)
+
+    def test_fitted_distribution(self):
+        """
+        Test that the fitted distribution reproduces the gender and veto shares of the corpus.
+        """
+        corpus = os.path.join(self.output_dir, "corpus.csv")
+        with open(corpus, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADERS)
+            for i in range(100):
+                gender, veto = ("männlich", "") if i < 80 else ("Weiblich", "Männlich")
+                writer.writerow([i, "", 1, "de", 0, "V", "N", gender, veto])
+
+        distribution = SurveyDistribution.fit([corpus], smoothing=0)
+        np.testing.assert_allclose(distribution.genders, [0.8, 0.2, 0])
+
+        rows = [row for chunk in generate_rows(20000, seed=2, distribution=distribution) for row in chunk]
+        genders = np.array([GENDER_OPTIONS.index(row[7]) for row in rows])
+        vetoes = np.array([AVOID_GENDER_OPTIONS.index(row[8]) for row in rows])
+        self.assertAlmostEqual((genders == 0).mean(), 0.8, delta=0.02)
+        self.assertTrue((vetoes[genders == 0] == 3).all())
+        self.assertTrue((vetoes[genders == 1] == 0).all())
+
+        with self.assertRaises(ValueError):
+            SurveyDistribution.fit([])
+
+
+if __name__ == "__main__":
+    unittest.main()